@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Campos aceitos por public.audit_events_ingest (20261018_110); o resto vem do trigger/defaults.
+EVENT_FIELDS: Tuple[str, ...] = (
+    "occurred_at",
+    "actor",
+    "action",
+    "resource_ref",
+    "correlation_id",
+    "trace_id",
+    "payload_json",
+)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+_INGEST_SQL = text(
+    "SELECT id, event_hash FROM public.audit_events_ingest(CAST(:tenant_id AS uuid), CAST(:events AS jsonb))"
+)
+
+
+@dataclass(frozen=True)
+class IngestedEvent:
+    id: int
+    event_hash: str
+
+
+def _event_json(event: Mapping[str, Any]) -> Dict[str, Any]:
+    unknown = set(event) - set(EVENT_FIELDS)
+    if unknown:
+        raise ValueError(f"campos não suportados em audit event: {sorted(unknown)}")
+    if not event.get("actor"):
+        raise ValueError("audit event sem actor")
+    out = dict(event)
+    occurred_at = out.get("occurred_at")
+    if isinstance(occurred_at, datetime):
+        if occurred_at.tzinfo is None:
+            # timestamptz: horário sem fuso seria interpretado no TimeZone da sessão.
+            raise ValueError("occurred_at precisa de timezone")
+        out["occurred_at"] = occurred_at.isoformat()
+    return out
+
+
+async def ingest_audit_events(
+    session: AsyncSession,
+    tenant_id: Optional[UUID],
+    events: Iterable[Mapping[str, Any]],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[IngestedEvent]:
+    """Insere um lote de eventos de um stream via public.audit_events_ingest.
+
+    Deve rodar dentro da transação tenant-scoped (tenant_scoped_session / require_tenant_scope):
+    a RLS de audit_events vale igual à do INSERT comum. O lote é enviado em blocos de chunk_size
+    eventos, um comando por bloco, todos na mesma transação (o advisory lock do stream é reentrante).
+    event_hash/prev_hash saem idênticos aos da inserção linha a linha, na ordem de `events`.
+    tenant_id=None grava no stream GLOBAL (exige role que ignora RLS).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser >= 1")
+    payload = [_event_json(event) for event in events]
+    ingested: List[IngestedEvent] = []
+    for start in range(0, len(payload), chunk_size):
+        chunk = payload[start : start + chunk_size]
+        result = await session.execute(
+            _INGEST_SQL,
+            {"tenant_id": None if tenant_id is None else str(tenant_id), "events": json.dumps(chunk)},
+        )
+        ingested.extend(IngestedEvent(id=row.id, event_hash=row.event_hash) for row in result)
+    return ingested
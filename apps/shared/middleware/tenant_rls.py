@@ -1,14 +1,41 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
-from typing import AsyncIterator, Callable, Protocol
+import asyncio
+import bisect
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 
 TENANT_GUC = "app.current_tenant_id"
 
+T = TypeVar("T")
+
+# Métricas de tenant_scoped_session (segundos), rotuladas pelo tenant.
+METRIC_POOL_WAIT = "tenant_session.pool_wait_seconds"  # espera pela conexão
+METRIC_SET_GUC = "tenant_session.set_guc_seconds"  # aplicar o tenant (no modo pipelined inclui o BEGIN)
+METRIC_TRANSACTION = "tenant_session.transaction_seconds"  # conexão obtida -> COMMIT/ROLLBACK concluído
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
 
 class AsyncSessionFactory(Protocol):
     """Compatível com sqlalchemy.ext.asyncio.async_sessionmaker."""
@@ -16,31 +43,638 @@ class AsyncSessionFactory(Protocol):
     def __call__(self) -> AsyncSession: ...
 
 
+class TenantMetricsSink(Protocol):
+    """Destino das métricas (Prometheus, OpenTelemetry, logs...). Não deve levantar exceção."""
+
+    def observe(self, metric: str, tenant_id: UUID, seconds: float) -> None: ...
+
+
+@dataclass
+class TenantHistogram:
+    bounds: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = field(default_factory=list)  # len(bounds) + 1; o último é +Inf
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Limite superior do bucket que contém o quantil q (inf se cair no bucket +Inf)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class InMemoryTenantMetricsSink:
+    """Sink em memória (testes e diagnóstico): um histograma por (métrica, tenant)."""
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.histograms: Dict[Tuple[str, UUID], TenantHistogram] = {}
+
+    def observe(self, metric: str, tenant_id: UUID, seconds: float) -> None:
+        key = (metric, tenant_id)
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = TenantHistogram(self.bounds)
+        hist.observe(seconds)
+
+    def histogram(self, metric: str, tenant_id: UUID) -> TenantHistogram:
+        return self.histograms.get((metric, tenant_id)) or TenantHistogram(self.bounds)
+
+    def top_tenants(self, metric: str, n: int = 10) -> List[Tuple[UUID, float]]:
+        """Tenants com maior tempo acumulado na métrica (vizinhos ruidosos, saturação do pool)."""
+        totals = [(tenant_id, hist.total) for (name, tenant_id), hist in self.histograms.items() if name == metric]
+        return sorted(totals, key=lambda item: item[1], reverse=True)[:n]
+
+
+_metrics_sink: Optional[TenantMetricsSink] = None
+
+
+def set_metrics_sink(sink: Optional[TenantMetricsSink]) -> Optional[TenantMetricsSink]:
+    """Define o sink padrão das sessões tenant-scoped (None desliga); devolve o anterior."""
+    global _metrics_sink
+    previous, _metrics_sink = _metrics_sink, sink
+    return previous
+
+
+class _SessionMetrics:
+    # Só existe com sink configurado: sem sink, nenhuma medição nem alocação por sessão.
+    __slots__ = ("sink", "tenant_id", "started", "acquired", "pool_wait")
+
+    def __init__(self, sink: TenantMetricsSink, tenant_id: UUID, pool_wait: bool = True) -> None:
+        self.sink = sink
+        self.tenant_id = tenant_id
+        self.started = time.perf_counter()
+        self.acquired: Optional[float] = None
+        # False quando a espera já foi medida por quem obteve a conexão (TenantAffinePool.acquire).
+        self.pool_wait = pool_wait
+
+    def observe(self, metric: str, since: float) -> float:
+        now = time.perf_counter()
+        self.sink.observe(metric, self.tenant_id, now - since)
+        return now
+
+    def connection_acquired(self) -> None:
+        self.acquired = self.observe(METRIC_POOL_WAIT, self.started) if self.pool_wait else time.perf_counter()
+
+    def transaction_done(self) -> None:
+        if self.acquired is not None:
+            self.observe(METRIC_TRANSACTION, self.acquired)
+
+
 async def set_tenant_guc(session: AsyncSession, tenant_id: UUID) -> None:
-    """Aplica o tenant no escopo da transação/conexão atual via SET LOCAL."""
-    await session.execute(text(f"SET LOCAL {TENANT_GUC} = :tenant_id"), {"tenant_id": str(tenant_id)})
+    """Aplica o tenant no escopo da transação atual (equivalente a SET LOCAL).
+
+    Usa set_config(..., true) porque SET não aceita parâmetros bind em drivers com binding no
+    servidor (asyncpg, psycopg 3).
+    """
+    await session.execute(
+        text("SELECT set_config(:guc, :tenant_id, true)"), {"guc": TENANT_GUC, "tenant_id": str(tenant_id)}
+    )
+
+
+def _transaction_options(read_only: bool) -> Optional[Dict[str, Any]]:
+    # READ ONLY vai no próprio BEGIN do driver, sem um SET TRANSACTION a mais.
+    return {"postgresql_readonly": True} if read_only else None
+
+
+def _begin_with_tenant_sql(tenant_id: UUID, read_only: bool = False) -> str:
+    # UUID(str(...)) normaliza e valida: o valor vai literal no SQL (protocolo simples, sem bind).
+    begin = "BEGIN READ ONLY" if read_only else "BEGIN"
+    return f"{begin}; SELECT set_config('{TENANT_GUC}', '{UUID(str(tenant_id))}', true)"
+
+
+async def _discard_if_in_transaction(conn: AsyncConnection, raw: Any) -> None:
+    """Fail-closed: conexão nunca volta ao pool dentro de uma transação com o tenant aplicado."""
+    if raw.is_closed() or not raw.is_in_transaction():
+        return
+    try:
+        await raw.execute("ROLLBACK")
+    except BaseException:
+        await conn.invalidate()
+        raise
+
+
+@asynccontextmanager
+async def _pipelined_tenant_transaction(
+    session: AsyncSession, tenant_id: UUID, metrics: Optional[_SessionMetrics] = None, read_only: bool = False
+) -> AsyncIterator[AsyncSession]:
+    # O SQLAlchemy fica em AUTOCOMMIT (não emite BEGIN próprio); BEGIN + set_config seguem numa
+    # única mensagem do protocolo simples, e COMMIT/ROLLBACK são emitidos aqui.
+    # Em conexão externa (TenantAffinePool, run_for_tenants) o isolamento vale para a conexão, não
+    # para a sessão: o nível anterior é restaurado ao final, antes de a conexão ser reaproveitada.
+    external = session.bind if isinstance(session.bind, AsyncConnection) else None
+    previous = _previous_options(external, "isolation_level") if external is not None else {}
+    conn = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    raw = (await conn.get_raw_connection()).driver_connection
+    if metrics is not None:
+        metrics.connection_acquired()
+    try:
+        await raw.execute(_begin_with_tenant_sql(tenant_id, read_only))
+        if metrics is not None:
+            metrics.observe(METRIC_SET_GUC, metrics.acquired)
+        try:
+            yield session
+            await session.flush()
+        except BaseException:
+            try:
+                await raw.execute("ROLLBACK")
+            except BaseException:
+                # Preserva o erro original; a conexão em estado incerto é descartada, não reaproveitada.
+                await conn.invalidate()
+            raise
+        await raw.execute("COMMIT")
+        await session.commit()
+    finally:
+        await _discard_if_in_transaction(conn, raw)
+        if metrics is not None:
+            metrics.transaction_done()
+        if external is not None:
+            await _restore_options(session, external, previous)
+
+
+def _previous_options(conn: AsyncConnection, *names: str) -> Dict[str, Any]:
+    current = conn.sync_connection.get_execution_options()
+    defaults = {"isolation_level": conn.default_isolation_level, "postgresql_readonly": False}
+    return {name: current.get(name, defaults[name]) for name in names}
+
+
+async def _restore_options(session: AsyncSession, conn: AsyncConnection, options: Dict[str, Any]) -> None:
+    # A sessão precisa soltar a conexão (sem Transaction do SQLAlchemy aberta) antes da troca.
+    await session.close()
+    if not conn.closed and not conn.invalidated:
+        await conn.execution_options(**options)
+
+
+def _supports_pipelining(session: AsyncSession) -> bool:
+    return session.bind is not None and session.bind.dialect.driver == "asyncpg"
 
 
 @asynccontextmanager
 async def tenant_scoped_session(
-    session_factory: AsyncSessionFactory, tenant_id: UUID
+    session_factory: AsyncSessionFactory,
+    tenant_id: UUID,
+    *,
+    pipelined: bool = False,
+    metrics_sink: Optional[TenantMetricsSink] = None,
+    read_only: bool = False,
+) -> AsyncIterator[AsyncSession]:
+    """Context manager padrão para uso em endpoints tenant-scoped.
+
+    Com pipelined=True (asyncpg), BEGIN e o tenant vão ao banco numa única ida e volta, em vez de
+    BEGIN + set_tenant_guc antes da primeira query. A transação, o escopo LOCAL do tenant e o
+    comportamento fail-closed são os mesmos; em outros drivers cai no modo padrão.
+
+    Com `metrics_sink` (ou um sink padrão via set_metrics_sink), registra por tenant a espera pela
+    conexão, o custo de aplicar o tenant e o tempo da transação (METRIC_*).
+
+    read_only=True abre a transação como READ ONLY (ver tenant_scoped_read_session para réplica).
+    """
+    sink = metrics_sink if metrics_sink is not None else _metrics_sink
+    metrics = _SessionMetrics(sink, tenant_id) if sink is not None else None
+    async with _tenant_transaction(session_factory, tenant_id, pipelined, metrics, read_only) as session:
+        yield session
+
+
+@asynccontextmanager
+async def _tenant_transaction(
+    session_factory: AsyncSessionFactory,
+    tenant_id: UUID,
+    pipelined: bool,
+    metrics: Optional[_SessionMetrics],
+    read_only: bool,
 ) -> AsyncIterator[AsyncSession]:
-    """Context manager padrão para uso em endpoints tenant-scoped."""
     session = session_factory()
+    # Conexão externa: o READ ONLY ficaria na conexão reaproveitada; é desfeito ao final.
+    external = session.bind if read_only and isinstance(session.bind, AsyncConnection) else None
+    previous = _previous_options(external, "postgresql_readonly") if external is not None else {}
     try:
-        async with session.begin():
-            await set_tenant_guc(session, tenant_id)
-            yield session
+        if pipelined and _supports_pipelining(session):
+            external = None  # BEGIN READ ONLY por texto, sem opção na conexão
+            async with _pipelined_tenant_transaction(session, tenant_id, metrics, read_only):
+                yield session
+        elif metrics is None:
+            async with session.begin():
+                await session.connection(execution_options=_transaction_options(read_only))
+                await set_tenant_guc(session, tenant_id)
+                yield session
+        else:
+            try:
+                async with session.begin():
+                    await session.connection(execution_options=_transaction_options(read_only))
+                    metrics.connection_acquired()
+                    await set_tenant_guc(session, tenant_id)
+                    metrics.observe(METRIC_SET_GUC, metrics.acquired)
+                    yield session
+            finally:
+                metrics.transaction_done()
     finally:
+        if external is not None:
+            await _restore_options(session, external, previous)
         await session.close()
 
 
-def require_tenant_scope(session_factory: AsyncSessionFactory) -> Callable[[UUID], AsyncIterator[AsyncSession]]:
-    """Helper para integrar com frameworks web como dependency (sem importar FastAPI aqui)."""
+def require_tenant_scope(
+    session_factory: AsyncSessionFactory,
+    *,
+    pipelined: bool = False,
+    metrics_sink: Optional[TenantMetricsSink] = None,
+    read_only: bool = False,
+) -> Callable[[UUID], AsyncIterator[AsyncSession]]:
+    """Helper para integrar com frameworks web como dependency (sem importar FastAPI aqui).
+
+    read_only=True abre a transação READ ONLY no mesmo banco (para réplica: require_tenant_read_scope).
+    """
 
     @asynccontextmanager
     async def _dep(tenant_id: UUID) -> AsyncIterator[AsyncSession]:
-        async with tenant_scoped_session(session_factory, tenant_id) as session:
+        async with tenant_scoped_session(
+            session_factory, tenant_id, pipelined=pipelined, metrics_sink=metrics_sink, read_only=read_only
+        ) as session:
             yield session
 
     return _dep
+
+
+# Atraso de replay da réplica em segundos; 0 se já aplicou tudo o que recebeu (réplica ociosa não
+# parece atrasada) ou se o servidor não está em recovery (primário). NULL quando o atraso não pode
+# ser medido (sem WAL receiver, p.ex. restaurando do arquivo, ou sem transação replicada ainda):
+# desconhecido conta como atrasado, nunca como em dia.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() IS NULL THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+# Falhas de conexão que mandam a leitura para o primário (erros de SQL/validação não caem aqui).
+_REPLICA_UNAVAILABLE = (OSError, asyncio.TimeoutError, exc.OperationalError, exc.InterfaceError)
+
+
+class ReadReplica:
+    """Réplica de leitura com checagem de atraso em cache.
+
+    O atraso é medido no máximo a cada `check_interval` segundos; acima de `max_lag_seconds` as
+    leituras vão ao primário. Réplica indisponível fica fora por `retry_after` segundos.
+    """
+
+    def __init__(
+        self,
+        session_factory: AsyncSessionFactory,
+        *,
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 1.0,
+        retry_after: float = 5.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._lock = asyncio.Lock()
+        self._checked_at = float("-inf")
+        self._down_until = float("-inf")
+        self._healthy = True
+
+    async def usable(self) -> bool:
+        if time.monotonic() < self._down_until:
+            return False
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._healthy
+        async with self._lock:  # uma checagem por vez; as demais reaproveitam o resultado
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                try:
+                    lag = await self._measure_lag()
+                except _REPLICA_UNAVAILABLE:
+                    self.mark_down()
+                    return False
+                self._healthy = lag <= self.max_lag_seconds
+                self._checked_at = time.monotonic()
+        return self._healthy
+
+    def mark_down(self) -> None:
+        self._down_until = time.monotonic() + self.retry_after
+        self._checked_at = float("-inf")
+
+    async def _measure_lag(self) -> float:
+        session = self.session_factory()
+        try:
+            lag = await session.scalar(text(REPLICA_LAG_SQL))
+            return float("inf") if lag is None else float(lag)
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def tenant_scoped_read_session(
+    session_factory: AsyncSessionFactory,
+    tenant_id: UUID,
+    *,
+    replica: Optional[ReadReplica] = None,
+    pipelined: bool = False,
+    metrics_sink: Optional[TenantMetricsSink] = None,
+) -> AsyncIterator[AsyncSession]:
+    """Sessão tenant-scoped somente leitura (listagens, busca), preferindo a réplica.
+
+    Mesmo tenant e escopo LOCAL de tenant_scoped_session, numa transação READ ONLY. Vai ao primário
+    (`session_factory`, também READ ONLY) se não houver réplica, se ela estiver atrasada ou se a
+    conexão com ela falhar; a decisão é tomada antes de entregar a sessão, nunca no meio dela.
+    """
+    async with AsyncExitStack() as stack:
+        session: Optional[AsyncSession] = None
+        if replica is not None and await replica.usable():
+            try:
+                session = await stack.enter_async_context(
+                    tenant_scoped_session(
+                        replica.session_factory,
+                        tenant_id,
+                        pipelined=pipelined,
+                        metrics_sink=metrics_sink,
+                        read_only=True,
+                    )
+                )
+            except _REPLICA_UNAVAILABLE:
+                replica.mark_down()
+        if session is None:
+            session = await stack.enter_async_context(
+                tenant_scoped_session(
+                    session_factory, tenant_id, pipelined=pipelined, metrics_sink=metrics_sink, read_only=True
+                )
+            )
+        yield session
+
+
+def require_tenant_read_scope(
+    session_factory: AsyncSessionFactory,
+    *,
+    replica: Optional[ReadReplica] = None,
+    pipelined: bool = False,
+    metrics_sink: Optional[TenantMetricsSink] = None,
+) -> Callable[[UUID], AsyncIterator[AsyncSession]]:
+    """Versão somente leitura de require_tenant_scope (ver tenant_scoped_read_session)."""
+
+    @asynccontextmanager
+    async def _dep(tenant_id: UUID) -> AsyncIterator[AsyncSession]:
+        async with tenant_scoped_read_session(
+            session_factory, tenant_id, replica=replica, pipelined=pipelined, metrics_sink=metrics_sink
+        ) as session:
+            yield session
+
+    return _dep
+
+
+@dataclass
+class TenantPoolStats:
+    hits: int = 0  # conexão ociosa do próprio tenant reaproveitada
+    misses: int = 0  # conexão nova aberta
+    steals: int = 0  # conexão ociosa de outro tenant (LRU) reatribuída
+    evictions: int = 0  # afinidades ociosas descartadas por LRU
+    waits: int = 0  # acquires que precisaram esperar (pool cheio ou limite do tenant)
+
+
+class TenantAffinePool:
+    """Pool de conexões com afinidade por tenant, com o escopo de tenant_scoped_session.
+
+    - Afinidade: a conexão devolvida fica ociosa sob o tenant que a usou; o próximo request do
+      mesmo tenant a reaproveita (statements preparados e caches da conexão já aquecidos).
+    - Fair share: cada tenant usa no máximo `max_per_tenant` conexões ao mesmo tempo; um tenant
+      grande espera a própria vez em vez de esgotar o pool dos demais.
+    - LRU: no máximo `max_idle_tenants` tenants mantêm conexões ociosas; a afinidade menos usada
+      recentemente é descartada, e com o pool cheio uma conexão ociosa de outro tenant é reatribuída.
+
+    A conexão só volta ao pool se estiver fora de transação (fail-closed: tenant aplicado com escopo
+    LOCAL nunca atravessa requests). O pool do engine deve comportar `max_connections`.
+
+    Com `metrics_sink` (ou o sink padrão), a espera em acquire() entra em METRIC_POOL_WAIT, e
+    session() registra também METRIC_SET_GUC e METRIC_TRANSACTION.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        max_connections: int = 10,
+        max_per_tenant: Optional[int] = None,
+        max_idle_tenants: Optional[int] = None,
+        pipelined: bool = False,
+        metrics_sink: Optional[TenantMetricsSink] = None,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections deve ser >= 1")
+        self._engine = engine
+        self.max_connections = max_connections
+        self.max_per_tenant = max_per_tenant or max(1, max_connections // 2)
+        self.max_idle_tenants = max_idle_tenants or max_connections
+        self.pipelined = pipelined
+        self.metrics_sink = metrics_sink
+        self.stats = TenantPoolStats()
+        self._cond = asyncio.Condition()
+        self._idle: "OrderedDict[UUID, List[AsyncConnection]]" = OrderedDict()  # LRU primeiro
+        self._active: Dict[UUID, int] = {}
+        self._total = 0  # conexões abertas ou sendo abertas (ociosas + em uso)
+        self._closed = False
+
+    async def acquire(self, tenant_id: UUID) -> AsyncConnection:
+        """Conexão para o tenant; a espera (fair share, pool cheio, conexão nova) vai para METRIC_POOL_WAIT."""
+        sink = self._sink()
+        started = time.perf_counter() if sink is not None else 0.0
+        conn: Optional[AsyncConnection] = None
+        waited = False
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("TenantAffinePool fechado")
+                if self._active.get(tenant_id, 0) < self.max_per_tenant:
+                    conn = self._pop_idle(tenant_id)
+                    if conn is not None:
+                        self.stats.hits += 1
+                        break
+                    if self._total < self.max_connections:
+                        self._total += 1
+                        self.stats.misses += 1
+                        break
+                    conn = self._pop_lru_idle()
+                    if conn is not None:
+                        self.stats.steals += 1
+                        break
+                if not waited:
+                    self.stats.waits += 1
+                    waited = True
+                await self._cond.wait()
+            self._active[tenant_id] = self._active.get(tenant_id, 0) + 1
+
+        if conn is None:
+            try:
+                conn = await self._engine.connect()
+            except BaseException:
+                async with self._cond:
+                    self._total -= 1
+                    self._dec_active(tenant_id)
+                    self._cond.notify_all()
+                raise
+        if sink is not None:
+            sink.observe(METRIC_POOL_WAIT, tenant_id, time.perf_counter() - started)
+        return conn
+
+    async def release(self, tenant_id: UUID, conn: AsyncConnection, *, reusable: bool = True) -> None:
+        to_close: List[AsyncConnection] = []
+        async with self._cond:
+            self._dec_active(tenant_id)
+            if reusable and not self._closed:
+                self._idle.setdefault(tenant_id, []).append(conn)
+                self._idle.move_to_end(tenant_id)
+                while len(self._idle) > self.max_idle_tenants:
+                    _, evicted = self._idle.popitem(last=False)
+                    self.stats.evictions += 1
+                    to_close.extend(evicted)
+            else:
+                to_close.append(conn)
+            self._total -= len(to_close)
+            self._cond.notify_all()
+        for c in to_close:
+            await c.close()
+
+    @asynccontextmanager
+    async def session(self, tenant_id: UUID) -> AsyncIterator[AsyncSession]:
+        """Equivalente a tenant_scoped_session, numa conexão com afinidade pelo tenant."""
+        conn = await self.acquire(tenant_id)
+        reusable = False
+        try:
+            sink = self._sink()
+            # A espera pela conexão já foi registrada em acquire(); aqui só o tenant e a transação.
+            metrics = _SessionMetrics(sink, tenant_id, pool_wait=False) if sink is not None else None
+            async with _tenant_transaction(
+                lambda: AsyncSession(bind=conn, expire_on_commit=False), tenant_id, self.pipelined, metrics, False
+            ) as session:
+                yield session
+        finally:
+            try:
+                reusable = await _is_clean(conn)
+            finally:
+                await self.release(tenant_id, conn, reusable=reusable)
+
+    def dependency(self) -> Callable[[UUID], AsyncIterator[AsyncSession]]:
+        """Mesmo formato de require_tenant_scope, para uso como dependency."""
+        return self.session
+
+    async def close(self) -> None:
+        async with self._cond:
+            self._closed = True
+            idle = [c for conns in self._idle.values() for c in conns]
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for c in idle:
+            await c.close()
+
+    def _sink(self) -> Optional[TenantMetricsSink]:
+        return self.metrics_sink if self.metrics_sink is not None else _metrics_sink
+
+    def _pop_idle(self, tenant_id: UUID) -> Optional[AsyncConnection]:
+        conns = self._idle.get(tenant_id)
+        if not conns:
+            return None
+        conn = conns.pop()
+        if conns:
+            self._idle.move_to_end(tenant_id)
+        else:
+            del self._idle[tenant_id]
+        return conn
+
+    def _pop_lru_idle(self) -> Optional[AsyncConnection]:
+        for tenant_id in self._idle:
+            return self._pop_idle(tenant_id)
+        return None
+
+    def _dec_active(self, tenant_id: UUID) -> None:
+        remaining = self._active.get(tenant_id, 0) - 1
+        if remaining > 0:
+            self._active[tenant_id] = remaining
+        else:
+            self._active.pop(tenant_id, None)
+
+
+@dataclass
+class TenantBatchResult(Generic[T]):
+    tenant_id: UUID
+    value: Optional[T] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_for_tenants(
+    engine: AsyncEngine,
+    tenant_ids: Iterable[UUID],
+    fn: Callable[[AsyncSession, UUID], Awaitable[T]],
+    *,
+    concurrency: int = 8,
+    pipelined: bool = False,
+) -> Dict[UUID, TenantBatchResult[T]]:
+    """Executa `fn(session, tenant_id)` para muitos tenants (jobs noturnos, sync de normas etc.).
+
+    Até `concurrency` workers, cada um com uma conexão própria reaproveitada entre tenants: cada
+    tenant roda na sua transação via tenant_scoped_session (tenant aplicado com escopo LOCAL), então
+    trocar de tenant na mesma conexão não vaza o anterior. Erros são coletados por tenant (a
+    transação daquele tenant sofre ROLLBACK e o lote continua); a conexão que não voltar limpa é
+    fechada e o worker abre outra. Resultado na ordem de `tenant_ids`, sem duplicatas.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency deve ser >= 1")
+    ordered = list(dict.fromkeys(tenant_ids))
+    queue: "asyncio.Queue[UUID]" = asyncio.Queue()
+    for tenant_id in ordered:
+        queue.put_nowait(tenant_id)
+    results: Dict[UUID, TenantBatchResult[T]] = {}
+
+    async def _worker() -> None:
+        conn: Optional[AsyncConnection] = None
+        try:
+            while not queue.empty():
+                tenant_id = queue.get_nowait()
+                result: TenantBatchResult[T] = TenantBatchResult(tenant_id)
+                try:
+                    if conn is None:
+                        conn = await engine.connect()
+                    bound = conn
+                    async with tenant_scoped_session(
+                        lambda: AsyncSession(bind=bound, expire_on_commit=False), tenant_id, pipelined=pipelined
+                    ) as session:
+                        result.value = await fn(session, tenant_id)
+                except Exception as error:
+                    result.error = error
+                results[tenant_id] = result
+                if conn is not None and not await _is_clean(conn):
+                    await conn.close()
+                    conn = None
+        finally:
+            if conn is not None:
+                await conn.close()
+
+    await asyncio.gather(*(_worker() for _ in range(min(concurrency, len(ordered)))))
+    return {tenant_id: results[tenant_id] for tenant_id in ordered}
+
+
+async def _is_clean(conn: AsyncConnection) -> bool:
+    if conn.closed or conn.invalidated or conn.in_transaction():
+        return False
+    raw = (await conn.get_raw_connection()).driver_connection
+    in_transaction = getattr(raw, "is_in_transaction", None)
+    return not (in_transaction is not None and in_transaction())
@@ -0,0 +1,173 @@
+-- 20261018_100_audit_chain_heads.sql
+-- Objetivo: lookup O(1) do prev_hash no trg_audit_events_hashchain.
+--
+-- Antes: a cada INSERT o trigger buscava o último evento do stream com
+--   WHERE tenant_id IS NOT DISTINCT FROM NEW.tenant_id ORDER BY id DESC LIMIT 1
+-- e IS NOT DISTINCT FROM não usa o índice (tenant_id, id): o custo crescia com o tamanho da tabela.
+-- Agora: public.audit_chain_heads guarda a cabeça de cada stream (tenant_id ou GLOBAL), lida por PK
+-- e avançada pelo próprio trigger, sob o mesmo advisory lock por stream.
+--
+-- Notas:
+-- - Hashes idênticos aos da 20260216_123 (mesma forma canônica; cabeça = evento de maior id do stream).
+-- - Forma canônica, cabeça e encadeamento ficam em funções (audit_event_hash, audit_chain_head_hash,
+--   audit_chain_advance_head, audit_chain_link), reaproveitadas pela ingestão em lote (20261018_110)
+--   e pelas raízes Merkle (20261018_120); o trigger só chama audit_chain_link.
+-- - Streams sem cabeça (eventos anteriores a esta migration) são inicializados no primeiro INSERT,
+--   com uma busca pelo índice (tenant_id, id). O backfill abaixo adianta isso quando a migration
+--   roda com role que ignora RLS (audit_events tem FORCE RLS).
+-- - audit_chain_heads não é gravável pelas roles da aplicação: sem privilégios para PUBLIC e RLS
+--   ligado sem policy. Só o trigger e as funções de cadeia (SECURITY DEFINER, search_path fixo) leem
+--   e avançam a cabeça; não conceda DML nesta tabela a roles que inserem em audit_events.
+-- - Corrida id x lock: o default de id (nextval) é avaliado antes do trigger, ou seja, antes do
+--   advisory lock; com escritores concorrentes a ordem dos ids podia divergir da ordem da cadeia
+--   (verify_audit_chain percorre por id e via prev_hash quebrado). audit_chain_link agora
+--   reatribui o id com nextval depois de tomar o lock: ordem de id = ordem da cadeia, ao custo de um
+--   valor de sequence descartado por linha (ids já tinham lacunas em rollback).
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.tables
+    WHERE table_schema='public' AND table_name='audit_events'
+  ) THEN
+    RAISE NOTICE 'Table public.audit_events not found; skipping 20261018_100_audit_chain_heads.sql';
+    RETURN;
+  END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS public.audit_chain_heads (
+  stream_key text PRIMARY KEY,          -- tenant_id::text ou 'GLOBAL'
+  last_id    bigint NOT NULL,
+  last_hash  text NOT NULL,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Backfill (best effort): cabeça = evento de maior id de cada stream visível.
+INSERT INTO public.audit_chain_heads (stream_key, last_id, last_hash)
+SELECT DISTINCT ON (COALESCE(ae.tenant_id::text, 'GLOBAL'))
+       COALESCE(ae.tenant_id::text, 'GLOBAL'), ae.id, ae.event_hash
+FROM public.audit_events ae
+WHERE ae.event_hash IS NOT NULL
+ORDER BY COALESCE(ae.tenant_id::text, 'GLOBAL'), ae.id DESC
+ON CONFLICT (stream_key) DO UPDATE
+  SET last_id = EXCLUDED.last_id, last_hash = EXCLUDED.last_hash, updated_at = now()
+  WHERE public.audit_chain_heads.last_id < EXCLUDED.last_id;
+
+REVOKE ALL ON public.audit_chain_heads FROM PUBLIC;
+ALTER TABLE public.audit_chain_heads ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.audit_event_hash(p_prev_hash text, e public.audit_events)
+RETURNS text
+LANGUAGE sql
+STABLE
+AS $$
+  -- Canonical: jsonb::text é determinístico (chaves ordenadas no jsonb)
+  SELECT encode(
+    digest(
+      concat_ws(
+        '|',
+        p_prev_hash,
+        COALESCE(e.occurred_at::text, ''),
+        COALESCE(e.actor, ''),
+        COALESCE(e.action, ''),
+        COALESCE(e.resource_ref, ''),
+        COALESCE(e.correlation_id, ''),
+        COALESCE(e.trace_id, ''),
+        COALESCE(e.payload_json::text, '{}')
+      ),
+      'sha256'
+    ),
+    'hex'
+  )
+$$;
+
+-- Cabeça atual do stream; sem registro, inicializa pelo último evento (índice (tenant_id, id)).
+CREATE OR REPLACE FUNCTION public.audit_chain_head_hash(p_tenant_id uuid)
+RETURNS text
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+  v_prev text;
+BEGIN
+  SELECT h.last_hash INTO v_prev
+  FROM public.audit_chain_heads h
+  WHERE h.stream_key = COALESCE(p_tenant_id::text, 'GLOBAL');
+
+  IF NOT FOUND THEN
+    IF p_tenant_id IS NULL THEN
+      SELECT ae.event_hash INTO v_prev
+      FROM public.audit_events ae
+      WHERE ae.tenant_id IS NULL AND ae.event_hash IS NOT NULL
+      ORDER BY ae.id DESC
+      LIMIT 1;
+    ELSE
+      SELECT ae.event_hash INTO v_prev
+      FROM public.audit_events ae
+      WHERE ae.tenant_id = p_tenant_id AND ae.event_hash IS NOT NULL
+      ORDER BY ae.id DESC
+      LIMIT 1;
+    END IF;
+  END IF;
+
+  RETURN COALESCE(v_prev, repeat('0', 64));
+END $$;
+
+CREATE OR REPLACE FUNCTION public.audit_chain_advance_head(p_stream_key text, p_last_id bigint, p_last_hash text)
+RETURNS void
+LANGUAGE sql
+AS $$
+  -- Maior id vence, como no ORDER BY id DESC original.
+  INSERT INTO public.audit_chain_heads (stream_key, last_id, last_hash, updated_at)
+  VALUES (p_stream_key, p_last_id, p_last_hash, now())
+  ON CONFLICT (stream_key) DO UPDATE
+    SET last_id = EXCLUDED.last_id, last_hash = EXCLUDED.last_hash, updated_at = EXCLUDED.updated_at
+    WHERE public.audit_chain_heads.last_id < EXCLUDED.last_id
+$$;
+
+-- Encadeia um evento no seu stream: lock, id, prev_hash, event_hash e avanço da cabeça. A sequence
+-- de audit_events.id é resolvida uma vez aqui (pg_get_serial_sequence) e fica literal na função.
+DO $do$
+DECLARE
+  v_seq text := pg_get_serial_sequence('public.audit_events', 'id');
+BEGIN
+  EXECUTE format($fn$
+    CREATE OR REPLACE FUNCTION public.audit_chain_link(e public.audit_events)
+    RETURNS public.audit_events
+    LANGUAGE plpgsql
+    SECURITY DEFINER
+    SET search_path = pg_catalog, public, pg_temp
+    AS $body$
+    DECLARE
+      v_stream_key text := COALESCE(e.tenant_id::text, 'GLOBAL');
+    BEGIN
+      -- Serializa concorrência por stream (evita corrida no prev_hash)
+      PERFORM pg_advisory_xact_lock(hashtext(v_stream_key));
+
+      -- id sob o lock: o default foi avaliado antes do trigger, fora da seção serializada.
+      e.id := nextval(%L::regclass);
+
+      e.prev_hash := public.audit_chain_head_hash(e.tenant_id);
+      e.event_hash := public.audit_event_hash(e.prev_hash, e);
+
+      -- Se o INSERT falhar, o avanço da cabeça é desfeito junto com o comando.
+      PERFORM public.audit_chain_advance_head(v_stream_key, e.id, e.event_hash);
+      RETURN e;
+    END $body$
+  $fn$, v_seq);
+END $do$;
+
+-- Só o trigger (e a ingestão em lote da 20261018_110) leem e avançam a cabeça.
+REVOKE EXECUTE ON FUNCTION public.audit_chain_head_hash(uuid) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.audit_chain_advance_head(text, bigint, text) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.audit_chain_link(public.audit_events) FROM PUBLIC;
+
+CREATE OR REPLACE FUNCTION public.trg_audit_events_hashchain()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = pg_catalog, public, pg_temp
+AS $$
+BEGIN
+  RETURN public.audit_chain_link(NEW);
+END $$;
@@ -0,0 +1,129 @@
+-- 20261018_110_audit_events_bulk_ingest.sql
+-- Objetivo: ingestão em lote de audit_events de um stream (ex.: histórico de municípios novos).
+--
+-- public.audit_events_ingest(tenant_id, events jsonb) recebe um array JSON de eventos, toma o advisory
+-- lock do stream e lê a cabeça (audit_chain_heads) uma vez, insere tudo num único INSERT ... SELECT
+-- (na ordem do array) e avança a cabeça uma vez no final.
+--
+-- Notas:
+-- - Hashes idênticos à inserção linha a linha: o trigger continua calculando event_hash com a mesma
+--   forma canônica (public.audit_event_hash, 20261018_100); no lote, o prev_hash vem do hash da
+--   linha anterior, mantido em GUC local da transação, em vez de lock + cabeça por linha.
+-- - Campos aceitos por evento: occurred_at (default now()), actor (obrigatório), action,
+--   resource_ref, correlation_id, trace_id, payload_json (default {}).
+-- - Mesma RLS do INSERT comum: o tenant precisa estar aplicado na transação (tenant_scoped_session).
+--   A função é SECURITY DEFINER (lê e avança audit_chain_heads, que não é acessível às roles da
+--   aplicação) e confere o tenant explicitamente: p_tenant_id igual ao app.current_tenant_id, ou
+--   sessão de role que ignora RLS (GLOBAL e outros tenants), senão 42501.
+-- - O modo lote do trigger não confia só nas GUCs (a aplicação pode setá-las): vale apenas quando
+--   existe a linha desta transação em public.audit_ingest_batches, que só a função grava (sem
+--   privilégios para PUBLIC). INSERT comum com GUCs forjadas segue o caminho com lock e cabeça.
+-- - Requer 20261018_100_audit_chain_heads.sql: aqui o trigger só ganha o modo lote; fora dele segue em
+--   audit_chain_link.
+
+-- Lote em andamento por backend; gravada e apagada por audit_events_ingest na própria transação.
+CREATE UNLOGGED TABLE IF NOT EXISTS public.audit_ingest_batches (
+  backend_pid int PRIMARY KEY,
+  xact_id     xid8 NOT NULL,
+  stream_key  text NOT NULL
+);
+
+REVOKE ALL ON public.audit_ingest_batches FROM PUBLIC;
+
+-- Mesmo critério da RLS de audit_events, para funções SECURITY DEFINER (onde current_user é o owner):
+-- tenant aplicado na transação, ou sessão de role que ignora RLS (pode voltar a ela com RESET ROLE).
+CREATE OR REPLACE FUNCTION public.audit_stream_authorized(p_tenant_id uuid)
+RETURNS boolean
+LANGUAGE sql
+STABLE
+SET search_path = pg_catalog, public, pg_temp
+AS $$
+  SELECT (p_tenant_id IS NOT NULL AND p_tenant_id = NULLIF(current_setting('app.current_tenant_id', true), '')::uuid)
+      OR EXISTS (SELECT 1 FROM pg_roles r WHERE r.rolname = session_user AND (r.rolsuper OR r.rolbypassrls))
+$$;
+
+CREATE OR REPLACE FUNCTION public.trg_audit_events_hashchain()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = pg_catalog, public, pg_temp
+AS $$
+DECLARE
+  v_stream_key text;
+BEGIN
+  -- Stream key: tenant_id ou GLOBAL
+  v_stream_key := COALESCE(NEW.tenant_id::text, 'GLOBAL');
+
+  IF current_setting('app.audit_ingest_stream', true) = v_stream_key
+     AND EXISTS (
+       SELECT 1 FROM public.audit_ingest_batches b
+       WHERE b.backend_pid = pg_backend_pid() AND b.xact_id = pg_current_xact_id() AND b.stream_key = v_stream_key
+     ) THEN
+    -- Lote de audit_events_ingest: lock e cabeça já tratados uma vez pela função; o id vem do
+    -- default, avaliado dentro do INSERT da função e portanto já sob o lock.
+    NEW.prev_hash := current_setting('app.audit_ingest_prev');
+    NEW.event_hash := public.audit_event_hash(NEW.prev_hash, NEW);
+    PERFORM set_config('app.audit_ingest_prev', NEW.event_hash, true);
+    RETURN NEW;
+  END IF;
+
+  RETURN public.audit_chain_link(NEW);
+END $$;
+
+CREATE OR REPLACE FUNCTION public.audit_events_ingest(p_tenant_id uuid, p_events jsonb)
+RETURNS TABLE (id bigint, event_hash text)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = pg_catalog, public, pg_temp
+AS $$
+DECLARE
+  v_stream_key text := COALESCE(p_tenant_id::text, 'GLOBAL');
+  v_ids bigint[];
+  v_hashes text[];
+BEGIN
+  IF jsonb_typeof(p_events) IS DISTINCT FROM 'array' THEN
+    RAISE EXCEPTION 'audit_events_ingest: events must be a JSON array' USING ERRCODE = '22023';
+  END IF;
+  IF NOT public.audit_stream_authorized(p_tenant_id) THEN
+    RAISE EXCEPTION 'audit_events_ingest: stream % is not the tenant applied to this transaction', v_stream_key
+      USING ERRCODE = '42501';
+  END IF;
+
+  PERFORM pg_advisory_xact_lock(hashtext(v_stream_key));
+  INSERT INTO public.audit_ingest_batches AS b (backend_pid, xact_id, stream_key)
+  VALUES (pg_backend_pid(), pg_current_xact_id(), v_stream_key)
+  ON CONFLICT (backend_pid) DO UPDATE SET xact_id = EXCLUDED.xact_id, stream_key = EXCLUDED.stream_key;
+  PERFORM set_config('app.audit_ingest_prev', public.audit_chain_head_hash(p_tenant_id), true);
+  PERFORM set_config('app.audit_ingest_stream', v_stream_key, true);
+
+  WITH ins AS (
+    INSERT INTO public.audit_events
+      (tenant_id, occurred_at, actor, action, resource_ref, correlation_id, trace_id, payload_json)
+    SELECT
+      p_tenant_id,
+      COALESCE((x.e->>'occurred_at')::timestamptz, now()),
+      x.e->>'actor',
+      x.e->>'action',
+      x.e->>'resource_ref',
+      x.e->>'correlation_id',
+      x.e->>'trace_id',
+      COALESCE(x.e->'payload_json', '{}'::jsonb)
+    FROM jsonb_array_elements(p_events) WITH ORDINALITY AS x(e, n)
+    ORDER BY x.n
+    RETURNING audit_events.id, audit_events.event_hash
+  )
+  SELECT array_agg(ins.id ORDER BY ins.id), array_agg(ins.event_hash ORDER BY ins.id)
+    INTO v_ids, v_hashes
+  FROM ins;
+
+  -- Fecha o modo lote antes de devolver o controle ao chamador.
+  DELETE FROM public.audit_ingest_batches b WHERE b.backend_pid = pg_backend_pid();
+  PERFORM set_config('app.audit_ingest_stream', '', true);
+  PERFORM set_config('app.audit_ingest_prev', '', true);
+
+  IF v_ids IS NOT NULL THEN
+    PERFORM public.audit_chain_advance_head(v_stream_key, v_ids[array_upper(v_ids, 1)], v_hashes[array_upper(v_hashes, 1)]);
+  END IF;
+
+  RETURN QUERY SELECT u.id, u.event_hash FROM unnest(v_ids, v_hashes) AS u(id, event_hash);
+END $$;
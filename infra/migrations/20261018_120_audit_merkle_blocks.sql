@@ -0,0 +1,298 @@
+-- 20261018_120_audit_merkle_blocks.sql
+-- Objetivo: provas de inclusão O(log n) para eventos de auditoria, sem reler a cadeia desde o início.
+--
+-- public.audit_merkle_blocks guarda, por stream (tenant_id ou GLOBAL), a raiz Merkle de cada bloco
+-- de eventos consecutivos (em ordem de id), selado periodicamente por tools/db/audit_merkle.py.
+-- Folha = SHA-256(0x00 || event_hash); nó = SHA-256(0x01 || esquerda || direita) (separação de
+-- domínio como na RFC 6962); nó sem par sobe inalterado para o nível seguinte.
+--
+-- Notas:
+-- - event_hash é recalculado do conteúdo com a mesma forma canônica do trigger
+--   (public.audit_event_hash, 20261018_100), então a folha prova conteúdo + prev_hash do evento.
+-- - audit_merkle_verify_proof: confere uma prova (caminho de irmãos) contra a raiz, O(log n) hashes.
+-- - audit_merkle_verify_block: recalcula um bloco inteiro (hashes, encadeamento e raiz); sob RLS o
+--   tenant precisa estar aplicado na transação, como nas demais leituras de audit_events.
+-- - Blocos são append-only, como audit_events.
+-- - Leitura sob RLS (FORCE), com o tenant derivado de stream_key: cada tenant vê só os próprios
+--   blocos; GLOBAL só com role que ignora RLS. Sem privilégios para PUBLIC: conceda apenas SELECT.
+-- - Gravação só por audit_merkle_seal_block (SECURITY DEFINER; EXECUTE só para a role que sela),
+--   que confere o tenant, a sequência de blocos e recalcula a raiz a partir dos eventos antes de
+--   gravar: não há como selar uma raiz que os eventos não provam.
+
+CREATE TABLE IF NOT EXISTS public.audit_merkle_blocks (
+  stream_key        text NOT NULL,          -- tenant_id::text ou 'GLOBAL'
+  block_no          bigint NOT NULL,        -- 0, 1, 2... em ordem de id
+  first_id          bigint NOT NULL,
+  last_id           bigint NOT NULL,
+  leaf_count        integer NOT NULL CHECK (leaf_count > 0),
+  min_occurred_at   timestamptz NOT NULL,
+  max_occurred_at   timestamptz NOT NULL,
+  root_hash         text NOT NULL,          -- hex
+  sealed_at         timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (stream_key, block_no),
+  CHECK (first_id <= last_id)
+);
+
+REVOKE ALL ON public.audit_merkle_blocks FROM PUBLIC;
+ALTER TABLE public.audit_merkle_blocks ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.audit_merkle_blocks FORCE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_policies
+    WHERE schemaname = 'public' AND tablename = 'audit_merkle_blocks' AND policyname = 'stream_isolation'
+  ) THEN
+    CREATE POLICY stream_isolation ON public.audit_merkle_blocks
+      USING (stream_key = current_setting('app.current_tenant_id', true))
+      WITH CHECK (stream_key = current_setting('app.current_tenant_id', true));
+  END IF;
+END $$;
+
+-- Bloco que contém um id: WHERE stream_key = ... AND last_id >= :id ORDER BY last_id LIMIT 1
+CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_merkle_blocks_stream_last_id
+  ON public.audit_merkle_blocks (stream_key, last_id);
+
+CREATE OR REPLACE FUNCTION public.trg_audit_merkle_blocks_immutable()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  RAISE EXCEPTION 'audit_merkle_blocks is append-only: % is forbidden', TG_OP
+    USING ERRCODE = '42501';
+END $$;
+
+DROP TRIGGER IF EXISTS trg_audit_merkle_blocks_immutable ON public.audit_merkle_blocks;
+CREATE TRIGGER trg_audit_merkle_blocks_immutable
+BEFORE UPDATE OR DELETE ON public.audit_merkle_blocks
+FOR EACH ROW EXECUTE FUNCTION public.trg_audit_merkle_blocks_immutable();
+
+CREATE OR REPLACE FUNCTION public.audit_merkle_leaf(p_event_hash text)
+RETURNS bytea
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT digest('\x00'::bytea || decode(p_event_hash, 'hex'), 'sha256')
+$$;
+
+CREATE OR REPLACE FUNCTION public.audit_merkle_node(p_left bytea, p_right bytea)
+RETURNS bytea
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT digest('\x01'::bytea || p_left || p_right, 'sha256')
+$$;
+
+CREATE OR REPLACE FUNCTION public.audit_merkle_root(p_leaves bytea[])
+RETURNS bytea
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+  v_level bytea[] := p_leaves;
+  v_next bytea[];
+  v_count integer;
+  i integer;
+BEGIN
+  IF COALESCE(cardinality(p_leaves), 0) = 0 THEN
+    RETURN NULL;
+  END IF;
+
+  WHILE cardinality(v_level) > 1 LOOP
+    v_next := '{}';
+    v_count := cardinality(v_level);
+    i := 1;
+    WHILE i <= v_count LOOP
+      IF i < v_count THEN
+        v_next := array_append(v_next, public.audit_merkle_node(v_level[i], v_level[i + 1]));
+      ELSE
+        v_next := array_append(v_next, v_level[i]);  -- sem par: sobe inalterado
+      END IF;
+      i := i + 2;
+    END LOOP;
+    v_level := v_next;
+  END LOOP;
+
+  RETURN v_level[1];
+END $$;
+
+-- p_path: irmãos da folha até a raiz (hex), só dos níveis em que o nó tem par.
+CREATE OR REPLACE FUNCTION public.audit_merkle_verify_proof(
+  p_event_hash text,
+  p_leaf_index integer,
+  p_leaf_count integer,
+  p_path       text[],
+  p_root_hash  text
+)
+RETURNS boolean
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+  v_hash bytea := public.audit_merkle_leaf(p_event_hash);
+  v_index integer := p_leaf_index;
+  v_count integer := p_leaf_count;
+  v_used integer := 0;
+  v_sibling bytea;
+BEGIN
+  IF p_leaf_index < 0 OR p_leaf_index >= p_leaf_count THEN
+    RETURN FALSE;
+  END IF;
+
+  WHILE v_count > 1 LOOP
+    IF (v_index # 1) < v_count THEN
+      v_used := v_used + 1;
+      IF v_used > COALESCE(cardinality(p_path), 0) THEN
+        RETURN FALSE;
+      END IF;
+      v_sibling := decode(p_path[v_used], 'hex');
+      IF v_index % 2 = 0 THEN
+        v_hash := public.audit_merkle_node(v_hash, v_sibling);
+      ELSE
+        v_hash := public.audit_merkle_node(v_sibling, v_hash);
+      END IF;
+    END IF;
+    v_index := v_index / 2;
+    v_count := (v_count + 1) / 2;
+  END LOOP;
+
+  RETURN v_used = COALESCE(cardinality(p_path), 0) AND encode(v_hash, 'hex') = p_root_hash;
+END $$;
+
+-- Recalcula o bloco a partir de audit_events: hashes, encadeamento com a linha anterior do stream,
+-- contagem e raiz. NULL se o bloco não existe.
+CREATE OR REPLACE FUNCTION public.audit_merkle_verify_block(p_tenant_id uuid, p_block_no bigint)
+RETURNS boolean
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+  b public.audit_merkle_blocks%ROWTYPE;
+  v_rows public.audit_events[];
+  r public.audit_events;
+  v_prev text;
+  v_leaves bytea[] := '{}';
+BEGIN
+  SELECT * INTO b
+  FROM public.audit_merkle_blocks mb
+  WHERE mb.stream_key = COALESCE(p_tenant_id::text, 'GLOBAL') AND mb.block_no = p_block_no;
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+
+  -- Buscas pelo índice (tenant_id, id): âncora = evento anterior ao bloco no stream.
+  IF p_tenant_id IS NULL THEN
+    SELECT ae.event_hash INTO v_prev
+    FROM public.audit_events ae
+    WHERE ae.tenant_id IS NULL AND ae.id < b.first_id
+    ORDER BY ae.id DESC
+    LIMIT 1;
+
+    SELECT array_agg(ae ORDER BY ae.id) INTO v_rows
+    FROM public.audit_events ae
+    WHERE ae.tenant_id IS NULL AND ae.id BETWEEN b.first_id AND b.last_id;
+  ELSE
+    SELECT ae.event_hash INTO v_prev
+    FROM public.audit_events ae
+    WHERE ae.tenant_id = p_tenant_id AND ae.id < b.first_id
+    ORDER BY ae.id DESC
+    LIMIT 1;
+
+    SELECT array_agg(ae ORDER BY ae.id) INTO v_rows
+    FROM public.audit_events ae
+    WHERE ae.tenant_id = p_tenant_id AND ae.id BETWEEN b.first_id AND b.last_id;
+  END IF;
+  v_prev := COALESCE(v_prev, repeat('0', 64));
+
+  IF COALESCE(cardinality(v_rows), 0) <> b.leaf_count THEN
+    RETURN FALSE;
+  END IF;
+
+  FOREACH r IN ARRAY v_rows LOOP
+    IF COALESCE(r.prev_hash, '') <> v_prev
+       OR COALESCE(r.event_hash, '') <> public.audit_event_hash(r.prev_hash, r) THEN
+      RETURN FALSE;
+    END IF;
+    v_prev := r.event_hash;
+    v_leaves := array_append(v_leaves, public.audit_merkle_leaf(r.event_hash));
+  END LOOP;
+
+  RETURN encode(public.audit_merkle_root(v_leaves), 'hex') = b.root_hash;
+END $$;
+
+-- Grava o próximo bloco do stream. Os metadados (contagem e janela de tempo) vêm dos eventos; a raiz
+-- informada só fica se audit_merkle_verify_block a reproduzir, senão nada é gravado.
+CREATE OR REPLACE FUNCTION public.audit_merkle_seal_block(
+  p_tenant_id uuid,
+  p_block_no  bigint,
+  p_first_id  bigint,
+  p_last_id   bigint,
+  p_root_hash text
+)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = pg_catalog, public, pg_temp
+AS $$
+DECLARE
+  v_stream_key text := COALESCE(p_tenant_id::text, 'GLOBAL');
+  v_last public.audit_merkle_blocks%ROWTYPE;
+  v_next_id bigint;
+  v_count integer;
+  v_min timestamptz;
+  v_max timestamptz;
+BEGIN
+  IF NOT public.audit_stream_authorized(p_tenant_id) THEN
+    RAISE EXCEPTION 'audit_merkle_seal_block: stream % is not the tenant applied to this transaction', v_stream_key
+      USING ERRCODE = '42501';
+  END IF;
+
+  SELECT * INTO v_last
+  FROM public.audit_merkle_blocks mb
+  WHERE mb.stream_key = v_stream_key
+  ORDER BY mb.block_no DESC
+  LIMIT 1;
+  IF p_block_no IS DISTINCT FROM COALESCE(v_last.block_no + 1, 0) THEN
+    RAISE EXCEPTION 'audit_merkle_seal_block: % is not the next block of stream %', p_block_no, v_stream_key
+      USING ERRCODE = '22023';
+  END IF;
+
+  -- O bloco começa no primeiro evento do stream depois do bloco anterior (índice (tenant_id, id)).
+  IF p_tenant_id IS NULL THEN
+    SELECT ae.id INTO v_next_id
+    FROM public.audit_events ae
+    WHERE ae.tenant_id IS NULL AND ae.id > COALESCE(v_last.last_id, 0)
+    ORDER BY ae.id
+    LIMIT 1;
+
+    SELECT count(*), min(ae.occurred_at), max(ae.occurred_at) INTO v_count, v_min, v_max
+    FROM public.audit_events ae
+    WHERE ae.tenant_id IS NULL AND ae.id BETWEEN p_first_id AND p_last_id;
+  ELSE
+    SELECT ae.id INTO v_next_id
+    FROM public.audit_events ae
+    WHERE ae.tenant_id = p_tenant_id AND ae.id > COALESCE(v_last.last_id, 0)
+    ORDER BY ae.id
+    LIMIT 1;
+
+    SELECT count(*), min(ae.occurred_at), max(ae.occurred_at) INTO v_count, v_min, v_max
+    FROM public.audit_events ae
+    WHERE ae.tenant_id = p_tenant_id AND ae.id BETWEEN p_first_id AND p_last_id;
+  END IF;
+  IF v_next_id IS DISTINCT FROM p_first_id THEN
+    RAISE EXCEPTION 'audit_merkle_seal_block: block % of stream % must start at id %',
+      p_block_no, v_stream_key, v_next_id
+      USING ERRCODE = '22023';
+  END IF;
+
+  INSERT INTO public.audit_merkle_blocks
+    (stream_key, block_no, first_id, last_id, leaf_count, min_occurred_at, max_occurred_at, root_hash)
+  VALUES (v_stream_key, p_block_no, p_first_id, p_last_id, v_count, v_min, v_max, p_root_hash);
+
+  IF public.audit_merkle_verify_block(p_tenant_id, p_block_no) IS NOT TRUE THEN
+    RAISE EXCEPTION 'audit_merkle_seal_block: block % of stream % does not match its events', p_block_no, v_stream_key
+      USING ERRCODE = '22000';
+  END IF;
+END $$;
+
+REVOKE EXECUTE ON FUNCTION public.audit_merkle_seal_block(uuid, bigint, bigint, bigint, text) FROM PUBLIC;
@@ -0,0 +1,10 @@
+-- 20261018_130_rls_tenant_indexes.sql
+-- Objetivo: índices compostos liderados por tenant_id para as policies tenant_isolation
+-- (gerado por tools/db/rls_index_coverage.py).
+--
+-- Notas:
+-- - CONCURRENTLY não bloqueia escritas, mas não roda dentro de transação: aplicar com psql -f.
+-- - Se um CREATE INDEX CONCURRENTLY falhar, o índice fica INVALID: DROP INDEX e reaplicar.
+
+-- public.tenant_source_configs: missing_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tenant_source_configs_tenant_id_id ON public.tenant_source_configs (tenant_id, id);
@@ -1,14 +1,48 @@
 """
 Sprint C — E2E smoke test
-Tests: auth → task dispatch+poll → document upload+poll
-Run: python3 scripts/sprint_c_e2e.py
+Tests: auth → task dispatch+wait → document upload+wait (backoff, sprint_c_wait.py)
+Run: python3 scripts/sprint_c_e2e.py  (SPRINT_C_BASE=http://host:port para outro backend;
+     SPRINT_C_UPLOAD_FILE=<pdf> envia um arquivo do disco em vez do PDF mínimo)
 """
+import asyncio
+import importlib.util
 import urllib.request
 import urllib.error
 import json
+import os
+import sys
 import time
+from pathlib import Path
 
-BASE = "http://localhost:8000"
+BASE = os.getenv("SPRINT_C_BASE", "http://localhost:8000")
+
+# Service account e PDF mínimo (magic bytes) também usados por sprint_c_load.py
+LOGIN = {
+    "email": "ceo-console@govevia.internal",
+    "password": "CeoConsoleServiceKey2026!"
+}
+MINIMAL_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog>>endobj\nxref\n0 1\n0000000000 65535 f\n"
+    b"trailer<</Size 1>>\nstartxref\n9\n%%EOF"
+)
+
+# Prazo para task / ingestão terminarem (s)
+TASK_DEADLINE = 30.0
+DOC_DEADLINE = 120.0
+
+
+def _load_sibling(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, Path(__file__).resolve().parent / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sprint_c_wait = _load_sibling("sprint_c_wait")
+sprint_c_upload = _load_sibling("sprint_c_upload")
 
 # Desabilita proxy de sistema — evita 307 redirect no Windows
 _opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
@@ -43,26 +77,36 @@ def post_json_auth(path, data, token):
         return json.loads(r.read())
 
 
+def wait_job(path, token, done, started, deadline):
+    """Polls path with exponential backoff until a status in done; latency counted from started."""
+    async def poll(_wait):
+        return await asyncio.to_thread(get_auth, path, token)
+
+    return asyncio.run(sprint_c_wait.wait_for_job(poll, started=started, done=done, deadline=deadline))
+
+
+def _latency(job):
+    return f"latency_ms={job.latency * 1000:.1f} (±{job.uncertainty * 1000:.1f}, {job.requests} polls)"
+
+
 def main():
     # 1. Auth
-    login = post_json("/api/v1/auth/login", {
-        "email": "ceo-console@govevia.internal",
-        "password": "CeoConsoleServiceKey2026!"
-    })
+    login = post_json("/api/v1/auth/login", LOGIN)
     token = login["access_token"]
     print(f"[auth]   OK  token={token[:22]}...")
     assert token, "no access_token in login response"
 
-    # 2. Task dispatch + poll
+    # 2. Task dispatch + wait
+    started = time.perf_counter()
     dispatch = post_json("/api/v1/tasks/dispatch", {
         "handler": "ping",
         "payload": {"from": "sprint-c-e2e"}
     })
     tid = dispatch["task_id"]
     print(f"[task]   dispatched  task_id={tid}  status={dispatch['status']}")
-    time.sleep(1)
-    result = get_auth(f"/api/v1/tasks/{tid}", token)
-    print(f"[task]   polled  status={result['status']}  elapsed_ms={result.get('elapsed_ms')}")
+    task = wait_job(f"/api/v1/tasks/{tid}", token, sprint_c_wait.TASK_DONE, started, TASK_DEADLINE)
+    result = task.status
+    print(f"[task]   done  status={result['status']}  {_latency(task)}  elapsed_ms={result.get('elapsed_ms')}")
     assert result["status"] == "success", f"task not success: {result}"
 
     # 3. Handlers list
@@ -71,47 +115,44 @@ def main():
     assert "ping" in handlers["handlers"]
     assert "normas_sync" in handlers["handlers"]
 
-    # 4. Document upload (manual multipart, PDF magic bytes)
-    boundary = "SprintCE2EBoundary01"
+    # 4. Document upload (multipart streamed from disk in chunks, PDF magic bytes)
+    upload_file = os.getenv("SPRINT_C_UPLOAD_FILE")
     # Minimal valid PDF magic header so backend accepts the file type check
-    file_content = b"%PDF-1.4\n1 0 obj<</Type/Catalog>>endobj\nxref\n0 1\n0000000000 65535 f\ntrailer<</Size 1>>\nstartxref\n9\n%%EOF"
-    body_parts = [
-        f"--{boundary}\r\n".encode(),
-        b'Content-Disposition: form-data; name="file"; filename="test_e2e.pdf"\r\n',
-        b"Content-Type: application/pdf\r\n\r\n",
-        file_content,
-        f"\r\n--{boundary}--\r\n".encode(),
-    ]
-    body = b"".join(body_parts)
+    document = sprint_c_upload.MultipartFile(
+        Path(upload_file) if upload_file else MINIMAL_PDF, filename=None if upload_file else "test_e2e.pdf"
+    )
     req = urllib.request.Request(
         f"{BASE}/api/v1/documents/upload",
-        data=body,
+        data=document.iter_chunks(),
         headers={
             "Authorization": f"Bearer {token}",
-            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Type": document.header,
+            "Content-Length": str(document.length),
         },
         method="POST"
     )
     try:
-        with _opener.open(req, timeout=15) as r:
+        with _opener.open(req, timeout=60) as r:
             upload = json.loads(r.read())
         job_id = upload["job_id"]
         print(f"[doc]    upload  job_id={job_id}  status={upload['status']}")
         assert upload["status"] == "queued"
 
-        # 5. Job status poll (wait up to 4s)
-        job = None
-        for attempt in range(4):
-            time.sleep(1)
-            job = get_auth(f"/api/v1/documents/upload/status/{job_id}", token)
-            print(f"[doc]    poll[{attempt}]  status={job['status']}  filename={job.get('filename')}")
-            if job["status"] in ("done", "error"):
-                break
-        if job and job.get("error"):
+        # 5. Job status wait (queued → done, up to DOC_DEADLINE)
+        waited = wait_job(
+            f"/api/v1/documents/upload/status/{job_id}", token,
+            sprint_c_wait.DOCUMENT_DONE, time.perf_counter(), DOC_DEADLINE
+        )
+        job = waited.status
+        print(f"[doc]    done  status={job['status']}  filename={job.get('filename')}  {_latency(waited)}")
+        if job.get("error"):
             print(f"[doc]    ingestion result (error ok for minimal pdf): {job['error']}")
     except urllib.error.HTTPError as e:
         body_err = e.read().decode()
         print(f"[doc]    upload HTTP {e.code} (backend rejected file): {body_err[:120]}")
+    except sprint_c_wait.JobTimeout as e:
+        print(f"[doc]    TIMEOUT  job_id={job_id}  {e}")
+        raise AssertionError(f"[doc] FAIL job {job_id} not done after {DOC_DEADLINE:.0f}s") from e
 
     # 6. Normas count
     normas = get_auth("/api/v1/normas-legais/", token)
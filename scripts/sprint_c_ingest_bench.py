@@ -0,0 +1,375 @@
+"""
+Sprint C — large-file ingestion benchmark
+Uploads many large generated scan-like PDFs concurrently with the streaming multipart uploader and
+reports upload MB/s, queue-to-done time per job and the server's memory profile (RSS of a local
+process tree via /proc, or `process_resident_memory_bytes` from a Prometheus endpoint).
+Run: python3 scripts/sprint_c_ingest_bench.py --files 8 --size-mb 300 --concurrency 4 --server-pid <uvicorn pid>
+     python3 scripts/sprint_c_ingest_bench.py --stub --files 4 --size-mb 50      (sprint_c_stub subprocess)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+HERE = Path(__file__).resolve().parent
+
+
+def _load_sibling(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, HERE / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sprint_c_load = _load_sibling("sprint_c_load")
+sprint_c_upload = _load_sibling("sprint_c_upload")
+sprint_c_wait = _load_sibling("sprint_c_wait")
+
+MB = sprint_c_upload.MB
+DEFAULT_WORKDIR = HERE.parent / ".cache" / "ingest-bench"
+MAX_PROFILE_POINTS = 120
+
+
+def rss_of_tree(pid: int) -> int:
+    """Resident memory (bytes) of ``pid`` plus all its descendants, from /proc (Linux)."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+        except OSError:
+            continue
+        total += next((int(line.split()[1]) * 1024 for line in status.splitlines() if line.startswith("VmRSS:")), 0)
+        for task in Path(f"/proc/{current}/task").glob("*/children"):
+            try:
+                pending.extend(int(child) for child in task.read_text().split())
+            except OSError:
+                pass
+    return total
+
+
+def parse_prometheus_rss(text: str) -> int:
+    """Sum of ``process_resident_memory_bytes`` samples (one per worker in multiprocess setups)."""
+    total = 0.0
+    for line in text.splitlines():
+        if line.startswith("process_resident_memory_bytes"):
+            total += float(line.rsplit(None, 1)[1])
+    return int(total)
+
+
+@dataclass
+class MemorySampler:
+    """Samples ``read()`` (bytes) every ``interval`` seconds until stopped."""
+
+    read: Callable[[], Awaitable[int]]
+    source: str
+    interval: float = 0.25
+    close: Optional[Callable[[], Awaitable[None]]] = None
+    samples: List[List[float]] = field(default_factory=list)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    value = await self.read()
+                except Exception:
+                    value = None
+                if value:
+                    self.samples.append([round(time.perf_counter() - start, 3), round(value / MB, 1)])
+                try:
+                    await asyncio.wait_for(stop.wait(), self.interval)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self.close is not None:
+                await self.close()
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if not self.samples:
+            return None
+        values = [mb for _, mb in self.samples]
+        step = max(1, -(-len(self.samples) // MAX_PROFILE_POINTS))
+        return {
+            "source": self.source,
+            "baseline_mb": values[0],
+            "peak_mb": max(values),
+            "end_mb": values[-1],
+            "growth_mb": round(max(values) - values[0], 1),
+            "samples": len(values),
+            "profile": self.samples[::step],
+        }
+
+
+@dataclass
+class BenchConfig:
+    base: str
+    files: int = 8
+    sizes_mb: List[float] = field(default_factory=lambda: [100.0])
+    concurrency: int = 4
+    workdir: Path = DEFAULT_WORKDIR
+    chunk_size: int = sprint_c_upload.CHUNK_SIZE
+    wait: "sprint_c_load.WaitOptions" = sprint_c_load.WaitOptions(deadline=1800.0)
+    timeout: float = 60.0
+    server_pid: Optional[int] = None
+    metrics_url: Optional[str] = None
+    sample_interval: float = 0.25
+    login: Dict[str, str] = field(default_factory=lambda: dict(sprint_c_load.sprint_c_e2e.LOGIN))
+
+
+def prepare_files(config: BenchConfig) -> List[Path]:
+    """One generated PDF per distinct size (reused across runs); uploads differ by a per-upload trailer."""
+    paths = {}
+    for size in config.sizes_mb:
+        if size not in paths:
+            paths[size] = sprint_c_upload.generate_pdf(config.workdir / f"scan_{size:g}mb.pdf", int(size * MB))
+    return [paths[config.sizes_mb[i % len(config.sizes_mb)]] for i in range(config.files)]
+
+
+async def run_bench(config: BenchConfig) -> Dict[str, Any]:
+    files = await asyncio.to_thread(prepare_files, config)
+    pool = sprint_c_load.ConnectionPool(config.base, size=config.concurrency, timeout=config.timeout)
+    stats = sprint_c_load.LatencyStats()
+    jobs = sprint_c_wait.JobLatency()
+    sampler = _sampler(config)
+    stop = asyncio.Event()
+    sampling = asyncio.create_task(sampler.run(stop)) if sampler else None
+    slots = asyncio.Semaphore(config.concurrency)
+    per_job: List[Dict[str, Any]] = []
+    windows: List[Tuple[float, float]] = []  # (first byte sent, "queued" response) per successful upload
+
+    async def _one(index: int, path: Path, session: "sprint_c_load.Session") -> None:
+        # Trailer único por upload: o mesmo arquivo gerado não vira duplicata para o backend.
+        document = sprint_c_upload.MultipartFile(
+            path,
+            filename=f"scan_{index:03d}.pdf",
+            trailer=b"%% sprint-c-ingest-bench " + uuid.uuid4().hex.encode() + b"\n",
+            chunk_size=config.chunk_size,
+        )
+        row: Dict[str, Any] = {"index": index, "file": path.name, "size_mb": round(document.file_size / MB, 2)}
+        async with slots:
+            try:
+                result = await sprint_c_load.upload_document(session, document)
+            except Exception as exc:
+                row["error"] = str(exc)[:120] or type(exc).__name__
+            else:
+                windows.append((result.started, result.uploaded))
+                row.update(
+                    upload_s=round(result.upload_seconds, 3),
+                    upload_mb_s=round(result.mb_per_s, 1),
+                    queue_to_done_ms=round(result.job.latency * 1000, 1),
+                    uncertainty_ms=round(result.job.uncertainty * 1000, 1),
+                    status=result.job.status.get("status"),
+                )
+        per_job.append(row)
+
+    rng = random.Random()
+    sessions = [
+        sprint_c_load.Session(pool, stats, config.login, jobs, config.wait, rng) for _ in range(config.concurrency)
+    ]
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(_one(i, path, sessions[i % len(sessions)]) for i, path in enumerate(files)))
+    finally:
+        wall = time.perf_counter() - started
+        stop.set()
+        if sampling:
+            await sampling
+        await pool.close()
+
+    uploaded = [row for row in per_job if "upload_s" in row]
+    rates = sorted(row["upload_mb_s"] for row in uploaded)
+    total_mb = sum(row["size_mb"] for row in uploaded)
+    # Transfer only: earliest upload start → latest "queued" response; ingestion waits stay out.
+    window = max(end for _, end in windows) - min(start for start, _ in windows) if windows else 0.0
+    return {
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "params": {
+            "base": config.base,
+            "files": config.files,
+            "sizes_mb": config.sizes_mb,
+            "concurrency": config.concurrency,
+            "chunk_kb": config.chunk_size // 1024,
+            "status_mode": config.wait.mode,
+        },
+        "uploads": {
+            "count": len(uploaded),
+            "failed": len(per_job) - len(uploaded),
+            "total_mb": round(total_mb, 1),
+            "upload_window_s": round(window, 3),
+            "aggregate_mb_s": round(total_mb / window, 1) if window else 0.0,
+            "wall_s": round(wall, 3),
+            "end_to_end_mb_s": round(total_mb / wall, 1) if wall else 0.0,
+            "per_upload_mb_s": {
+                "min": rates[0] if rates else 0.0,
+                "p50": sprint_c_wait.percentile(rates, 50),
+                "max": rates[-1] if rates else 0.0,
+            },
+        },
+        "queue_to_done": jobs.summary().get("upload"),
+        "server_memory": sampler.summary() if sampler else None,
+        "client_max_rss_mb": _client_max_rss_mb(),
+        "per_job": sorted(per_job, key=lambda row: row["index"]),
+    }
+
+
+def _sampler(config: BenchConfig) -> Optional[MemorySampler]:
+    if config.server_pid:
+        pid = config.server_pid
+
+        async def _read_pid() -> int:
+            return rss_of_tree(pid)
+
+        return MemorySampler(_read_pid, f"pid {pid}", config.sample_interval)
+    if config.metrics_url:
+        url = urlsplit(config.metrics_url)
+        metrics = sprint_c_load.ConnectionPool(f"{url.scheme}://{url.netloc}", size=1)
+        path = url.path + (f"?{url.query}" if url.query else "")
+
+        async def _read_metrics() -> int:
+            return parse_prometheus_rss((await metrics.request("GET", path)).body.decode())
+
+        return MemorySampler(_read_metrics, config.metrics_url, config.sample_interval, close=metrics.close)
+    return None
+
+
+def _client_max_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: KiB no Linux, bytes no macOS.
+    return round(peak / (MB if sys.platform == "darwin" else 1024), 1)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    uploads = report["uploads"]
+    lines = [
+        f"uploads={uploads['count']} failed={uploads['failed']} total={uploads['total_mb']}MB "
+        f"upload window={uploads['upload_window_s']}s aggregate={uploads['aggregate_mb_s']}MB/s "
+        f"wall={uploads['wall_s']}s end-to-end={uploads['end_to_end_mb_s']}MB/s "
+        f"per-upload MB/s min/p50/max={uploads['per_upload_mb_s']['min']}/{uploads['per_upload_mb_s']['p50']}/"
+        f"{uploads['per_upload_mb_s']['max']}",
+    ]
+    queue = report["queue_to_done"]
+    if queue:
+        lines.append(
+            f"queue→done p50={queue['p50_ms']}ms p95={queue['p95_ms']}ms max={queue['max_ms']}ms "
+            f"timeouts={queue['timeouts']} histogram={queue['histogram_ms']}"
+        )
+    memory = report["server_memory"]
+    if memory:
+        lines.append(
+            f"server RSS ({memory['source']}): baseline={memory['baseline_mb']}MB peak={memory['peak_mb']}MB "
+            f"end={memory['end_mb']}MB growth={memory['growth_mb']}MB"
+        )
+    lines.append(f"client max RSS={report['client_max_rss_mb']}MB")
+    lines.append(f"{'#':>4} {'file':24} {'MB':>8} {'upload s':>9} {'MB/s':>7} {'queue→done ms':>14}  status")
+    for row in report["per_job"]:
+        lines.append(
+            f"{row['index']:>4} {row['file']:24.24} {row['size_mb']:>8} {row.get('upload_s', '-'):>9} "
+            f"{row.get('upload_mb_s', '-'):>7} {row.get('queue_to_done_ms', '-'):>14}  "
+            f"{row.get('status') or row.get('error')}"
+        )
+    return "\n".join(lines)
+
+
+async def _start_stub(args: argparse.Namespace) -> "tuple[asyncio.subprocess.Process, str]":
+    # Processo separado: o perfil de memória é do servidor, não do benchmark.
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(HERE / "sprint_c_stub.py"),
+        "--port", "0",
+        "--ingest-delay", str(args.stub_ingest_delay),
+        "--ingest-rate", str(args.stub_ingest_rate),
+        "--ingest-workers", str(args.stub_ingest_workers),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert process.stdout is not None
+    line = (await asyncio.wait_for(process.stdout.readline(), 10)).decode()
+    if "http://" not in line:
+        process.kill()
+        raise RuntimeError(f"stub did not start: {line!r}")
+    return process, line.split("listening on ", 1)[1].strip()
+
+
+async def _run_cli(args: argparse.Namespace) -> Dict[str, Any]:
+    config = BenchConfig(
+        base=args.base,
+        files=args.files,
+        sizes_mb=[float(v) for v in args.size_mb.split(",") if v.strip()],
+        concurrency=args.concurrency,
+        workdir=args.workdir,
+        chunk_size=args.chunk_kb * 1024,
+        wait=sprint_c_load.WaitOptions(mode=args.status_mode, deadline=args.job_deadline),
+        timeout=args.timeout,
+        server_pid=args.server_pid,
+        metrics_url=args.metrics_url,
+        sample_interval=args.sample_interval,
+    )
+    if not args.stub:
+        return await run_bench(config)
+    process, config.base = await _start_stub(args)
+    config.server_pid = config.server_pid or process.pid
+    try:
+        return await run_bench(config)
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent large-PDF upload/ingestion benchmark")
+    parser.add_argument("--base", default=sprint_c_load.sprint_c_e2e.BASE, help="API base URL")
+    parser.add_argument("--stub", action="store_true", help="run against a sprint_c_stub subprocess")
+    parser.add_argument("--files", type=int, default=8, help="number of uploads")
+    parser.add_argument("--size-mb", default="100", help="PDF size(s) in MB, comma-separated, cycled over uploads")
+    parser.add_argument("--concurrency", type=int, default=4, help="simultaneous uploads")
+    parser.add_argument("--chunk-kb", type=int, default=1024, help="disk read / socket write chunk")
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR, help="where generated PDFs are cached")
+    parser.add_argument("--status-mode", choices=sprint_c_load.STATUS_MODES, default="poll")
+    parser.add_argument("--job-deadline", type=float, default=1800.0, help="seconds to wait for each ingestion")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-chunk / response timeout")
+    memory = parser.add_mutually_exclusive_group()
+    memory.add_argument("--server-pid", type=int, help="sample RSS of this local process and its children")
+    memory.add_argument("--metrics-url", help="sample process_resident_memory_bytes from this Prometheus URL")
+    parser.add_argument("--sample-interval", type=float, default=0.25)
+    parser.add_argument("--stub-ingest-delay", type=float, default=0.2)
+    parser.add_argument("--stub-ingest-rate", type=float, default=200.0, help="stub ingestion MB/s per job")
+    parser.add_argument("--stub-ingest-workers", type=int, default=2)
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+    if args.files < 1 or args.concurrency < 1 or args.chunk_kb < 1:
+        parser.error("--files, --concurrency and --chunk-kb must be >= 1")
+
+    report = asyncio.run(_run_cli(args))
+    print(format_report(report))
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 1 if report["uploads"]["failed"] or (report["queue_to_done"] or {}).get("timeouts") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
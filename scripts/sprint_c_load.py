@@ -0,0 +1,694 @@
+"""
+Sprint C — load generator
+Replays the sprint_c_e2e flows (auth → task dispatch → document upload → normas → search) from
+concurrent virtual users over pooled keep-alive connections, and reports p50/p95/p99 and
+throughput per endpoint plus dispatch-to-done latency histograms of tasks and ingestion jobs.
+Stdlib only (asyncio streams), like the e2e script.
+Run: python3 scripts/sprint_c_load.py --users 50 --rate 20 --ramp 10 --duration 60 --mix full=1,search=3
+     python3 scripts/sprint_c_load.py --stub --users 20 --duration 10     (in-process sprint_c_stub)
+     python3 scripts/sprint_c_load.py --mix task=1,upload=1 --status-mode sse   (or long-poll)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import ssl
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Collection, Dict, Iterator, List, Optional, Protocol,
+    Tuple, Union
+)
+from urllib.parse import urlsplit
+
+HERE = Path(__file__).resolve().parent
+
+
+def _load_sibling(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, HERE / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sprint_c_e2e = _load_sibling("sprint_c_e2e")
+sprint_c_wait = _load_sibling("sprint_c_wait")
+sprint_c_upload = _load_sibling("sprint_c_upload")
+
+DEFAULT_MIX = {"full": 1.0}
+STATUS_MODES = ("poll", "long-poll", "sse")
+# Where each job kind's latency clock starts: flow_task at dispatch, upload_document at the "queued" response.
+JOB_CLOCK_START = {"task": "dispatch", "upload": "queued"}
+percentile = sprint_c_wait.percentile
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:120].decode(errors='replace')}")
+        self.status = status
+        self.body = body
+
+
+class _StaleConnection(Exception):
+    """A pooled connection was closed by the server before it sent any byte of the response."""
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class StreamBody(Protocol):
+    """Request body sent piece by piece (e.g. ``sprint_c_upload.MultipartFile``)."""
+
+    @property
+    def length(self) -> int: ...
+
+    def chunks(self) -> AsyncIterator[bytes]: ...
+
+
+Body = Union[bytes, StreamBody]
+_Conn = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class ConnectionPool:
+    """HTTP/1.1 client with up to ``size`` keep-alive connections to one origin."""
+
+    def __init__(self, base: str, size: int = 10, timeout: float = 15.0):
+        url = urlsplit(base)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {base!r}")
+        self.host = url.hostname or "localhost"
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self._host_header = url.netloc
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[_Conn] = []
+
+    async def request(
+        self, method: str, path: str, *, body: Body = b"", headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        head = self._head(method, path, len(body) if isinstance(body, bytes) else body.length, headers or {})
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None:
+                try:
+                    return await self._exchange(conn, head, body)
+                except _StaleConnection:
+                    # Keep-alive ocioso fechado pelo servidor: nada foi processado, reenvia numa conexão nova.
+                    pass
+            conn = await asyncio.wait_for(self._connect(), self.timeout)
+            try:
+                return await self._exchange(conn, head, body)
+            except _StaleConnection as exc:
+                raise ConnectionError("server closed the connection without a response") from exc
+
+    async def events(
+        self, path: str, headers: Optional[Dict[str, str]] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Server-sent events of ``path`` (JSON ``data`` payloads), on a dedicated connection."""
+        reader, writer = await asyncio.wait_for(self._connect(), self.timeout)
+        try:
+            writer.write(self._head("GET", path, 0, {"Accept": "text/event-stream", **(headers or {})}))
+            await writer.drain()
+            status, response_headers = await asyncio.wait_for(_read_head(reader), self.timeout)
+            if status != 200:
+                raise HttpError(status, b"".join([piece async for piece in _body_pieces(reader, response_headers)]))
+            data: List[str] = []
+            async for line in _lines(_body_pieces(reader, response_headers)):
+                if line.startswith("data:"):
+                    data.append(line[5:].removeprefix(" "))
+                elif not line and data:
+                    yield json.loads("\n".join(data))
+                    data = []
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    async def _connect(self) -> _Conn:
+        conn = await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+        self.connections_opened += 1
+        return conn
+
+    def _head(self, method: str, path: str, length: int, headers: Dict[str, str]) -> bytes:
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self._host_header}", "Connection: keep-alive"]
+        if length or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {length}")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _exchange(self, conn: _Conn, head: bytes, body: Body) -> Response:
+        reader, writer = conn
+        # Corpo em streaming: o timeout vale por chunk e pela resposta, não para o upload inteiro.
+        timeout = self.timeout if isinstance(body, bytes) else None
+        try:
+            response, keep_alive = await asyncio.wait_for(self._roundtrip(reader, writer, head, body), timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append(conn)
+        else:
+            writer.close()
+        return response
+
+    async def _roundtrip(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, head: bytes, body: Body
+    ) -> Tuple[Response, bool]:
+        send_error: Optional[ConnectionError] = None
+        try:
+            if isinstance(body, bytes):
+                writer.write(head + body)
+                await writer.drain()
+            else:
+                writer.write(head)
+                async for piece in body.chunks():
+                    writer.write(piece)
+                    await asyncio.wait_for(writer.drain(), self.timeout)
+        except ConnectionError as exc:
+            # O servidor pode ter respondido antes de ler tudo (ex.: 413) e fechado: tenta ler a resposta.
+            send_error = exc
+        try:
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+        except ConnectionError as exc:
+            raise _StaleConnection() from exc
+        if not status_line:
+            raise _StaleConnection() from send_error
+        status, headers = await _read_head(reader, status_line)
+        payload = b"".join([piece async for piece in _body_pieces(reader, headers)])
+        framed = "content-length" in headers or headers.get("transfer-encoding", "").lower() == "chunked"
+        keep_alive = framed and send_error is None and headers.get("connection", "").lower() != "close"
+        return Response(status, headers, payload), keep_alive
+
+
+async def _read_head(reader: asyncio.StreamReader, status_line: Optional[bytes] = None) -> Tuple[int, Dict[str, str]]:
+    status_line = status_line or await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed before the response")
+    _, status, _ = status_line.decode("latin-1").split(" ", 2)
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n"):
+            return int(status), headers
+        if not line:
+            raise ConnectionError("connection closed inside response headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _body_pieces(reader: asyncio.StreamReader, headers: Dict[str, str]) -> AsyncIterator[bytes]:
+    """Response body as it arrives: chunked, Content-Length or until the server closes."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            piece = await reader.read(min(remaining, 1 << 16))
+            if not piece:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(piece)
+            yield piece
+    else:
+        while piece := await reader.read(1 << 16):
+            yield piece
+
+
+async def _lines(pieces: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for piece in pieces:
+        buffer += piece
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            yield line.removesuffix(b"\r").decode()
+    if buffer:
+        yield buffer.removesuffix(b"\r").decode()
+
+
+class LatencyStats:
+    """Latency samples and error counts keyed by endpoint (``"GET /api/v1/tasks/{id}"``) or flow name."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.error_kinds: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, key: str, seconds: float, error: Optional[str] = None) -> None:
+        self.samples[key].append(seconds)
+        if error is not None:
+            self.errors[key] += 1
+            self.error_kinds[key][error] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for key in sorted(self.samples):
+            values = sorted(self.samples[key])
+            out[key] = {
+                "count": len(values),
+                "errors": self.errors[key],
+                "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+            if self.error_kinds[key]:
+                out[key]["top_errors"] = dict(self.error_kinds[key].most_common(3))
+        return out
+
+
+@dataclass(frozen=True)
+class WaitOptions:
+    mode: str = "poll"  # one of STATUS_MODES
+    long_poll_wait: float = 10.0
+    deadline: float = 60.0
+    backoff: "sprint_c_wait.Backoff" = sprint_c_wait.Backoff()
+
+
+class Session:
+    """One virtual user: its bearer token plus timed calls through the shared pool."""
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        stats: LatencyStats,
+        login: Dict[str, str],
+        jobs: Optional["sprint_c_wait.JobLatency"] = None,
+        wait: WaitOptions = WaitOptions(),
+        rng: Optional[random.Random] = None,
+    ):
+        self.pool = pool
+        self.stats = stats
+        self.login_payload = login
+        self.jobs = jobs if jobs is not None else sprint_c_wait.JobLatency()
+        self.wait = wait
+        self.rng = rng or random.Random()
+        self.token: Optional[str] = None
+
+    async def call(
+        self, method: str, template: str, payload: Any = None, *, auth: bool = True, query: str = "", **params: str
+    ) -> Any:
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        body = json.dumps(payload).encode() if payload is not None else b""
+        if auth:
+            headers["Authorization"] = f"Bearer {await self.ensure_token()}"
+        return (await self.send(method, template, body=body, headers=headers, query=query, **params)).json()
+
+    async def send(
+        self,
+        method: str,
+        template: str,
+        *,
+        body: Body = b"",
+        headers: Optional[Dict[str, str]] = None,
+        query: str = "",
+        **params: str,
+    ) -> Response:
+        key = f"{method} {template}"
+        path = template.format(**params) + query
+        started = time.perf_counter()
+        try:
+            response = await self.pool.request(method, path, body=body, headers=headers)
+        except Exception as exc:
+            self.stats.record(key, time.perf_counter() - started, type(exc).__name__)
+            raise
+        elapsed = time.perf_counter() - started
+        if not 200 <= response.status < 300:
+            self.stats.record(key, elapsed, f"HTTP {response.status}")
+            raise HttpError(response.status, response.body)
+        self.stats.record(key, elapsed)
+        return response
+
+    async def ensure_token(self) -> str:
+        if self.token is None:
+            await flow_login(self)
+        assert self.token is not None
+        return self.token
+
+    async def wait_job(
+        self, kind: str, template: str, *, started: float, done: Collection[str], **params: str
+    ) -> "sprint_c_wait.JobResult":
+        """Wait for the job at ``template`` with the session's status mode; latency goes to ``self.jobs[kind]``."""
+
+        async def poll(wait: Optional[float]) -> Dict[str, Any]:
+            return await self.call("GET", template, query=f"?wait={wait:g}" if wait else "", **params)
+
+        events = None
+        if self.wait.mode == "sse":
+            headers = {"Authorization": f"Bearer {await self.ensure_token()}"}
+            path = template.format(**params) + "/events"
+
+            def events() -> AsyncGenerator[Dict[str, Any], None]:
+                return self.pool.events(path, headers)
+
+        try:
+            result = await sprint_c_wait.wait_for_job(
+                poll,
+                started=started,
+                done=done,
+                deadline=self.wait.deadline,
+                backoff=self.wait.backoff,
+                long_poll=self.wait.long_poll_wait if self.wait.mode == "long-poll" else None,
+                events=events,
+                rng=self.rng,
+            )
+        except sprint_c_wait.JobTimeout:
+            self.jobs.record_timeout(kind)
+            raise
+        self.jobs.record(kind, result)
+        return result
+
+
+async def flow_login(session: Session) -> None:
+    login = await session.call("POST", "/api/v1/auth/login", session.login_payload, auth=False)
+    session.token = login["access_token"]
+
+
+async def flow_task(session: Session) -> None:
+    # Latência da task: do envio do dispatch até a resposta que mostra o status final.
+    started = time.perf_counter()
+    dispatch = await session.call("POST", "/api/v1/tasks/dispatch", {"handler": "ping", "payload": {"from": "load"}},
+                                  auth=False)
+    job = await session.wait_job(
+        "task", "/api/v1/tasks/{id}", started=started, done=sprint_c_wait.TASK_DONE, id=dispatch["task_id"]
+    )
+    if job.status.get("status") != "success":
+        raise AssertionError(f"task not success: {job.status.get('status')}")
+
+
+@dataclass(frozen=True)
+class UploadResult:
+    job_id: str
+    size: int  # request body bytes
+    started: float  # perf_counter() when the first byte was sent
+    uploaded: float  # perf_counter() at the "queued" response
+    job: "sprint_c_wait.JobResult"  # "queued" → terminal status
+
+    @property
+    def upload_seconds(self) -> float:
+        return self.uploaded - self.started
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.size / sprint_c_upload.MB / self.upload_seconds if self.upload_seconds else 0.0
+
+
+async def upload_document(session: Session, document: "sprint_c_upload.MultipartFile") -> UploadResult:
+    """Stream ``document`` to the upload endpoint and wait for its ingestion job."""
+    headers = {"Authorization": f"Bearer {await session.ensure_token()}", "Content-Type": document.header}
+    started = time.perf_counter()
+    upload = (await session.send("POST", "/api/v1/documents/upload", body=document, headers=headers)).json()
+    uploaded = time.perf_counter()
+    # Ingestão: da resposta "queued" até "done"; a transferência já conta no endpoint de upload.
+    job = await session.wait_job(
+        "upload",
+        "/api/v1/documents/upload/status/{id}",
+        started=uploaded,
+        done=sprint_c_wait.DOCUMENT_DONE,
+        id=upload["job_id"],
+    )
+    return UploadResult(upload["job_id"], document.length, started, uploaded, job)
+
+
+async def flow_upload(session: Session) -> None:
+    await upload_document(session, sprint_c_upload.MultipartFile(sprint_c_e2e.MINIMAL_PDF, filename="load.pdf"))
+
+
+async def flow_handlers(session: Session) -> None:
+    handlers = await session.call("GET", "/api/v1/tasks/handlers")
+    if "ping" not in handlers["handlers"]:
+        raise AssertionError("ping handler missing")
+
+
+async def flow_normas(session: Session) -> None:
+    await session.call("GET", "/api/v1/normas-legais/")
+
+
+async def flow_search(session: Session) -> None:
+    result = await session.call("POST", "/api/v1/search/", {"query": "norma legal vigente", "limit": 3})
+    if "chunks" not in result:
+        raise AssertionError("search response missing 'chunks'")
+
+
+async def flow_full(session: Session) -> None:
+    """The whole sprint_c_e2e sequence, with a fresh login."""
+    await flow_login(session)
+    await flow_task(session)
+    await flow_handlers(session)
+    await flow_upload(session)
+    await flow_normas(session)
+    await flow_search(session)
+
+
+FLOWS: Dict[str, Callable[[Session], Awaitable[None]]] = {
+    "full": flow_full,
+    "login": flow_login,
+    "task": flow_task,
+    "handlers": flow_handlers,
+    "upload": flow_upload,
+    "normas": flow_normas,
+    "search": flow_search,
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """``"full=1,search=3"`` → weights per flow name."""
+    mix: Dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in FLOWS:
+            raise ValueError(f"unknown flow {name!r} (known: {', '.join(FLOWS)})")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"negative weight for flow {name!r}")
+    if not mix or not sum(mix.values()):
+        raise ValueError("flow mix is empty")
+    return mix
+
+
+def arrival_times(rate: float, ramp: float, duration: float, rng: random.Random) -> Iterator[float]:
+    """Poisson arrivals (seconds from start) whose rate rises linearly to ``rate`` over ``ramp`` seconds."""
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration:
+            return
+        # Thinning: aceita com probabilidade λ(t)/rate durante a rampa.
+        if t >= ramp or rng.random() < t / ramp:
+            yield t
+
+
+@dataclass
+class LoadConfig:
+    base: str = sprint_c_e2e.BASE
+    users: int = 10
+    rate: float = 0.0  # flows/s (open model); 0 = each user runs flows back to back
+    ramp: float = 0.0
+    duration: float = 30.0
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    pool_size: int = 0  # 0 = one connection per user
+    timeout: float = 15.0
+    seed: Optional[int] = None
+    wait: WaitOptions = WaitOptions()
+    login: Dict[str, str] = field(default_factory=lambda: dict(sprint_c_e2e.LOGIN))
+
+
+@dataclass
+class LoadReport:
+    config: Dict[str, Any]
+    elapsed_s: float
+    flows_started: int
+    connections_opened: int
+    max_start_lag_ms: float
+    endpoints: Dict[str, Dict[str, Any]]
+    flows: Dict[str, Dict[str, Any]]
+    jobs: Dict[str, Dict[str, Any]]
+
+    def to_json(self) -> str:
+        return json.dumps(self.__dict__, indent=2, sort_keys=True, default=lambda o: o.__dict__)
+
+
+async def run_load(config: LoadConfig) -> LoadReport:
+    rng = random.Random(config.seed)
+    names = list(config.mix)
+    weights = [config.mix[name] for name in names]
+    endpoint_stats = LatencyStats()
+    flow_stats = LatencyStats()
+    jobs = sprint_c_wait.JobLatency()
+    pool = ConnectionPool(config.base, size=config.pool_size or config.users, timeout=config.timeout)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + config.duration
+    started = 0
+    max_lag = 0.0
+
+    async def _run_flow(session: Session, name: str, scheduled: float) -> None:
+        nonlocal started, max_lag
+        started += 1
+        max_lag = max(max_lag, loop.time() - scheduled)
+        error = None
+        try:
+            await FLOWS[name](session)
+        except Exception as exc:
+            error = str(exc)[:80] or type(exc).__name__
+        # Latência do fluxo conta desde a chegada agendada: fila de espera por usuário livre entra na conta.
+        flow_stats.record(name, loop.time() - scheduled, error)
+
+    async def _closed_user(index: int) -> None:
+        await asyncio.sleep(config.ramp * index / config.users)
+        session = Session(pool, endpoint_stats, config.login, jobs, config.wait, rng)
+        while loop.time() < deadline:
+            await _run_flow(session, rng.choices(names, weights)[0], loop.time())
+
+    async def _open_user(queue: "asyncio.Queue[Optional[Tuple[str, float]]]") -> None:
+        session = Session(pool, endpoint_stats, config.login, jobs, config.wait, rng)
+        while (item := await queue.get()) is not None:
+            await _run_flow(session, *item)
+
+    async def _arrivals(queue: "asyncio.Queue[Optional[Tuple[str, float]]]") -> None:
+        for offset in arrival_times(config.rate, config.ramp, config.duration, rng):
+            await asyncio.sleep(max(0.0, start + offset - loop.time()))
+            queue.put_nowait((rng.choices(names, weights)[0], start + offset))
+        for _ in range(config.users):
+            queue.put_nowait(None)
+
+    try:
+        if config.rate > 0:
+            queue: asyncio.Queue = asyncio.Queue()
+            await asyncio.gather(_arrivals(queue), *(_open_user(queue) for _ in range(config.users)))
+        else:
+            await asyncio.gather(*(_closed_user(i) for i in range(config.users)))
+    finally:
+        await pool.close()
+
+    elapsed = loop.time() - start
+    return LoadReport(
+        config={k: v for k, v in config.__dict__.items() if k != "login"},
+        elapsed_s=round(elapsed, 3),
+        flows_started=started,
+        connections_opened=pool.connections_opened,
+        max_start_lag_ms=round(max_lag * 1000, 2),
+        endpoints=endpoint_stats.summary(elapsed),
+        flows=flow_stats.summary(elapsed),
+        jobs=jobs.summary(),
+    )
+
+
+def format_report(report: LoadReport) -> str:
+    lines = [
+        f"elapsed={report.elapsed_s}s  flows={report.flows_started}  connections={report.connections_opened}  "
+        f"max_start_lag={report.max_start_lag_ms}ms",
+        f"{'':52} {'count':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}",
+    ]
+    for title, rows in (("endpoint", report.endpoints), ("flow", report.flows)):
+        for key, row in rows.items():
+            lines.append(
+                f"{title + ' ' + key:52.52} {row['count']:>7} {row['errors']:>5} {row['rps']:>8} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}"
+            )
+    for kind, row in report.jobs.items():
+        title = f"job {kind} ({JOB_CLOCK_START.get(kind, 'dispatch')}→done)"
+        lines.append(
+            f"{title:52.52} {row['count']:>7} {row['timeouts'] + row['failed']:>5} "
+            f"{'':>8} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}  "
+            f"±{row['max_uncertainty_ms']}ms  {row['histogram_ms']}"
+        )
+    return "\n".join(lines)
+
+
+async def _run_cli(args: argparse.Namespace) -> LoadReport:
+    config = LoadConfig(
+        base=args.base,
+        users=args.users,
+        rate=args.rate,
+        ramp=args.ramp,
+        duration=args.duration,
+        mix=parse_mix(args.mix),
+        pool_size=args.pool_size,
+        timeout=args.timeout,
+        seed=args.seed,
+        wait=WaitOptions(
+            mode=args.status_mode,
+            long_poll_wait=args.long_poll_wait,
+            deadline=args.job_deadline,
+            backoff=sprint_c_wait.Backoff(initial=args.poll_initial, max_delay=args.poll_max),
+        ),
+    )
+    if not args.stub:
+        return await run_load(config)
+    stub = _load_sibling("sprint_c_stub").StubServer()
+    host, port = await stub.start()
+    config.base = f"http://{host}:{port}"
+    try:
+        return await run_load(config)
+    finally:
+        await stub.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent load test of the Sprint C API flows")
+    parser.add_argument("--base", default=sprint_c_e2e.BASE, help="API base URL (default: $SPRINT_C_BASE)")
+    parser.add_argument("--stub", action="store_true", help="run against an in-process sprint_c_stub server")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--rate", type=float, default=0.0, help="flow arrivals per second; 0 = closed loop")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds to ramp up users or arrival rate")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep starting flows")
+    parser.add_argument("--mix", default="full=1", help=f"weighted flows, e.g. full=1,search=3 ({', '.join(FLOWS)})")
+    parser.add_argument("--pool-size", type=int, default=0, help="max keep-alive connections (default: --users)")
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--status-mode", choices=STATUS_MODES, default="poll", help="how jobs are awaited")
+    parser.add_argument("--long-poll-wait", type=float, default=10.0, help="seconds the server may hold a long-poll")
+    parser.add_argument("--job-deadline", type=float, default=60.0, help="seconds to wait for a task/ingestion job")
+    parser.add_argument("--poll-initial", type=float, default=0.05, help="first backoff delay between polls")
+    parser.add_argument("--poll-max", type=float, default=2.0, help="backoff delay cap between polls")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+    if args.users < 1 or args.duration <= 0:
+        parser.error("--users must be >= 1 and --duration > 0")
+    try:
+        parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    report = asyncio.run(_run_cli(args))
+    print(format_report(report))
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(report.to_json() + "\n", encoding="utf-8")
+    return 1 if any(row["errors"] for row in report.flows.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
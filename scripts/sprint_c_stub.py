@@ -0,0 +1,331 @@
+"""
+Sprint C — local stub of the API used by sprint_c_e2e.py / sprint_c_load.py
+Same routes and response shapes (auth, tasks, document upload, normas, search), in memory,
+with HTTP/1.1 keep-alive and configurable task/ingestion delays. Status routes also answer
+long-polls (``?wait=<s>``) and server-sent events (``.../events``). Uploads are read in pieces and
+discarded (only the part headers are kept), so large files do not grow the stub's memory. Stdlib only.
+Run: python3 scripts/sprint_c_stub.py --port 8000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+HANDLERS = ["ping", "normas_sync"]
+NORMAS = [
+    {"id": 1, "titulo": "Lei 14.133/2021", "vigente": True},
+    {"id": 2, "titulo": "Lei 13.709/2018", "vigente": True},
+    {"id": 3, "titulo": "Lei 12.527/2011", "vigente": True},
+]
+
+UPLOAD_PATH = "/api/v1/documents/upload"
+MB = 1024 * 1024
+_UPLOAD_HEAD = 64 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    413: "Payload Too Large",
+}
+
+
+@dataclass
+class _Job:
+    created: float
+    ready_at: float
+    filename: Optional[str] = None
+    size: int = 0
+    started_at: float = 0.0
+
+
+@dataclass
+class StubServer:
+    """In-memory API stub. Tasks finish ``task_delay`` seconds after dispatch.
+
+    An ingestion job takes ``ingest_delay`` plus ``size / ingest_rate`` (MB/s, 0 = size-independent) and,
+    with ``ingest_workers`` > 0, waits for a free worker ("queued") before it starts ("processing").
+    """
+
+    task_delay: float = 0.05
+    ingest_delay: float = 0.2
+    ingest_rate: float = 0.0
+    ingest_workers: int = 0
+    latency: float = 0.0
+    idle_timeout: float = 5.0
+    max_body: int = 1 * MB
+    max_upload: int = 2048 * MB
+    sse: bool = True
+    tasks: Dict[str, _Job] = field(default_factory=dict)
+    jobs: Dict[str, _Job] = field(default_factory=dict)
+    tokens: set = field(default_factory=set)
+    requests: int = 0
+    connections: int = 0
+    _server: Optional[asyncio.AbstractServer] = None
+    _open: Dict[asyncio.StreamWriter, "asyncio.Task[None]"] = field(default_factory=dict)
+    _workers_free_at: List[float] = field(default_factory=list)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        bound = self._server.sockets[0].getsockname()
+        return bound[0], bound[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        # Fecha os keep-alive abertos para os handlers saírem sem cancelamento.
+        for writer in list(self._open):
+            writer.close()
+        await asyncio.gather(*self._open.values(), return_exceptions=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        task = asyncio.current_task()
+        assert task is not None
+        self._open[writer] = task
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                path, _, query = target.partition("?")
+                headers = await _read_headers(reader)
+                length = int(headers.get("content-length", "0"))
+                upload = method == "POST" and path == UPLOAD_PATH
+                if length > (self.max_upload if upload else self.max_body):
+                    await _write(writer, 413, {"detail": "file too large"}, keep_alive=False)
+                    break
+                if upload:
+                    body = await _consume(reader, length, keep=_UPLOAD_HEAD)
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if self.sse and method == "GET" and path.endswith("/events") and self._job(path[: -len("/events")]):
+                    await self._stream_events(writer, path[: -len("/events")], headers)
+                    break
+                wait = parse_qs(query).get("wait")
+                if wait and method == "GET":
+                    await self._hold(path, float(wait[0]))
+                if upload:
+                    status, payload = self._upload(headers, body, length)
+                else:
+                    status, payload = self._route(method, path, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write(writer, status, payload, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._open.pop(writer, None)
+            writer.close()
+
+    def _job(self, path: str) -> Optional[_Job]:
+        if path.startswith("/api/v1/documents/upload/status/"):
+            return self.jobs.get(path.rsplit("/", 1)[1])
+        if path.startswith("/api/v1/tasks/"):
+            return self.tasks.get(path.rsplit("/", 1)[1])
+        return None
+
+    async def _hold(self, path: str, wait: float) -> None:
+        """Long-poll: segura a resposta até o job terminar ou ``wait`` segundos."""
+        job = self._job(path)
+        if job is not None:
+            await asyncio.sleep(max(0.0, min(job.ready_at - time.monotonic(), wait)))
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, path: str, headers: Dict[str, str]) -> None:
+        status, payload = self._route("GET", path, headers, b"")
+        if status != 200:
+            await _write(writer, status, payload, keep_alive=False)
+            return
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+        # Como um StreamingResponse: um evento por mudança de status, em chunks.
+        while True:
+            event = f"event: status\ndata: {json.dumps(payload)}\n\n".encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            await writer.drain()
+            job = self._job(path)
+            if job is None or time.monotonic() >= job.ready_at:
+                break
+            await asyncio.sleep(job.ready_at - time.monotonic())
+            _, payload = self._route("GET", path, headers, b"")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        return headers.get("authorization", "").removeprefix("Bearer ") in self.tokens
+
+    def _upload(self, headers: Dict[str, str], head: bytes, length: int) -> Tuple[int, dict]:
+        if not self._authorized(headers):
+            return 401, {"detail": "not authenticated"}
+        boundary, filename, offset = _multipart_file(headers.get("content-type", ""), head)
+        if offset is None or not head[offset:].startswith(b"%PDF"):
+            return 400, {"detail": "only PDF files are accepted"}
+        size = length - offset - len(b"\r\n--%s--\r\n" % boundary)
+        now = time.monotonic()
+        duration = self.ingest_delay + (size / MB / self.ingest_rate if self.ingest_rate else 0.0)
+        start = now
+        if self.ingest_workers:
+            if not self._workers_free_at:
+                self._workers_free_at = [now] * self.ingest_workers
+            worker = min(range(self.ingest_workers), key=self._workers_free_at.__getitem__)
+            start = max(now, self._workers_free_at[worker])
+            self._workers_free_at[worker] = start + duration
+        job_id = str(uuid.uuid4())
+        self.jobs[job_id] = _Job(created=now, ready_at=start + duration, filename=filename, size=size, started_at=start)
+        return 200, {"job_id": job_id, "status": "queued", "filename": filename, "size": size}
+
+    def _route(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, dict]:
+        if method == "POST" and path == "/api/v1/auth/login":
+            creds = json.loads(body or b"{}")
+            if not creds.get("email") or not creds.get("password"):
+                return 401, {"detail": "invalid credentials"}
+            token = "stub-" + secrets.token_urlsafe(24)
+            self.tokens.add(token)
+            return 200, {"access_token": token, "token_type": "bearer"}
+        # O e2e despacha a task sem token; o resto exige Bearer.
+        if method == "POST" and path == "/api/v1/tasks/dispatch":
+            task_id = str(uuid.uuid4())
+            now = time.monotonic()
+            self.tasks[task_id] = _Job(created=now, ready_at=now + self.task_delay)
+            return 200, {"task_id": task_id, "status": "queued"}
+        if not self._authorized(headers):
+            return 401, {"detail": "not authenticated"}
+
+        if method == "GET" and path == "/api/v1/tasks/handlers":
+            return 200, {"handlers": HANDLERS}
+        if method == "GET" and path.startswith("/api/v1/tasks/"):
+            task = self.tasks.get(path.rsplit("/", 1)[1])
+            if task is None:
+                return 404, {"detail": "task not found"}
+            now = time.monotonic()
+            if now < task.ready_at:
+                return 200, {"status": "running", "elapsed_ms": None}
+            return 200, {"status": "success", "elapsed_ms": round((task.ready_at - task.created) * 1000, 1)}
+        if method == "GET" and path.startswith("/api/v1/documents/upload/status/"):
+            job = self.jobs.get(path.rsplit("/", 1)[1])
+            if job is None:
+                return 404, {"detail": "job not found"}
+            now = time.monotonic()
+            status = "done" if now >= job.ready_at else "processing" if now >= job.started_at else "queued"
+            return 200, {"status": status, "filename": job.filename, "size": job.size, "error": None}
+        if method == "GET" and path == "/api/v1/normas-legais/":
+            return 200, {"total": len(NORMAS), "items": NORMAS}
+        if method == "POST" and path == "/api/v1/search/":
+            query = json.loads(body or b"{}")
+            limit = int(query.get("limit", 3))
+            chunks = [{"norma_id": n["id"], "text": n["titulo"], "score": 1.0} for n in NORMAS[:limit]]
+            return 200, {"query": query.get("query", ""), "chunks": chunks, "kernel_available": False}
+        return 404, {"detail": "not found"}
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _write(writer: asyncio.StreamWriter, status: int, payload: dict, *, keep_alive: bool) -> None:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _consume(reader: asyncio.StreamReader, length: int, *, keep: int) -> bytes:
+    """Read ``length`` body bytes in pieces, keeping only the first ``keep``."""
+    head = bytearray()
+    remaining = length
+    while remaining:
+        piece = await reader.read(min(remaining, 1 << 16))
+        if not piece:
+            raise asyncio.IncompleteReadError(bytes(head), remaining)
+        if len(head) < keep:
+            head += piece[: keep - len(head)]
+        remaining -= len(piece)
+    return bytes(head)
+
+
+def _multipart_file(content_type: str, head: bytes) -> Tuple[bytes, Optional[str], Optional[int]]:
+    """Boundary, filename and offset of the ``file`` part content within the (start of the) body."""
+    boundary = content_type.partition("boundary=")[2].strip('"').encode()
+    delimiter = b"--" + boundary
+    start = head.find(delimiter) if boundary else -1
+    while start != -1:
+        header_end = head.find(b"\r\n\r\n", start)
+        if header_end == -1:
+            break
+        part_head = head[start + len(delimiter):header_end]
+        if b'name="file"' in part_head:
+            filename = None
+            if b'filename="' in part_head:
+                filename = part_head.split(b'filename="', 1)[1].split(b'"', 1)[0].decode()
+            return boundary, filename, header_end + 4
+        start = head.find(delimiter, header_end)
+    return boundary, None, None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    stub = StubServer(
+        task_delay=args.task_delay,
+        ingest_delay=args.ingest_delay,
+        ingest_rate=args.ingest_rate,
+        ingest_workers=args.ingest_workers,
+        latency=args.latency / 1000,
+        sse=not args.no_sse,
+    )
+    host, port = await stub.start(args.host, args.port)
+    print(f"[stub]   listening on http://{host}:{port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stub of the Sprint C API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--task-delay", type=float, default=0.05, help="seconds until a dispatched task succeeds")
+    parser.add_argument("--ingest-delay", type=float, default=0.2, help="seconds until an upload job is done")
+    parser.add_argument("--ingest-rate", type=float, default=0.0, help="ingestion MB/s added per file (0 = off)")
+    parser.add_argument("--ingest-workers", type=int, default=0, help="concurrent ingestion jobs (0 = unlimited)")
+    parser.add_argument("--latency", type=float, default=0.0, help="extra ms added to every response")
+    parser.add_argument("--no-sse", action="store_true", help="answer 404 on the .../events status streams")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
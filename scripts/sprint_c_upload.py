@@ -0,0 +1,152 @@
+"""
+Sprint C — streaming multipart upload helpers
+multipart/form-data bodies with one file part, read from disk in chunks (never joined in memory),
+for urllib (sync iterator) and the asyncio pool of sprint_c_load.py; plus a generator of large
+scan-like PDFs for the ingestion benchmark (sprint_c_ingest_bench.py).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Iterator, Optional, Union
+
+CHUNK_SIZE = 1 << 20
+MB = 1024 * 1024
+
+# Página com uma imagem em tons de cinza sem compressão, como um scan; o conteúdo é aleatório.
+_IMAGE_WIDTH = 1024
+
+
+@dataclass(frozen=True)
+class MultipartFile:
+    """``multipart/form-data`` body holding ``source`` (a path, or bytes for small payloads) as one file part.
+
+    ``length`` is known up front, so the request goes out with ``Content-Length`` and no chunked framing;
+    ``trailer`` is appended to the file content (e.g. a PDF comment making each upload unique).
+    """
+
+    source: Union[Path, bytes]
+    filename: Optional[str] = None
+    field_name: str = "file"
+    content_type: str = "application/pdf"
+    trailer: bytes = b""
+    chunk_size: int = CHUNK_SIZE
+    boundary: str = field(default_factory=lambda: f"SprintCUpload{uuid.uuid4().hex}")
+
+    @property
+    def header(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def file_size(self) -> int:
+        size = len(self.source) if isinstance(self.source, bytes) else Path(self.source).stat().st_size
+        return size + len(self.trailer)
+
+    @property
+    def length(self) -> int:
+        return len(self._preamble()) + self.file_size + len(self._epilogue())
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """The body for blocking clients (``urllib.request.Request(data=...)``)."""
+        yield self._preamble()
+        if isinstance(self.source, bytes):
+            yield self.source
+        else:
+            with open(self.source, "rb") as fh:
+                while piece := fh.read(self.chunk_size):
+                    yield piece
+        if self.trailer:
+            yield self.trailer
+        yield self._epilogue()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """The body for asyncio writers; disk reads run in a thread so the loop keeps serving other uploads."""
+        yield self._preamble()
+        if isinstance(self.source, bytes):
+            yield self.source
+        else:
+            fh: BinaryIO = await asyncio.to_thread(open, self.source, "rb")
+            try:
+                while piece := await asyncio.to_thread(fh.read, self.chunk_size):
+                    yield piece
+            finally:
+                fh.close()
+        if self.trailer:
+            yield self.trailer
+        yield self._epilogue()
+
+    def _preamble(self) -> bytes:
+        name = self.filename or (Path(self.source).name if not isinstance(self.source, bytes) else "upload.bin")
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{self.field_name}"; filename="{name}"\r\n'
+            f"Content-Type: {self.content_type}\r\n\r\n"
+        ).encode()
+
+    def _epilogue(self) -> bytes:
+        return f"\r\n--{self.boundary}--\r\n".encode()
+
+
+def generate_pdf(path: Path, size: int) -> Path:
+    """Write a one-page PDF of about ``size`` bytes whose page is an uncompressed random grayscale image.
+
+    Random pixels keep the file incompressible, like a scanned record; written in chunks. An existing
+    file of the same size is reused.
+    """
+    pixels = max(_IMAGE_WIDTH, (size - 700) // _IMAGE_WIDTH * _IMAGE_WIDTH)
+    height = pixels // _IMAGE_WIDTH
+    content = b"q 612 0 0 792 0 0 cm /Im0 Do Q"
+    objects = [
+        b"<</Type/Catalog/Pages 2 0 R>>",
+        b"<</Type/Pages/Kids[3 0 R]/Count 1>>",
+        b"<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]/Resources<</XObject<</Im0 4 0 R>>>>/Contents 5 0 R>>",
+        None,  # imagem: escrita em streaming abaixo
+        b"<</Length %d>>stream\n%s\nendstream" % (len(content), content),
+    ]
+    image_head = (
+        b"<</Type/XObject/Subtype/Image/Width %d/Height %d/ColorSpace/DeviceGray/BitsPerComponent 8/Length %d>>"
+        b"stream\n" % (_IMAGE_WIDTH, height, pixels)
+    )
+    image_tail = b"\nendstream"
+    expected = _pdf_size(objects, len(image_head) + pixels + len(image_tail))
+    if path.exists() and path.stat().st_size == expected:
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    offsets = []
+    with open(tmp, "wb") as fh:
+        fh.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for number, body in enumerate(objects, start=1):
+            offsets.append(fh.tell())
+            fh.write(b"%d 0 obj\n" % number)
+            if body is None:
+                fh.write(image_head)
+                remaining = pixels
+                while remaining:
+                    piece = os.urandom(min(remaining, CHUNK_SIZE))
+                    fh.write(piece)
+                    remaining -= len(piece)
+                fh.write(image_tail)
+            else:
+                fh.write(body)
+            fh.write(b"\nendobj\n")
+        xref = fh.tell()
+        fh.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            fh.write(b"%010d 00000 n \n" % offset)
+        fh.write(b"trailer\n<</Size %d/Root 1 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    os.replace(tmp, path)
+    return path
+
+
+def _pdf_size(objects: list, image_object: int) -> int:
+    size = len(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    for number, body in enumerate(objects, start=1):
+        size += len(b"%d 0 obj\n" % number) + (image_object if body is None else len(body)) + len(b"\nendobj\n")
+    xref = size
+    size += len(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)) + 20 * len(objects)
+    return size + len(b"trailer\n<</Size %d/Root 1 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
@@ -0,0 +1,186 @@
+"""
+Sprint C — async job waiter
+Waits for a dispatched task / ingestion job to reach a terminal status with exponential backoff
+and jitter under a deadline, optionally via a long-poll or server-sent-events status endpoint,
+and measures dispatch-to-done latency. Used by sprint_c_e2e.py and sprint_c_load.py.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Awaitable, Callable, Collection, Dict, Iterator, List, Optional
+
+TASK_DONE = ("success", "error", "failure", "failed")
+DOCUMENT_DONE = ("done", "error")
+
+# Limites superiores dos buckets do histograma, em ms.
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+Poll = Callable[[Optional[float]], Awaitable[Dict[str, Any]]]
+Events = Callable[[], AsyncGenerator[Dict[str, Any], None]]
+
+
+class JobTimeout(Exception):
+    def __init__(self, waited: float, last_status: Optional[Dict[str, Any]]):
+        status = last_status.get("status") if last_status else None
+        super().__init__(f"job not finished after {waited:.2f}s (last status: {status})")
+        self.waited = waited
+        self.last_status = last_status
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Poll delays ``initial * factor**n`` capped at ``max_delay``, each shortened by up to ``jitter`` (0..1)."""
+
+    initial: float = 0.05
+    factor: float = 2.0
+    max_delay: float = 2.0
+    jitter: float = 0.5
+
+    def delays(self, rng: random.Random) -> Iterator[float]:
+        delay = self.initial
+        while True:
+            yield delay * (1 - self.jitter * rng.random())
+            delay = min(delay * self.factor, self.max_delay)
+
+
+@dataclass(frozen=True)
+class JobResult:
+    status: Dict[str, Any]
+    latency: float  # dispatch → first response that showed the terminal status
+    uncertainty: float  # poll gap before the terminal status; 0 when the server answered on the change
+    requests: int
+    mode: str  # "poll" | "long-poll" | "sse"
+
+    @property
+    def ok(self) -> bool:
+        return self.status.get("status") not in ("error", "failure", "failed")
+
+
+async def wait_for_job(
+    poll: Poll,
+    *,
+    started: float,
+    done: Collection[str],
+    deadline: float = 60.0,
+    backoff: Backoff = Backoff(),
+    long_poll: Optional[float] = None,
+    events: Optional[Events] = None,
+    rng: Optional[random.Random] = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> JobResult:
+    """Wait until ``poll``/``events`` report a status in ``done``, at most ``deadline`` seconds after ``started``.
+
+    ``poll(wait)`` fetches the job status; ``wait`` is ``long_poll`` (seconds the server may hold the
+    request until the status changes) or ``None`` for a plain poll between backoff sleeps. With ``events``
+    the statuses come from an event stream; if it cannot be opened or ends early the waiter falls back
+    to polling. ``started`` and the deadline are on ``clock`` (``time.perf_counter`` by default).
+    """
+    limit = started + deadline
+    last: Optional[Dict[str, Any]] = None
+    last_pending = started
+    requests = 0
+
+    if events is not None:
+        stream = events()
+        try:
+            requests += 1
+            while True:
+                remaining = limit - clock()
+                if remaining <= 0:
+                    raise JobTimeout(clock() - started, last)
+                try:
+                    last = await asyncio.wait_for(stream.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise JobTimeout(clock() - started, last) from None
+                now = clock()
+                if last.get("status") in done:
+                    return JobResult(last, now - started, 0.0, requests, "sse")
+        except JobTimeout:
+            raise
+        except Exception:
+            # Sem stream de eventos (404, proxy que bufferiza, conexão caída): segue por polling.
+            pass
+        finally:
+            await stream.aclose()
+
+    mode = "long-poll" if long_poll else "poll"
+    delays = backoff.delays(rng or random.Random())
+    while True:
+        remaining = limit - clock()
+        if remaining <= 0:
+            raise JobTimeout(clock() - started, last)
+        wait = min(long_poll, remaining) if long_poll else None
+        try:
+            last = await asyncio.wait_for(poll(wait), remaining + (wait or 0))
+        except asyncio.TimeoutError:
+            raise JobTimeout(clock() - started, last) from None
+        requests += 1
+        now = clock()
+        if last.get("status") in done:
+            # Long-poll: o servidor responde na mudança de status, não há intervalo entre consultas.
+            return JobResult(last, now - started, 0.0 if long_poll else now - last_pending, requests, mode)
+        last_pending = now
+        if not long_poll:
+            await asyncio.sleep(min(next(delays), max(0.0, limit - now)))
+
+
+class JobLatency:
+    """Latencies (from the caller's start point to done) and timeouts per job kind, with a fixed-bucket histogram."""
+
+    def __init__(self) -> None:
+        self.results: Dict[str, List[JobResult]] = defaultdict(list)
+        self.timeouts: Dict[str, int] = defaultdict(int)
+
+    def record(self, kind: str, result: JobResult) -> None:
+        self.results[kind].append(result)
+
+    def record_timeout(self, kind: str) -> None:
+        self.timeouts[kind] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for kind in sorted(set(self.results) | set(self.timeouts)):
+            results = self.results[kind]
+            values = sorted(r.latency for r in results)
+            out[kind] = {
+                "count": len(values),
+                "timeouts": self.timeouts[kind],
+                "failed": sum(1 for r in results if not r.ok),
+                "p50_ms": _ms(percentile(values, 50)),
+                "p95_ms": _ms(percentile(values, 95)),
+                "p99_ms": _ms(percentile(values, 99)),
+                "max_ms": _ms(values[-1] if values else 0.0),
+                "max_uncertainty_ms": _ms(max((r.uncertainty for r in results), default=0.0)),
+                "requests_per_job": round(sum(r.requests for r in results) / len(results), 2) if results else 0.0,
+                "histogram_ms": histogram(values),
+            }
+        return out
+
+
+def histogram(latencies: Collection[float]) -> Dict[str, int]:
+    """Counts per ``HISTOGRAM_BOUNDS_MS`` bucket (``"le_<ms>"``, then ``"gt_<last>"``), non-empty buckets only."""
+    counts: Dict[str, int] = {}
+    for seconds in latencies:
+        ms = seconds * 1000
+        key = next((f"le_{bound}" for bound in HISTOGRAM_BOUNDS_MS if ms <= bound), f"gt_{HISTOGRAM_BOUNDS_MS[-1]}")
+        counts[key] = counts.get(key, 0) + 1
+    order = [f"le_{bound}" for bound in HISTOGRAM_BOUNDS_MS] + [f"gt_{HISTOGRAM_BOUNDS_MS[-1]}"]
+    return {key: counts[key] for key in order if key in counts}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (``q`` in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
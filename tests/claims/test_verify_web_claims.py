@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+VERIFIER_PATH = REPO_ROOT / "tools" / "claims" / "verify_web_claims.py"
+
+
+def _load_verifier():
+    # tools/claims não é pacote: carrega o script pelo caminho, como o CI o executa.
+    spec = importlib.util.spec_from_file_location("verify_web_claims", VERIFIER_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+vwc = _load_verifier()
+
+
+def test_forbidden_phrases_single_pass_reports_every_match_with_position() -> None:
+    text = "Linha um.\nA IA decide automaticamente e é sem viés.\n\nResultado: sem erro zero, sem erro.\n"
+
+    matches = vwc._find_forbidden_phrases(text)
+
+    found = [(m.text, m.line, m.column) for m in matches]
+    assert found == [
+        ("decide automaticamente", 2, 6),
+        ("sem viés", 2, 33),
+        ("sem erro", 4, 12),
+        ("erro zero", 4, 16),
+        ("sem erro", 4, 27),
+    ]
+    assert [vwc.FORBIDDEN_AI_PHRASES[m.pattern_index].pattern for m in matches][0] == r"\bdecide\s+automaticamente\b"
+
+
+def test_forbidden_phrases_matcher_agrees_with_individual_patterns() -> None:
+    text = "DECISÃO 100% AUTOMÁTICA, decisao automatica, livre de viés e sem revisão humana."
+
+    combined = {(m.pattern_index, m.text) for m in vwc._find_forbidden_phrases(text)}
+    individual = {
+        (i, m.group(0)) for i, rx in enumerate(vwc.FORBIDDEN_AI_PHRASES) for m in rx.finditer(text)
+    }
+
+    assert combined == individual
+
+
+def _write_repo(root: Path, page_text: str) -> None:
+    (root / "components").mkdir(parents=True, exist_ok=True)
+    (root / "components" / "Page.tsx").write_text(page_text, encoding="utf-8")
+    (root / "docs").mkdir(exist_ok=True)
+    (root / "docs" / "ADR.md").write_text("# ADR\n", encoding="utf-8")
+    claims = {
+        "claims": [
+            {
+                "id": "WEB-T-001",
+                "page_path": "components/Page.tsx",
+                "statement": "O sistema impede atos fora de conformidade.",
+                "domain": ["normas"],
+                "risk_level": "high",
+                "claim_type": "ENFORCEMENT",
+                "required_proof": "DOC",
+                "evidence": [{"path": "docs/ADR.md", "description": "adr"}],
+                "reproduce": [],
+                "copy_fix": "Reescrever.",
+            }
+        ]
+    }
+    (root / "WEB-CLAIMS.yaml").write_text(json.dumps(claims), encoding="utf-8")
+
+
+def test_result_cache_reuses_unchanged_claims_and_invalidates_on_edit(tmp_path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _write_repo(repo, "<p>O sistema impede atos fora de conformidade.</p>\n")
+    monkeypatch.setattr(vwc, "REPO_ROOT", repo)
+    monkeypatch.setattr(vwc, "CLAIMS_PATH", repo / "WEB-CLAIMS.yaml")
+    cache_path = tmp_path / "cache.json"
+
+    cold = vwc.ResultCache.load(cache_path)
+    first = vwc.verify_claims(cold)
+    cold.save()
+    assert [r.status for r in first] == ["PASS"]
+
+    def _must_not_evaluate(c, index, pages):
+        raise AssertionError(f"claim {c.id} should have been served from cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(vwc, "_evaluate_claim", _must_not_evaluate)
+        assert vwc.verify_claims(vwc.ResultCache.load(cache_path)) == first
+
+    (repo / "components" / "Page.tsx").write_text("<p>Texto reescrito.</p>\n", encoding="utf-8")
+    edited = vwc.verify_claims(vwc.ResultCache.load(cache_path))
+    assert edited[0].reason == "statement not found (removed/changed in source)"
+
+
+def test_result_cache_digests_the_scanned_tree_not_the_verifier_checkout(tmp_path) -> None:
+    # Índice sobre outra raiz (harness do benchmark, repo temporário): a chave vem do conteúdo lido.
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "page.tsx").write_text("<p>Uma IA sem viés.</p>\n", encoding="utf-8")
+    index = vwc.RepoIndex(tmp_path)
+    cache = vwc.ResultCache.load(tmp_path / "cache.json")
+
+    digest = cache.file_digest(index, "app/page.tsx")
+    assert digest == vwc._sha256_bytes((tmp_path / "app" / "page.tsx").read_bytes())
+    assert digest != cache.file_digest(vwc.RepoIndex(REPO_ROOT), "app/page.tsx")
+
+    first = vwc._forbidden_phrase_matches(["app/page.tsx"], index, cache, jobs=1)
+    assert first[0] and cache.get_scan(digest) == first[0]
+
+
+def test_repo_index_walks_once_and_prunes_vendored_trees(tmp_path) -> None:
+    for rel in [
+        "infra/migrations/001_rls.sql",
+        "node_modules/pkg/migrations/002.sql",
+        ".next/cache/x.test.js",
+        "lib/rules/engine.test.ts",
+        "app/page.tsx",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("ALTER TABLE t ENABLE ROW LEVEL SECURITY; CREATE POLICY p ON t;", encoding="utf-8")
+
+    index = vwc.RepoIndex(tmp_path)
+
+    assert index.files_with_suffix(".sql") == ["infra/migrations/001_rls.sql"]
+    assert index.dirs_named("migrations") == ["infra/migrations"]
+    assert index.files_under("app", "*.ts*") == ["app/page.tsx"]
+    assert vwc._has_tests_for_path("/", index) is True
+    assert vwc._rls_evidence_path(index) == "infra/migrations/001_rls.sql"
+
+
+def test_parallel_mode_matches_serial_order_and_results(tmp_path) -> None:
+    serial = vwc.verify_claims()
+
+    assert vwc.verify_claims(jobs=4) == serial
+
+    cache = vwc.ResultCache.load(tmp_path / "cache.json")
+    assert vwc.verify_claims(cache, jobs=4) == serial
+    assert vwc.verify_claims(cache, jobs=4) == serial
+
+
+def _claims(*overrides: dict) -> list:
+    base = {"claim_type": "ENFORCEMENT", "required_proof": "TEST", "page_path": "app/page.tsx", "statement": "x"}
+    return vwc.parse_claims({"claims": [{"id": f"WEB-T-{i:03d}", **base, **o} for i, o in enumerate(overrides)]})
+
+
+def test_page_store_reads_each_page_once_and_batches_statements(tmp_path, monkeypatch) -> None:
+    page = tmp_path / "components" / "Modules.tsx"
+    page.parent.mkdir(parents=True)
+    page.write_text("<p>\n  Registro de eventos com\n  integridade criptográfica\n</p>\n<p>RLS por tenant</p>\n", encoding="utf-8")
+    claims = _claims(
+        {"page_path": "components/Modules.tsx", "statement": "Registro de eventos com integridade criptográfica"},
+        {"page_path": "components/Modules.tsx", "statement": "RLS   por\ntenant"},
+        {"page_path": "components/Modules.tsx", "statement": "Anonimização automática"},
+    )
+    reads = []
+    original_read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **kw: reads.append(self) or original_read_text(self, *a, **kw))
+
+    pages = vwc.PageStore(tmp_path, claims)
+
+    assert [pages.statement_present(c.page_path, c.statement) for c in claims] == [True, True, False]
+    assert pages.statement_present("components/Modules.tsx", "eventos com integridade") is True
+    assert len(reads) == 1
+    with pytest.raises(FileNotFoundError):
+        pages.statement_present("components/Missing.tsx", "x")
+
+
+def test_since_mode_rechecks_only_changed_inputs_and_merges_baseline(tmp_path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _write_repo(repo, "<p>O sistema impede atos fora de conformidade.</p>\n")
+    (repo / "content").mkdir()
+    (repo / "content" / "post.mdx").write_text("Uma IA sem viés.\n", encoding="utf-8")
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t", "-C", str(repo)]
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    subprocess.run([*git, "add", "-A"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "base"], check=True)
+    monkeypatch.setattr(vwc, "REPO_ROOT", repo)
+    monkeypatch.setattr(vwc, "CLAIMS_PATH", repo / "WEB-CLAIMS.yaml")
+    baseline = tmp_path / "baseline.json"
+    claims = vwc.load_claims(repo / "WEB-CLAIMS.yaml")
+
+    snapshot = vwc.RunSnapshot()
+    full = vwc.verify_claims(snapshot=snapshot)
+    vwc.save_baseline(baseline, snapshot)
+
+    reuse, changed = vwc.load_since_scope(baseline, "HEAD", claims)
+    assert changed == set()
+    with monkeypatch.context() as m:
+        m.setattr(vwc, "_evaluate_claim", lambda c, index, pages: pytest.fail("claim should come from baseline"))
+        m.setattr(vwc, "_scan_file", lambda abs_path: pytest.fail("copy file should come from baseline"))
+        m.setattr(vwc, "_find_forbidden_phrases", lambda text: pytest.fail("copy file should come from baseline"))
+        assert vwc.verify_claims(reuse=reuse) == full
+        assert vwc.verify_claims(reuse=reuse, jobs=2) == full
+
+    # Editado depois da baseline: entra mesmo com --since HEAD vendo a mesma árvore de trabalho.
+    (repo / "components" / "Page.tsx").write_text("<p>Texto reescrito.</p>\n", encoding="utf-8")
+    reuse, changed = vwc.load_since_scope(baseline, "HEAD", claims)
+    assert changed == {"components/Page.tsx"}
+    assert reuse is not None and reuse.claims == {}
+    merged = vwc.verify_claims(reuse=reuse)
+    assert merged == vwc.verify_claims()
+    assert merged[-1].reason == "statement not found (removed/changed in source)"
+
+    # Commit da baseline ausente no clone (checkout raso, rebase): execução completa, sem abortar.
+    data = json.loads(baseline.read_text(encoding="utf-8"))
+    baseline.write_text(json.dumps({**data, "commit": "0" * 40}), encoding="utf-8")
+    assert vwc.load_since_scope(baseline, "HEAD", claims) == (None, {"components/Page.tsx"})
+
+
+def test_sinks_stream_each_result_and_fail_fast_stops_at_first_high_risk_fail(tmp_path) -> None:
+    def result(claim_id: str, status: str, risk: str, line=None) -> "vwc.ClaimResult":
+        return vwc.ClaimResult(claim_id, "app/page.tsx", "s", ["normas"], risk, {}, status, "r", [], [], "fix", line, 1 if line else None)
+
+    produced = []
+
+    def results():
+        for r in [result("WEB-1", "PASS", "high"), result("WEB-2", "FAIL", "medium"), result("WEB-AI-FORBIDDEN-001", "FAIL", "high", 7)]:
+            produced.append(r.claim_id)
+            yield r
+        pytest.fail("--fail-fast must not evaluate past the first high-risk FAIL")
+
+    report = tmp_path / "REPORT.md"
+    report.write_text("published\n", encoding="utf-8")
+    jsonl, sarif = io.StringIO(), io.StringIO()
+
+    seen, stopped = vwc.run_sinks(
+        results(), [vwc.MarkdownReport(report), vwc.JsonLinesReport(jsonl), vwc.SarifReport(sarif)], fail_fast=True
+    )
+
+    assert stopped
+    assert [r.claim_id for r in seen] == produced == ["WEB-1", "WEB-2", "WEB-AI-FORBIDDEN-001"]
+    assert [json.loads(line)["claim_id"] for line in jsonl.getvalue().splitlines()] == produced
+    log = json.loads(sarif.getvalue())
+    run = log["runs"][0]
+    assert run["properties"] == {"complete": False}
+    assert [(r["ruleId"], r["kind"], r["level"]) for r in run["results"]] == [
+        ("WEB-CLAIM", "pass", "none"),
+        ("WEB-CLAIM", "fail", "warning"),
+        ("WEB-AI-FORBIDDEN", "fail", "error"),
+    ]
+    assert run["results"][2]["locations"][0]["physicalLocation"]["region"] == {"startLine": 7, "startColumn": 1}
+    # Execução parcial nunca substitui o relatório Markdown publicado.
+    assert report.read_text(encoding="utf-8") == "published\n"
+    assert list(tmp_path.iterdir()) == [report]
+
+    # FAIL bloqueante no último resultado: a entrada acabou, a execução está completa.
+    last = [result("WEB-1", "PASS", "high"), result("WEB-AI-FORBIDDEN-001", "FAIL", "high", 7)]
+    sarif = io.StringIO()
+    seen, stopped = vwc.run_sinks(last, [vwc.MarkdownReport(report), vwc.SarifReport(sarif)], fail_fast=True)
+    assert not stopped and seen == last
+    assert json.loads(sarif.getvalue())["runs"][0]["properties"] == {"complete": True}
+    assert "WEB-AI-FORBIDDEN-001" in report.read_text(encoding="utf-8")
+
+    # Stream com contagem de pendentes (como iter_claims): zero depois do último, execução completa.
+    class Stream:
+        def __init__(self, items):
+            self._it, self.pending = iter(items), len(items)
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            result = next(self._it)
+            self.pending -= 1
+            return result
+
+    assert vwc.run_sinks(Stream(last), [vwc.JsonLinesReport(io.StringIO())], fail_fast=True) == (last, False)
+    assert vwc.run_sinks(Stream(last[::-1]), [vwc.JsonLinesReport(io.StringIO())], fail_fast=True) == (last[1:], True)
+
+    stream = vwc.iter_claims(claims=[])
+    assert stream.pending is None
+    assert list(stream) == vwc.verify_claims(claims=[]) and stream.pending == 0
+    with pytest.raises(TypeError):
+        vwc.ResultSink()
+
+
+def test_benchmark_corpus_runs_every_stage_and_flags_regressions(tmp_path, monkeypatch) -> None:
+    spec = importlib.util.spec_from_file_location("bench_verify_web_claims", VERIFIER_PATH.with_name("bench_verify_web_claims.py"))
+    assert spec and spec.loader
+    bench = importlib.util.module_from_spec(spec)
+    # O harness carrega a própria cópia do verificador; esta cópia volta a ficar registrada depois.
+    monkeypatch.setitem(sys.modules, spec.name, bench)
+    monkeypatch.setitem(sys.modules, "verify_web_claims", vwc)
+    spec.loader.exec_module(bench)
+
+    corpus = bench.CorpusSpec(pages=6, claims=12, sql=3, noise=20, forbidden_every=3)
+    bench.generate_corpus(tmp_path, corpus)
+    report = bench.run_benchmark(tmp_path, corpus, repeat=1)
+
+    # 12 claims do registro mais duas frases proibidas em cada uma das 2 páginas marcadas; o ruído é podado.
+    assert report["copy_files"] == 6
+    assert report["results"] == 12 + 2 * 2
+    assert set(report["stages"]) == {"scan", "verify", "report"}
+    assert all(row["seconds"] > 0 and row["peak_bytes"] > 0 for row in report["stages"].values())
+
+    slower = json.loads(json.dumps(report))
+    slower["stages"]["verify"]["seconds"] *= 2
+    assert bench.compare(report, report, tolerance=0.25) == []
+    assert [line.split(":")[0] for line in bench.compare(slower, report, tolerance=0.25)] == ["verify.seconds"]
+    with pytest.raises(ValueError):
+        bench.compare(report, {**report, "corpus": {**report["corpus"], "claims": 13}}, tolerance=0.25)
+
+
+def test_profile_records_stage_spans_and_per_claim_io_counters(tmp_path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _write_repo(repo, "<p>O sistema impede atos fora de conformidade.</p>\n")
+    monkeypatch.setattr(vwc, "REPO_ROOT", repo)
+    monkeypatch.setattr(vwc, "CLAIMS_PATH", repo / "WEB-CLAIMS.yaml")
+    profiler = vwc.Profiler()
+    monkeypatch.setattr(vwc, "_PROFILER", profiler)
+
+    vwc.verify_claims()
+
+    assert {"index", "io", "scan", "proof", "type"} <= set(profiler.totals)
+    page_bytes = len((repo / "components" / "Page.tsx").read_bytes())
+    # Leitura da página e stat das evidências contam para o claim; a varredura da árvore, para a execução.
+    assert profiler.claims["WEB-T-001"]["files"] == 2
+    assert profiler.claims["WEB-T-001"]["bytes"] == page_bytes
+    assert profiler.claims["(run)"]["files"] >= 3
+
+    trace = tmp_path / "trace.json"
+    profiler.write_trace(trace)
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert any(e["cat"] == "claim" and e["name"] == "WEB-T-001" for e in events)
+    assert "WEB-T-001" in "\n".join(profiler.summary_lines())
+
+
+def test_claims_schema_rejects_malformed_entries_and_keeps_unknown_enum_values_per_claim() -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        vwc.parse_claims(
+            {
+                "claims": [
+                    {"id": "WEB-X-001", "page_path": "app/page.tsx", "statement": "s", "claim_type": "RLS"},
+                    {"id": "WEB-X-001", "page_path": "app/page.tsx", "statement": "s", "claim_type": "RLS", "required_proof": "TEST", "evidence": [{"description": "sem path"}]},
+                    "not-an-object",
+                ]
+            }
+        )
+    message = str(excinfo.value)
+    assert "claims[0] (WEB-X-001): required_proof must be a non-empty string" in message
+    assert "claims[1] (WEB-X-001): evidence must be a list" in message
+    assert "claims[1] (WEB-X-001): duplicate id" in message
+    assert "claims[2]: must be an object" in message
+
+    (claim,) = _claims({"claim_type": "MARKETING", "domain": "ai", "risk_level": " ", "evidence": ["docs/a.md", {"path": "docs/b.md"}]})
+    assert claim.type_code is None and claim.claim_type == "MARKETING"
+    assert claim.proof_code is vwc.ProofKind.TEST
+    assert claim.domain == ("ai",) and claim.domain_codes == frozenset({vwc.Domain.AI})
+    assert claim.risk_level == "medium" and claim.risk_code is vwc.RiskLevel.MEDIUM
+    assert claim.evidence_paths == ("docs/a.md", "docs/b.md")
+    assert not hasattr(claim, "__dict__") and not hasattr(vwc.ClaimResult("a", "b", "c", [], "low", {}, "PASS", "r", [], [], ""), "__dict__")
+
+
+def test_load_claims_reuses_cached_records_until_the_registry_changes(tmp_path, monkeypatch) -> None:
+    registry = tmp_path / "WEB-CLAIMS.yaml"
+    cached = tmp_path / "claims.json"
+    definition = {
+        "id": "WEB-T-001", "page_path": "app/page.tsx", "statement": "s", "claim_type": "RLS",
+        "required_proof": "DB_MIGRATION", "domain": ["normas", "outro"], "evidence": ["docs/a.md"],
+    }
+    registry.write_text(json.dumps({"claims": [definition]}), encoding="utf-8")
+
+    first = vwc.load_claims(registry, cached)
+    with monkeypatch.context() as m:
+        m.setattr(vwc, "parse_claims", lambda doc: pytest.fail("unchanged registry must come from the cache"))
+        assert vwc.load_claims(registry, cached) == first
+
+    registry.write_text(json.dumps({"claims": [{**definition, "statement": "t"}]}), encoding="utf-8")
+    assert [c.statement for c in vwc.load_claims(registry, cached)] == ["t"]
+    cached.write_bytes(b"truncated")
+    assert [c.statement for c in vwc.load_claims(registry, cached)] == ["t"]
+    # Cache restaurado de outra execução (pickle, chave errada): nunca é desserializado, só reconstruído.
+    cached.write_bytes(pickle.dumps(("x", [])))
+    assert [c.statement for c in vwc.load_claims(registry, cached)] == ["t"]
+    assert json.loads(cached.read_text(encoding="utf-8"))["claims"][0][2] == "t"
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / "tools" / "db" / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+verify_audit_chain = _load("verify_audit_chain")
+bench_audit_hashchain = _load("bench_audit_hashchain")
+
+
+@asynccontextmanager
+async def _engine() -> AsyncIterator[AsyncEngine]:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping audit chain head tests")
+    engine = create_async_engine(dsn)
+    try:
+        async with engine.connect() as conn:
+            if not await conn.scalar(text("SELECT to_regclass('public.audit_chain_heads') IS NOT NULL")):
+                pytest.skip("migration 20261018_100_audit_chain_heads.sql not applied")
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def _insert(engine: AsyncEngine, tenant_id: UUID, count: int) -> list[int]:
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+        return [
+            await conn.scalar(
+                text("INSERT INTO public.audit_events (tenant_id, actor, action) VALUES (:t, 'x', :a) RETURNING id"),
+                {"t": tenant_id, "a": f"A{i}"},
+            )
+            for i in range(count)
+        ]
+
+
+_BYPASSES_RLS_SQL = "SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user"
+
+
+async def _head(engine: AsyncEngine, tenant_id: UUID):
+    async with engine.connect() as conn:
+        return (
+            await conn.execute(
+                text("SELECT last_id, last_hash FROM public.audit_chain_heads WHERE stream_key = :k"),
+                {"k": str(tenant_id)},
+            )
+        ).one_or_none()
+
+
+@pytest.mark.asyncio
+async def test_trigger_advances_chain_head_and_chains_from_it() -> None:
+    async with _engine() as engine:
+        tenant_id = uuid4()
+        ids = await _insert(engine, tenant_id, 3)
+
+        result = await verify_audit_chain.verify_stream(engine, tenant_id)
+        assert result.ok and result.rows_verified == 3
+        assert tuple(await _head(engine, tenant_id)) == (ids[-1], result.last_hash)
+
+        # Um INSERT desfeito depois do trigger desfaz também o avanço da cabeça.
+        with pytest.raises(RuntimeError):
+            async with engine.begin() as conn:
+                await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+                await conn.execute(
+                    text("INSERT INTO public.audit_events (tenant_id, actor) VALUES (:t, 'x')"), {"t": tenant_id}
+                )
+                raise RuntimeError("rollback")
+        assert tuple(await _head(engine, tenant_id)) == (ids[-1], result.last_hash)
+
+        # Idem quando quem falha é o WITH CHECK da RLS (só com role sujeito a ela: superuser no CI a ignora).
+        async with engine.connect() as conn:
+            bypasses_rls = await conn.scalar(text(_BYPASSES_RLS_SQL))
+        if not bypasses_rls:
+            with pytest.raises(Exception):
+                async with engine.begin() as conn:
+                    await conn.execute(
+                        text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(uuid4())}
+                    )
+                    await conn.execute(
+                        text("INSERT INTO public.audit_events (tenant_id, actor) VALUES (:t, 'x')"), {"t": tenant_id}
+                    )
+            assert tuple(await _head(engine, tenant_id)) == (ids[-1], result.last_hash)
+
+
+@pytest.mark.asyncio
+async def test_stream_without_head_is_initialized_from_its_last_event() -> None:
+    async with _engine() as engine:
+        tenant_id = uuid4()
+        await _insert(engine, tenant_id, 2)
+        # Simula eventos anteriores à migration (sem cabeça registrada).
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("DELETE FROM public.audit_chain_heads WHERE stream_key = :k"), {"k": str(tenant_id)}
+            )
+
+        ids = await _insert(engine, tenant_id, 2)
+
+        result = await verify_audit_chain.verify_stream(engine, tenant_id)
+        assert (result.ok, result.rows_verified, result.last_id) == (True, 4, ids[-1])
+        assert (await _head(engine, tenant_id)).last_id == ids[-1]
+
+
+@pytest.mark.asyncio
+async def test_benchmark_runs_both_variants_on_a_scratch_schema() -> None:
+    async with _engine():
+        report = await bench_audit_hashchain.run_benchmark(
+            os.environ["HARDENING_PG_DSN"], prefills=[0, 50], streams=2, inserts=3
+        )
+    assert [(r["prefill"], r["variant"]) for r in report["results"]] == [
+        (0, "legacy"),
+        (0, "chain_heads"),
+        (50, "legacy"),
+        (50, "chain_heads"),
+    ]
+    assert all(len(r["inserts_per_s"]) == 2 and r["median_cold_insert_ms"] > 0 for r in report["results"])
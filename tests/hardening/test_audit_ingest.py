@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+tenant_rls = _load("tenant_rls", REPO_ROOT / "apps" / "shared" / "middleware" / "tenant_rls.py")
+audit_ingest = _load("audit_ingest", REPO_ROOT / "apps" / "shared" / "middleware" / "audit_ingest.py")
+verify_audit_chain = _load("verify_audit_chain", REPO_ROOT / "tools" / "db" / "verify_audit_chain.py")
+
+
+@asynccontextmanager
+async def _engine() -> AsyncIterator[AsyncEngine]:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping audit ingest tests")
+    engine = create_async_engine(dsn)
+    try:
+        async with engine.connect() as conn:
+            installed = await conn.scalar(
+                text("SELECT to_regprocedure('public.audit_events_ingest(uuid, jsonb)') IS NOT NULL")
+            )
+            if not installed:
+                pytest.skip("migration 20261018_110_audit_events_bulk_ingest.sql not applied")
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+def _events(count: int) -> list[dict]:
+    base = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    return [
+        {
+            "occurred_at": base + timedelta(microseconds=137 * i),
+            "actor": f"user-{i % 3}",
+            "action": "DOC_UPLOAD" if i % 2 else "LOGIN",
+            "resource_ref": f"doc/{i}" if i % 4 else None,
+            "correlation_id": f"corr-{i}",
+            "payload_json": {"n": i, "tags": ["a", "b"], "nested": {"z": 1, "a": None}},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_matches_row_by_row_hashes() -> None:
+    async with _engine() as engine:
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        events = _events(25)
+        bulk_tenant, row_tenant = uuid4(), uuid4()
+
+        # Dois blocos: o segundo encadeia a partir do último hash do primeiro.
+        async with tenant_rls.tenant_scoped_session(factory, bulk_tenant) as session:
+            ingested = await audit_ingest.ingest_audit_events(session, bulk_tenant, events, chunk_size=10)
+
+        async with tenant_rls.tenant_scoped_session(factory, row_tenant) as session:
+            for event in events:
+                await session.execute(
+                    text(
+                        "INSERT INTO public.audit_events (tenant_id, occurred_at, actor, action, resource_ref, "
+                        "correlation_id, payload_json) "
+                        "VALUES (:t, :occurred_at, :actor, :action, :resource_ref, :correlation_id, "
+                        "CAST(:payload AS jsonb))"
+                    ),
+                    {
+                        "t": row_tenant,
+                        **{k: event[k] for k in ("occurred_at", "actor", "action", "resource_ref", "correlation_id")},
+                        "payload": json.dumps(event["payload_json"]),
+                    },
+                )
+            row_hashes = (
+                await session.scalars(
+                    text("SELECT event_hash FROM public.audit_events WHERE tenant_id = :t ORDER BY id"),
+                    {"t": row_tenant},
+                )
+            ).all()
+
+        # tenant_id não entra na forma canônica: mesma sequência de eventos, mesma cadeia.
+        assert [e.event_hash for e in ingested] == row_hashes
+        assert [e.id for e in ingested] == sorted(e.id for e in ingested)
+
+        result = await verify_audit_chain.verify_stream(engine, bulk_tenant)
+        assert result.ok and result.rows_verified == 25 and result.last_id == ingested[-1].id
+
+        # Cabeça avançada uma vez pelo lote; INSERT comum seguinte encadeia a partir dela.
+        async with tenant_rls.tenant_scoped_session(factory, bulk_tenant) as session:
+            head = (
+                await session.execute(
+                    text("SELECT last_id, last_hash FROM public.audit_chain_heads WHERE stream_key = :k"),
+                    {"k": str(bulk_tenant)},
+                )
+            ).one()
+            assert tuple(head) == (ingested[-1].id, ingested[-1].event_hash)
+            prev = await session.scalar(
+                text("INSERT INTO public.audit_events (tenant_id, actor) VALUES (:t, 'x') RETURNING prev_hash"),
+                {"t": bulk_tenant},
+            )
+            assert prev == ingested[-1].event_hash
+            # O modo lote não sobra na transação do chamador.
+            assert await session.scalar(text("SELECT current_setting('app.audit_ingest_stream', true)")) == ""
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_is_rls_scoped_and_validates_events() -> None:
+    async with _engine() as engine:
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        tenant_id, other = uuid4(), uuid4()
+
+        with pytest.raises(ValueError):
+            async with tenant_rls.tenant_scoped_session(factory, tenant_id) as session:
+                await audit_ingest.ingest_audit_events(session, tenant_id, [{"actor": "x", "tenant_id": str(other)}])
+
+        # Lote para outro tenant é recusado (42501) pela função e nada é gravado.
+        with pytest.raises(Exception):
+            async with tenant_rls.tenant_scoped_session(factory, tenant_id) as session:
+                await audit_ingest.ingest_audit_events(session, other, _events(3))
+
+        async with tenant_rls.tenant_scoped_session(factory, other) as session:
+            assert await session.scalar(
+                text("SELECT count(*) FROM public.audit_events WHERE tenant_id = :t"), {"t": other}
+            ) == 0
+            assert await audit_ingest.ingest_audit_events(session, other, []) == []
+
+
+@pytest.mark.asyncio
+async def test_forged_batch_gucs_do_not_skip_the_chain_lock() -> None:
+    async with _engine() as engine:
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        tenant_id = uuid4()
+        async with tenant_rls.tenant_scoped_session(factory, tenant_id) as session:
+            first = (await audit_ingest.ingest_audit_events(session, tenant_id, _events(2)))[-1]
+            # GUCs do modo lote setadas pela aplicação, fora de audit_events_ingest.
+            await session.execute(
+                text(
+                    "SELECT set_config('app.audit_ingest_stream', :k, true),"
+                    " set_config('app.audit_ingest_prev', :h, true)"
+                ),
+                {"k": str(tenant_id), "h": "f" * 64},
+            )
+            prev = await session.scalar(
+                text("INSERT INTO public.audit_events (tenant_id, actor) VALUES (:t, 'x') RETURNING prev_hash"),
+                {"t": tenant_id},
+            )
+            assert prev == first.event_hash
+
+        result = await verify_audit_chain.verify_stream(engine, tenant_id)
+        assert result.ok and result.rows_verified == 3
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / "tools" / "db" / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+verify_audit_chain = _load("verify_audit_chain")
+audit_merkle = _load("audit_merkle")
+
+
+def _rfc6962_root(leaves: list[bytes]) -> bytes:
+    # MTH da RFC 6962: divide na maior potência de 2 menor que n.
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return audit_merkle.merkle_node(_rfc6962_root(leaves[:k]), _rfc6962_root(leaves[k:]))
+
+
+def test_merkle_paths_prove_every_leaf_and_reject_tampering() -> None:
+    for count in range(1, 18):
+        leaves = [audit_merkle.merkle_leaf(hashlib.sha256(str(i).encode()).hexdigest()) for i in range(count)]
+        levels = audit_merkle.merkle_levels(leaves)
+        root = levels[-1][0]
+        assert root == _rfc6962_root(leaves)
+        for index, leaf in enumerate(leaves):
+            path = audit_merkle.merkle_path(levels, index)
+            assert len(path) <= count.bit_length()
+            assert audit_merkle.root_from_path(leaf, index, count, path) == root
+            if count > 1:
+                other = (index + 1) % count
+                assert audit_merkle.root_from_path(leaves[other], index, count, path) != root
+                assert audit_merkle.root_from_path(leaf, other, count, path) != root
+            assert audit_merkle.root_from_path(leaf, index, count, path + [root]) is None
+
+
+@asynccontextmanager
+async def _engine() -> AsyncIterator[AsyncEngine]:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping audit Merkle tests")
+    engine = create_async_engine(dsn)
+    try:
+        async with engine.connect() as conn:
+            if not await conn.scalar(text("SELECT to_regclass('public.audit_merkle_blocks') IS NOT NULL")):
+                pytest.skip("migration 20261018_120_audit_merkle_blocks.sql not applied")
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def _insert_events(engine: AsyncEngine, tenant_id: UUID, count: int) -> list[int]:
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+        return [
+            await conn.scalar(
+                text(
+                    "INSERT INTO public.audit_events (tenant_id, actor, action, payload_json) "
+                    "VALUES (:t, :actor, :action, CAST(:payload AS jsonb)) RETURNING id"
+                ),
+                {
+                    "t": tenant_id,
+                    "actor": f"usuário-{i}",
+                    "action": None if i % 3 else "EDIT",
+                    "payload": json.dumps({"z": i, "a": ["é", None]}),
+                },
+            )
+            for i in range(count)
+        ]
+
+
+_BYPASSES_RLS_SQL = "SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user"
+
+
+async def _as_rls_subject(conn) -> None:
+    # Role do DSN que ignora RLS (superuser no CI): a checagem roda como $HARDENING_RLS_ROLE, só nesta transação.
+    if not await conn.scalar(text(_BYPASSES_RLS_SQL)):
+        return
+    role = os.getenv("HARDENING_RLS_ROLE")
+    if not role:
+        pytest.skip("role bypasses RLS (set HARDENING_RLS_ROLE to a role subject to it)")
+    await conn.execute(text("SELECT set_config('role', :r, true)"), {"r": role})
+
+
+async def _scalar(engine: AsyncEngine, tenant_id: UUID, sql: str, params: dict):
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+        return await conn.scalar(text(sql), params)
+
+
+def _self_consistent_forgery(proof):
+    fields = (proof.fields[0], "usuário-x", *proof.fields[2:])
+    event_hash = verify_audit_chain.event_hash(proof.prev_hash, *fields)
+    leaves = [audit_merkle.merkle_leaf(event_hash), audit_merkle.merkle_leaf("00" * 32)]
+    levels = audit_merkle.merkle_levels(leaves)
+    return dataclasses.replace(
+        proof,
+        fields=fields,
+        event_hash=event_hash,
+        leaf_index=0,
+        leaf_count=2,
+        path=tuple(p.hex() for p in audit_merkle.merkle_path(levels, 0)),
+        root_hash=levels[-1][0].hex(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_sealed_blocks_prove_events_in_python_and_sql() -> None:
+    async with _engine() as engine:
+        tenant_id = uuid4()
+        ids = await _insert_events(engine, tenant_id, 11)
+
+        blocks = await audit_merkle.seal_blocks(engine, tenant_id, block_size=4)
+        assert [(b.block_no, b.first_id, b.last_id) for b in blocks] == [(0, ids[0], ids[3]), (1, ids[4], ids[7])]
+        # Cauda incompleta (3 eventos) fica para o próximo seal.
+        assert await audit_merkle.seal_blocks(engine, tenant_id, block_size=4) == []
+        with pytest.raises(audit_merkle.MerkleError):
+            await audit_merkle.inclusion_proof(engine, tenant_id, ids[9])
+
+        for block in blocks:
+            assert await _scalar(
+                engine,
+                tenant_id,
+                "SELECT public.audit_merkle_verify_block(:t, :b)",
+                {"t": tenant_id, "b": block.block_no},
+            )
+
+        roots = {block.block_no: block.root_hash for block in blocks}
+        for event_id in ids[:8]:
+            proof = await audit_merkle.inclusion_proof(engine, tenant_id, event_id)
+            assert proof == audit_merkle.InclusionProof.from_json(proof.to_json())
+            assert audit_merkle.verify_inclusion(proof, roots[proof.block_no])
+            assert await audit_merkle.block_root(engine, proof.stream, proof.block_no) == roots[proof.block_no]
+            assert proof.event_hash == await _scalar(
+                engine, tenant_id, "SELECT event_hash FROM public.audit_events WHERE id = :id", {"id": event_id}
+            )
+            assert await _scalar(
+                engine,
+                tenant_id,
+                "SELECT public.audit_merkle_verify_proof(:h, :i, :n, CAST(:path AS text[]), :root)",
+                {
+                    "h": proof.event_hash,
+                    "i": proof.leaf_index,
+                    "n": proof.leaf_count,
+                    "path": list(proof.path),
+                    "root": proof.root_hash,
+                },
+            )
+
+        # Prova com conteúdo alterado não fecha no event_hash.
+        forged = dataclasses.replace(proof, fields=(proof.fields[0], "usuário-x", *proof.fields[2:]))
+        assert not audit_merkle.verify_inclusion(forged, roots[proof.block_no])
+
+        # Prova forjada coerente consigo mesma (event_hash, caminho e root_hash recalculados):
+        # só a raiz confiável, de fora do arquivo, a rejeita.
+        forged = _self_consistent_forgery(proof)
+        assert audit_merkle.verify_inclusion(forged, forged.root_hash)
+        assert not audit_merkle.verify_inclusion(forged, roots[proof.block_no])
+
+
+@pytest.mark.asyncio
+async def test_verify_blocks_flags_tampered_block_only() -> None:
+    async with _engine() as engine:
+        tenant_id = uuid4()
+        ids = await _insert_events(engine, tenant_id, 8)
+        await audit_merkle.seal_blocks(engine, tenant_id, block_size=4)
+        assert all(check.ok for check in await audit_merkle.verify_blocks(engine, tenant_id))
+
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+            await conn.execute(text("ALTER TABLE public.audit_events DISABLE TRIGGER trg_audit_events_immutable"))
+            await conn.execute(text("UPDATE public.audit_events SET actor = 'tamper' WHERE id = :id"), {"id": ids[5]})
+            await conn.execute(text("ALTER TABLE public.audit_events ENABLE TRIGGER trg_audit_events_immutable"))
+
+        checks = await audit_merkle.verify_blocks(engine, tenant_id)
+        assert [(c.block.block_no, c.ok, c.broken_id, c.reason) for c in checks] == [
+            (0, True, None, None),
+            (1, False, ids[5], "event_hash"),
+        ]
+        assert not await _scalar(engine, tenant_id, "SELECT public.audit_merkle_verify_block(:t, 1)", {"t": tenant_id})
+        proof = await audit_merkle.inclusion_proof(engine, tenant_id, ids[5])
+        assert not audit_merkle.verify_inclusion(proof, checks[1].block.root_hash)
+
+        # Nenhum bloco com eventos na janela: nada a verificar.
+        future = checks[0].block.max_occurred_at.replace(year=2999)
+        assert await audit_merkle.verify_blocks(engine, tenant_id, since=future) == []
+        assert await audit_merkle.unsealed_events(engine, tenant_id) == audit_merkle.UnsealedEvents(0, None, None)
+
+        with pytest.raises(Exception):
+            async with engine.begin() as conn:
+                await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+                await conn.execute(
+                    text("DELETE FROM public.audit_merkle_blocks WHERE stream_key = :k"), {"k": str(tenant_id)}
+                )
+
+
+@pytest.mark.asyncio
+async def test_blocks_are_tenant_scoped_and_sealed_only_with_the_events_root() -> None:
+    async with _engine() as engine:
+        tenant_id, other = uuid4(), uuid4()
+        await _insert_events(engine, tenant_id, 8)
+        await audit_merkle.seal_blocks(engine, tenant_id, block_size=4, max_blocks=1)
+
+        count_sql = "SELECT count(*) FROM public.audit_merkle_blocks WHERE stream_key = :k"
+        assert await _scalar(engine, tenant_id, count_sql, {"k": str(tenant_id)}) == 1
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(other)})
+            await _as_rls_subject(conn)
+            assert await conn.scalar(text(count_sql), {"k": str(tenant_id)}) == 0
+
+        block = (await audit_merkle.verify_blocks(engine, tenant_id))[0].block
+        seal_sql = "SELECT public.audit_merkle_seal_block(:t, 1, :first, :last, :root)"
+        # Raiz que os eventos não reproduzem, bloco fora de sequência e tenant de outra transação.
+        for tenant, params in (
+            (tenant_id, {"first": block.last_id + 1, "last": block.last_id + 4, "root": "0" * 64}),
+            (tenant_id, {"first": block.first_id, "last": block.last_id, "root": block.root_hash}),
+            (other, {"first": block.last_id + 1, "last": block.last_id + 4, "root": block.root_hash}),
+        ):
+            with pytest.raises(Exception):
+                await _scalar(engine, tenant, seal_sql, {"t": tenant_id, **params})
+        assert await _scalar(engine, tenant_id, count_sql, {"k": str(tenant_id)}) == 1
+
+
+def test_cli_seals_proves_and_verifies_against_a_trusted_root(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping audit Merkle tests")
+
+    async def _setup() -> tuple[UUID, list[int]]:
+        async with _engine() as engine:
+            tenant_id = uuid4()
+            return tenant_id, await _insert_events(engine, tenant_id, 7)
+
+    tenant_id, ids = asyncio.run(_setup())
+    assert audit_merkle.main(["--dsn", dsn, "seal", "--tenant", str(tenant_id), "--block-size", "5"]) == 0
+    out = capsys.readouterr().out
+    assert "block 0" in out
+    root = out.split("root ")[-1].strip()
+
+    proof_path = tmp_path / "proof.json"
+    args = ["--dsn", dsn, "prove", "--tenant", str(tenant_id), "--event-id", str(ids[2]), "--out", str(proof_path)]
+    assert audit_merkle.main(args) == 0
+    # Raiz confiável lida do banco ou passada em --root (offline).
+    assert audit_merkle.main(["--dsn", dsn, "verify-proof", str(proof_path)]) == 0
+    assert audit_merkle.main(["verify-proof", str(proof_path), "--root", root]) == 0
+    proof = audit_merkle.InclusionProof.from_json(proof_path.read_text())
+
+    # Sem raiz externa não há o que comparar: a do próprio arquivo não vale.
+    for name in audit_merkle.DSN_ENVS:
+        monkeypatch.delenv(name, raising=False)
+    with pytest.raises(SystemExit):
+        audit_merkle.main(["verify-proof", str(proof_path)])
+
+    proof_path.write_text(_self_consistent_forgery(proof).to_json())
+    assert audit_merkle.main(["verify-proof", str(proof_path), "--root", root]) == 1
+    assert audit_merkle.main(["--dsn", dsn, "verify-proof", str(proof_path)]) == 1
+
+    doc = json.loads(proof.to_json())
+    doc["path"][0] = "00" * 32
+    proof_path.write_text(json.dumps(doc))
+    assert audit_merkle.main(["verify-proof", str(proof_path), "--root", root]) == 1
+
+    capsys.readouterr()
+    assert audit_merkle.main(["--dsn", dsn, "verify", "--tenant", str(tenant_id)]) == 0
+    assert f"UNSEALED {tenant_id}: 2 events ids {ids[5]}..{ids[6]}" in capsys.readouterr().out
+    # Janela sem bloco selado: falha em vez de sair 0 sem verificar nada.
+    args = ["--dsn", dsn, "verify", "--tenant", str(tenant_id), "--since", "2999-01-01T00:00:00+00:00"]
+    assert audit_merkle.main(args) == 1
+    assert "no sealed block" in capsys.readouterr().err
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load_tool():
+    spec = importlib.util.spec_from_file_location(
+        "rls_index_coverage", REPO_ROOT / "tools" / "db" / "rls_index_coverage.py"
+    )
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+rls_index_coverage = _load_tool()
+
+SCHEMA = "rls_coverage_test"
+
+# Mesmas policies que a 20260216_122 cria (uuid e texto), num schema descartável.
+_SCRATCH_DDL = [
+    f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE",
+    f"CREATE SCHEMA {SCHEMA}",
+    f"CREATE TABLE {SCHEMA}.indexed (id bigserial PRIMARY KEY, tenant_id uuid NOT NULL)",
+    f"CREATE INDEX ON {SCHEMA}.indexed (tenant_id, id)",
+    f"CREATE TABLE {SCHEMA}.unindexed (id bigserial PRIMARY KEY, tenant_id uuid NOT NULL)",
+    # bpchar: tenant_id::text vira rtrim e o índice na coluna não serve para a policy.
+    f"CREATE TABLE {SCHEMA}.char_tenant (id bigserial PRIMARY KEY, tenant_id char(36) NOT NULL)",
+    f"CREATE INDEX ON {SCHEMA}.char_tenant (tenant_id)",
+    f"CREATE TABLE {SCHEMA}.no_rls (id bigserial PRIMARY KEY, tenant_id uuid NOT NULL)",
+]
+_POLICIES = {
+    "indexed": "tenant_id = current_setting('app.current_tenant_id', true)::uuid",
+    "unindexed": "tenant_id = current_setting('app.current_tenant_id', true)::uuid",
+    "char_tenant": "tenant_id::text = current_setting('app.current_tenant_id', true)",
+}
+
+
+@asynccontextmanager
+async def _scratch_schema() -> AsyncIterator[AsyncEngine]:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping RLS index coverage tests")
+    engine = create_async_engine(dsn)
+    try:
+        async with engine.begin() as conn:
+            if await conn.scalar(text(rls_index_coverage._BYPASS_SQL)):
+                pytest.skip("HARDENING_PG_DSN role bypasses RLS")
+            for statement in _SCRATCH_DDL:
+                await conn.execute(text(statement))
+            for table, predicate in _POLICIES.items():
+                await conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} ENABLE ROW LEVEL SECURITY"))
+                await conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} FORCE ROW LEVEL SECURITY"))
+                await conn.execute(
+                    text(
+                        f"CREATE POLICY tenant_isolation ON {SCHEMA}.{table} "
+                        f"USING ({predicate}) WITH CHECK ({predicate})"
+                    )
+                )
+        yield engine
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_flags_missing_and_cast_defeated_indexes_and_migration_fixes_them() -> None:
+    async with _scratch_schema() as engine:
+        report = await rls_index_coverage.analyze(engine, schema=SCHEMA)
+        by_table = {c.table.split(".")[1]: c for c in report}
+        assert sorted(by_table) == ["char_tenant", "indexed", "unindexed"]
+
+        assert by_table["indexed"].findings == []
+        assert [f.kind for f in by_table["unindexed"].findings] == ["missing_index"]
+        assert "(tenant_id, id)" in by_table["unindexed"].findings[0].index_sql
+        assert [f.kind for f in by_table["char_tenant"].findings] == ["cast_defeats_index"]
+        assert "((tenant_id)::text)" in by_table["char_tenant"].findings[0].index_sql
+
+        sql = rls_index_coverage.migration_sql(report, "20991231_000_rls_tenant_indexes.sql")
+        assert sql is not None
+        statements = [line for line in sql.splitlines() if line.startswith("CREATE INDEX CONCURRENTLY")]
+        assert len(statements) == 2
+        # CONCURRENTLY não roda em transação: um comando por vez, em autocommit.
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in statements:
+                await conn.execute(text(statement))
+
+        after = await rls_index_coverage.analyze(engine, schema=SCHEMA)
+        assert all(c.findings == [] for c in after)
+        assert rls_index_coverage.migration_sql(after, "x.sql") is None
+
+
+def test_quote_ident_doubles_quotes_and_keeps_plain_names() -> None:
+    quote = rls_index_coverage.quote_ident
+    assert [quote(n) for n in ("tenant_id", "Docs", "order", 'a"; DROP TABLE x; --')] == [
+        "tenant_id",
+        '"Docs"',
+        '"order"',
+        '"a""; DROP TABLE x; --"',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_quoted_identifiers_are_probed_and_indexed() -> None:
+    table = 'Docs "v2"'
+    predicate = _POLICIES["unindexed"]
+    async with _scratch_schema() as engine:
+        async with engine.begin() as conn:
+            quoted = f'{SCHEMA}."Docs ""v2"""'
+            await conn.execute(text(f'CREATE TABLE {quoted} ("Id" bigserial PRIMARY KEY, tenant_id uuid NOT NULL)'))
+            await conn.execute(text(f"ALTER TABLE {quoted} ENABLE ROW LEVEL SECURITY"))
+            await conn.execute(text(f"ALTER TABLE {quoted} FORCE ROW LEVEL SECURITY"))
+            await conn.execute(
+                text(f"CREATE POLICY tenant_isolation ON {quoted} USING ({predicate}) WITH CHECK ({predicate})")
+            )
+
+        by_table = {c.table.split(".", 1)[1]: c for c in await rls_index_coverage.analyze(engine, schema=SCHEMA)}
+        [finding] = by_table[table].findings
+        assert finding.kind == "missing_index"
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(finding.index_sql))
+
+        by_table = {c.table.split(".", 1)[1]: c for c in await rls_index_coverage.analyze(engine, schema=SCHEMA)}
+        assert by_table[table].findings == []
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Benchmark de custo da RLS e da hash-chain. Roda só com HARDENING_PG_DSN (como o smoke) e grava os
+# resultados em JSON para comparar execuções ($HARDENING_BENCH_JSON). Tamanhos por env:
+#   HARDENING_BENCH_TENANTS="10,100"  HARDENING_BENCH_ROWS="5000,50000"  HARDENING_BENCH_OPS=100
+#   HARDENING_BENCH_WRITERS=8  HARDENING_BENCH_INSERTS=50 (inserts por writer)
+# Com role do DSN que ignora RLS (superuser no CI), a parte da RLS roda como $HARDENING_RLS_ROLE,
+# dono do schema descartável (precisa de SELECT nas tabelas e USAGE nas sequences de public).
+# Os tempos não são asserts: os testes só conferem que as variantes devolvem os mesmos dados e que as
+# cadeias seguem íntegras.
+
+
+def _load_verifier():
+    spec = importlib.util.spec_from_file_location(
+        "verify_audit_chain", REPO_ROOT / "tools" / "db" / "verify_audit_chain.py"
+    )
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+verify_audit_chain = _load_verifier()
+
+
+def _env_ints(name: str, default: str) -> List[int]:
+    return [int(v) for v in os.getenv(name, default).split(",") if v.strip()]
+
+
+TENANT_COUNTS = _env_ints("HARDENING_BENCH_TENANTS", "10,100")
+ROW_COUNTS = _env_ints("HARDENING_BENCH_ROWS", "5000,50000")
+OPS = _env_ints("HARDENING_BENCH_OPS", "100")[0]
+WRITERS = _env_ints("HARDENING_BENCH_WRITERS", "8")[0]
+INSERTS_PER_WRITER = _env_ints("HARDENING_BENCH_INSERTS", "50")[0]
+RESULTS_PATH = Path(
+    os.getenv("HARDENING_BENCH_JSON", str(REPO_ROOT / ".cache" / "hardening-bench" / "rls_overhead.json"))
+)
+
+SCHEMA = "rls_bench"
+TENANT_GUC = "app.current_tenant_id"
+_SET_TENANT = f"SELECT set_config('{TENANT_GUC}', $1, true)"
+
+# Tabelas tenant-scoped com a policy da 20260216_122 (audit_events fica no benchmark da hash-chain).
+_TABLES_SQL = """
+SELECT c.relname, format_type(a.atttypid, a.atttypmod), p.qual, p.with_check
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = 'tenant_id' AND NOT a.attisdropped
+JOIN pg_policies p ON p.schemaname = n.nspname AND p.tablename = c.relname AND p.policyname = 'tenant_isolation'
+WHERE n.nspname = 'public' AND c.relkind = 'r' AND c.relrowsecurity AND c.relname <> 'audit_events'
+ORDER BY c.relname
+"""
+# Colunas NOT NULL sem default precisam de um valor no INSERT.
+_REQUIRED_COLUMNS_SQL = """
+SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+FROM pg_attribute a
+WHERE a.attrelid = CAST($1 AS regclass) AND a.attnum > 0 AND NOT a.attisdropped
+  AND a.attnotnull AND NOT a.atthasdef AND a.attname <> 'tenant_id'
+ORDER BY a.attnum
+"""
+_FILLERS = {
+    "text": "'bench'",
+    "jsonb": "'{}'::jsonb",
+    "uuid": "gen_random_uuid()",
+    "timestamp with time zone": "now()",
+    "boolean": "false",
+    "integer": "0",
+    "bigint": "0",
+}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summary(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    return {
+        "ops": len(latencies),
+        "ops_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+    }
+
+
+async def _timed(ops: int, op: Callable[[int], Awaitable[Any]]) -> Dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for i in range(ops):
+        t0 = time.perf_counter()
+        await op(i)
+        latencies.append(time.perf_counter() - t0)
+    return _summary(latencies, time.perf_counter() - started)
+
+
+@pytest.fixture(scope="module")
+def bench_results() -> Iterator[Dict[str, Any]]:
+    results: Dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "tenant_counts": TENANT_COUNTS,
+            "row_counts": ROW_COUNTS,
+            "ops": OPS,
+            "writers": WRITERS,
+            "inserts_per_writer": INSERTS_PER_WRITER,
+        },
+        "rls": [],
+        "hashchain": [],
+    }
+    yield results
+    if results["rls"] or results["hashchain"]:
+        RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        RESULTS_PATH.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+@asynccontextmanager
+async def _raw_connection(**engine_kwargs: Any) -> AsyncIterator[Any]:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping RLS overhead benchmark")
+    engine = create_async_engine(dsn, **engine_kwargs)
+    try:
+        async with engine.connect() as conn:
+            yield (await conn.get_raw_connection()).driver_connection
+    finally:
+        await engine.dispose()
+
+
+async def _server_meta(raw: Any) -> Dict[str, Any]:
+    return {
+        "server_version": await raw.fetchval("SHOW server_version"),
+        "role_bypasses_rls": await raw.fetchval(
+            "SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user"
+        ),
+    }
+
+
+async def _build_copy(
+    raw: Any, table: str, tenant_type: str, qual: str, with_check: str, tenants: List[str], rows: int
+) -> Optional[str]:
+    """Cópia de public.<table> em rls_bench com a mesma policy e `rows` linhas; devolve o INSERT do workload."""
+    copy = f"{SCHEMA}.{table}"
+    await raw.execute(f"DROP TABLE IF EXISTS {copy}")
+    await raw.execute(f"CREATE TABLE {copy} (LIKE public.{table} INCLUDING DEFAULTS INCLUDING INDEXES)")
+    required = await raw.fetch(_REQUIRED_COLUMNS_SQL, f"public.{table}")
+    if any(column_type not in _FILLERS for _, column_type in required):
+        return None
+    columns = "".join(f", {name}" for name, _ in required)
+    values = "".join(f", {_FILLERS[column_type]}" for _, column_type in required)
+    # Carga sem RLS (o dono ignora a policy enquanto ela não é FORCE).
+    await raw.execute(
+        f"INSERT INTO {copy} (tenant_id{columns}) "
+        f"SELECT (CAST($1 AS text[]))[1 + g % $2]::{tenant_type}{values} FROM generate_series(1, $3) AS g",
+        tenants,
+        len(tenants),
+        rows,
+    )
+    await raw.execute(f"ANALYZE {copy}")
+    await raw.execute(f"ALTER TABLE {copy} ENABLE ROW LEVEL SECURITY")
+    await raw.execute(f"CREATE POLICY tenant_isolation ON {copy} USING ({qual}) WITH CHECK ({with_check or qual})")
+    return f"INSERT INTO {copy} (tenant_id{columns}) VALUES ($1::{tenant_type}{values})"
+
+
+async def _in_tenant_tx(raw: Any, tenant: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    # Forma de uma requisição tenant-scoped: BEGIN, tenant LOCAL, comando, COMMIT.
+    async with raw.transaction():
+        await raw.execute(_SET_TENANT, tenant)
+        return await fn()
+
+
+@pytest.mark.asyncio
+async def test_rls_forced_vs_bypassed_select_and_insert(bench_results: Dict[str, Any]) -> None:
+    async with _raw_connection() as raw:
+        meta = await _server_meta(raw)
+        rls_role = os.getenv("HARDENING_RLS_ROLE") if meta["role_bypasses_rls"] else None
+        tables = await raw.fetch(_TABLES_SQL)
+
+        await raw.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        if rls_role:
+            # Superuser (CI): o schema é criado aqui e as cópias ficam com o role sujeito a RLS como dono,
+            # para FORCE/NO FORCE voltarem a separar as variantes.
+            owner = await raw.fetchval("SELECT quote_ident($1)", rls_role)
+            await raw.execute(f"CREATE SCHEMA {SCHEMA} AUTHORIZATION {owner}")
+            await raw.execute("SELECT set_config('role', $1, false)", rls_role)
+            meta = await _server_meta(raw)
+        else:
+            await raw.execute(f"CREATE SCHEMA {SCHEMA}")
+        try:
+            bench_results["meta"].update(meta)
+            if meta["role_bypasses_rls"]:
+                pytest.skip(
+                    "role bypasses RLS (set HARDENING_RLS_ROLE to a role subject to it): "
+                    "forced and bypassed would be the same"
+                )
+            if not tables:
+                pytest.skip("no public table with a tenant_isolation policy")
+
+            for table, tenant_type, qual, with_check in tables:
+                copy = f"{SCHEMA}.{table}"
+                for tenant_count in TENANT_COUNTS:
+                    for rows in ROW_COUNTS:
+                        tenants = [str(uuid4()) for _ in range(tenant_count)]
+                        insert_sql = await _build_copy(raw, table, tenant_type, qual, with_check, tenants, rows)
+                        if insert_sql is None:
+                            bench_results["rls"].append({"table": table, "skipped": "unsupported NOT NULL column"})
+                            continue
+                        workloads = {
+                            "select_latest_50": (
+                                "fetch",
+                                f"SELECT * FROM {copy} WHERE tenant_id = $1::{tenant_type} ORDER BY id DESC LIMIT 50",
+                            ),
+                            "count_tenant": (
+                                "fetchval",
+                                f"SELECT count(*) FROM {copy} WHERE tenant_id = $1::{tenant_type}",
+                            ),
+                            "insert": ("execute", insert_sql),
+                        }
+                        count_all = f"SELECT count(*) FROM {copy}"
+                        count_other = f"SELECT count(*) FROM {copy} WHERE tenant_id = $1::{tenant_type}"
+                        visible: Dict[str, int] = {}
+                        # O dono da tabela só passa pela policy com FORCE; sem FORCE é o caminho "bypassed".
+                        for variant, force in (("forced", "FORCE"), ("bypassed", "NO FORCE")):
+                            await raw.execute(f"ALTER TABLE {copy} {force} ROW LEVEL SECURITY")
+                            visible[variant] = await _in_tenant_tx(raw, tenants[0], lambda: raw.fetchval(count_all))
+                            if variant == "forced" and tenant_count > 1:
+                                assert await _in_tenant_tx(
+                                    raw, tenants[0], lambda: raw.fetchval(count_other, tenants[1])
+                                ) == 0
+                            for workload, (method, sql) in workloads.items():
+
+                                async def op(i: int, method: str = method, sql: str = sql) -> Any:
+                                    tenant = tenants[i % len(tenants)]
+                                    return await _in_tenant_tx(raw, tenant, lambda: getattr(raw, method)(sql, tenant))
+
+                                bench_results["rls"].append(
+                                    {
+                                        "table": table,
+                                        "tenants": tenant_count,
+                                        "rows": rows,
+                                        "variant": variant,
+                                        "workload": workload,
+                                        **await _timed(OPS, op),
+                                    }
+                                )
+                        # Sem filtro explícito: com FORCE só o tenant do GUC; sem FORCE a tabela toda
+                        # (já com os inserts da variante forced).
+                        assert visible["forced"] == rows // tenant_count
+                        assert visible["bypassed"] == rows + OPS
+        finally:
+            await raw.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+    measured = [r for r in bench_results["rls"] if "variant" in r]
+    assert {r["variant"] for r in measured} == {"forced", "bypassed"}
+
+
+async def _writer(engine: Any, tenant: UUID, inserts: int, latencies: List[float]) -> None:
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        for i in range(inserts):
+            t0 = time.perf_counter()
+            async with raw.transaction():
+                await raw.execute(_SET_TENANT, str(tenant))
+                await raw.execute(
+                    "INSERT INTO public.audit_events (tenant_id, actor, action, payload_json) "
+                    "VALUES ($1, 'bench', 'BENCH', jsonb_build_object('i', $2::int))",
+                    tenant,
+                    i,
+                )
+            latencies.append(time.perf_counter() - t0)
+
+
+@pytest.mark.asyncio
+async def test_hashchain_insert_throughput_with_concurrent_writers(bench_results: Dict[str, Any]) -> None:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping RLS overhead benchmark")
+    engine = create_async_engine(dsn, pool_size=WRITERS, max_overflow=0)
+    try:
+        for mode in ("one_stream", "many_streams"):
+            if mode == "one_stream":
+                tenants = [uuid4()] * WRITERS  # todos disputam o advisory lock do mesmo stream
+            else:
+                tenants = [uuid4() for _ in range(WRITERS)]
+            latencies: List[float] = []
+            started = time.perf_counter()
+            await asyncio.gather(*(_writer(engine, t, INSERTS_PER_WRITER, latencies) for t in tenants))
+            elapsed = time.perf_counter() - started
+
+            assert len(latencies) == WRITERS * INSERTS_PER_WRITER
+            checks = [await verify_audit_chain.verify_stream(engine, t) for t in dict.fromkeys(tenants)]
+            bench_results["hashchain"].append(
+                {
+                    "mode": mode,
+                    "writers": WRITERS,
+                    "inserts_per_writer": INSERTS_PER_WRITER,
+                    **_summary(latencies, elapsed),
+                    "chain_ok": all(c.ok for c in checks),
+                }
+            )
+            # Writers concorrentes no mesmo stream: id atribuído sob o lock (corrida id x lock, 20261018_100).
+            assert [(c.first_broken_id, c.reason) for c in checks if not c.ok] == [], mode
+    finally:
+        await engine.dispose()
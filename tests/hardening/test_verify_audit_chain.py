@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load_verifier():
+    spec = importlib.util.spec_from_file_location(
+        "verify_audit_chain", REPO_ROOT / "tools" / "db" / "verify_audit_chain.py"
+    )
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+verify_audit_chain = _load_verifier()
+
+
+@asynccontextmanager
+async def _engine() -> AsyncIterator[AsyncEngine]:
+    dsn = os.getenv("HARDENING_PG_DSN")
+    if not dsn:
+        pytest.skip("HARDENING_PG_DSN not set; skipping audit chain verifier tests")
+    engine = create_async_engine(dsn)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def _insert_events(engine: AsyncEngine, tenant_id: UUID, count: int) -> list[int]:
+    # Mistura NULLs, unicode e JSON aninhado: o hash em Python precisa bater com o do trigger.
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+        ids = []
+        for i in range(count):
+            ids.append(
+                await conn.scalar(
+                    text(
+                        "INSERT INTO public.audit_events (tenant_id, actor, action, resource_ref, payload_json) "
+                        "VALUES (:t, :actor, :action, 'doc/ação', CAST(:payload AS jsonb)) RETURNING id"
+                    ),
+                    {
+                        "t": tenant_id,
+                        "actor": f"usuário-{i}",
+                        "action": None if i % 2 else "EDIT",
+                        "payload": json.dumps({"z": i, "a": {"k": [1, "é"]}}),
+                    },
+                )
+            )
+        return ids
+
+
+async def _stored_hash(engine: AsyncEngine, tenant_id: UUID, event_id: int) -> str:
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+        return await conn.scalar(text("SELECT event_hash FROM public.audit_events WHERE id = :id"), {"id": event_id})
+
+
+async def _tamper(engine: AsyncEngine, tenant_id: UUID, event_id: int) -> None:
+    # Simula adulteração direta no banco (o dono da tabela consegue desligar o trigger de imutabilidade).
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+        await conn.execute(text("ALTER TABLE public.audit_events DISABLE TRIGGER trg_audit_events_immutable"))
+        await conn.execute(text("UPDATE public.audit_events SET actor = 'tamper' WHERE id = :id"), {"id": event_id})
+        await conn.execute(text("ALTER TABLE public.audit_events ENABLE TRIGGER trg_audit_events_immutable"))
+
+
+@pytest.mark.asyncio
+async def test_verifier_matches_trigger_hashes_and_resumes_from_signed_checkpoint(tmp_path: Path) -> None:
+    async with _engine() as engine:
+        tenant_id = uuid4()
+        ids = await _insert_events(engine, tenant_id, 5)
+        store = verify_audit_chain.CheckpointStore(tmp_path, b"test-key")
+
+        first = await verify_audit_chain.verify_stream(engine, tenant_id, checkpoints=store, batch_size=2)
+        assert (first.ok, first.rows_verified, first.last_id, first.resumed_from) == (True, 5, ids[-1], None)
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(tenant_id)})
+            assert await conn.scalar(text("SELECT public.verify_audit_chain(:t, NULL, NULL)"), {"t": tenant_id})
+        assert first.last_hash == (await _stored_hash(engine, tenant_id, ids[-1]))
+
+        new_ids = await _insert_events(engine, tenant_id, 2)
+        second = await verify_audit_chain.verify_stream(engine, tenant_id, checkpoints=store, batch_size=2)
+        assert (second.ok, second.rows_verified, second.resumed_from) == (True, 2, ids[-1])
+        assert store.load(str(tenant_id)).rows == 7
+        assert store.load(str(tenant_id)).last_id == new_ids[-1]
+
+        doc = json.loads(store.path(str(tenant_id)).read_text())
+        doc["last_id"] = ids[0]
+        store.path(str(tenant_id)).write_text(json.dumps(doc))
+        with pytest.raises(verify_audit_chain.CheckpointError):
+            await verify_audit_chain.verify_stream(engine, tenant_id, checkpoints=store)
+
+
+@pytest.mark.asyncio
+async def test_verifier_reports_first_broken_id() -> None:
+    async with _engine() as engine:
+        tenant_id = uuid4()
+        ids = await _insert_events(engine, tenant_id, 4)
+        await _tamper(engine, tenant_id, ids[1])
+
+        result = await verify_audit_chain.verify_stream(engine, tenant_id, batch_size=3)
+        assert (result.ok, result.first_broken_id, result.reason, result.rows_verified) == (
+            False,
+            ids[1],
+            "event_hash",
+            1,
+        )
+
+
+def test_cli_exits_nonzero_on_broken_chain_without_saving_a_checkpoint(tmp_path: Path, capsys, monkeypatch) -> None:
+    async def _broken_tenant() -> tuple[UUID, int]:
+        async with _engine() as engine:
+            tenant_id = uuid4()
+            ids = await _insert_events(engine, tenant_id, 3)
+            await _tamper(engine, tenant_id, ids[2])
+            return tenant_id, ids[2]
+
+    tenant_id, broken_id = asyncio.run(_broken_tenant())
+    monkeypatch.setenv("AUDIT_CHECKPOINT_KEY", "k")
+
+    assert verify_audit_chain.main(["--tenant", str(tenant_id), "--checkpoint-dir", str(tmp_path)]) == 1
+    assert f"first broken id {broken_id} (event_hash mismatch)" in capsys.readouterr().out
+    assert not list(tmp_path.iterdir())
+
+
+def test_all_streams_fails_instead_of_reporting_ok_when_nothing_is_visible(capsys, monkeypatch) -> None:
+    if not os.getenv("HARDENING_PG_DSN"):
+        pytest.skip("HARDENING_PG_DSN not set; skipping audit chain verifier tests")
+
+    # Role sujeito a RLS: a descoberta veria 0 streams e o resultado seria um "tudo OK" vazio.
+    monkeypatch.setattr(verify_audit_chain, "_BYPASS_SQL", "SELECT false")
+    assert verify_audit_chain.main(["--all-streams", "--no-checkpoint"]) == 2
+    assert "subject to RLS" in capsys.readouterr().err
+
+    async def _no_streams(engine):
+        return []
+
+    monkeypatch.setattr(verify_audit_chain, "discover_streams", _no_streams)
+    assert verify_audit_chain.main(["--all-streams", "--no-checkpoint"]) == 2
+    assert "no audit streams found" in capsys.readouterr().err
+
+
+def test_stitch_checks_range_boundaries_and_keeps_the_first_break() -> None:
+    CV = verify_audit_chain.ChainVerification
+    ranges = [(0, "g", 10), (10, "h10", 20), (20, "h20", verify_audit_chain.MAX_ID)]
+    ok_parts = [CV("s", True, 3, 10, "h10"), CV("s", True, 4, 20, "h20"), CV("s", True, 2, 25, "h25")]
+
+    assert verify_audit_chain.stitch("s", list(zip(ranges, ok_parts))) == CV("s", True, 9, 25, "h25")
+
+    # Faixa intermediária quebrada: vale o primeiro id quebrado dela, mesmo com a seguinte íntegra.
+    broken = [ok_parts[0], CV("s", False, 1, 12, "h12", 14, "event_hash"), ok_parts[2]]
+    assert verify_audit_chain.stitch("s", list(zip(ranges, broken))) == CV("s", False, 4, 12, "h12", 14, "event_hash")
+
+    # A faixa anterior não terminou na linha de fronteira com o hash que ela declara.
+    short = [ok_parts[0], CV("s", True, 4, 20, "other"), ok_parts[2]]
+    assert verify_audit_chain.stitch("s", list(zip(ranges, short))) == CV(
+        "s", False, 7, 20, "other", 20, "range_boundary"
+    )
+
+
+@pytest.mark.asyncio
+async def test_parallel_verification_matches_serial_per_stream(tmp_path: Path) -> None:
+    async with _engine() as engine:
+        intact, tampered = uuid4(), uuid4()
+        await _insert_events(engine, intact, 7)
+        tampered_ids = await _insert_events(engine, tampered, 7)
+        await _tamper(engine, tampered, tampered_ids[4])
+
+        serial = [await verify_audit_chain.verify_stream(engine, t) for t in (intact, tampered)]
+        store = verify_audit_chain.CheckpointStore(tmp_path, b"k")
+        parallel = await verify_audit_chain.verify_streams_parallel(
+            os.environ["HARDENING_PG_DSN"], [intact, tampered], workers=2, range_size=2, batch_size=2, checkpoints=store
+        )
+
+        assert parallel == serial
+        assert parallel[1].first_broken_id == tampered_ids[4]
+        assert store.load(str(intact)).rows == 7
+        assert store.load(str(tampered)) is None
+
+        # Retomada a partir do checkpoint: só as linhas novas, em faixas.
+        await _insert_events(engine, intact, 3)
+        resumed = await verify_audit_chain.verify_streams_parallel(
+            os.environ["HARDENING_PG_DSN"], [intact], workers=2, range_size=2, checkpoints=store
+        )
+        assert (resumed[0].ok, resumed[0].rows_verified, resumed[0].resumed_from) == (True, 3, serial[0].last_id)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str):
+    # scripts/ não é pacote: carrega pelo caminho, como os scripts se carregam entre si.
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / "scripts" / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sprint_c_load = _load("sprint_c_load")
+sprint_c_stub = _load("sprint_c_stub")
+
+
+async def _against_stub(config, **stub_options):
+    stub = sprint_c_stub.StubServer(task_delay=0.01, ingest_delay=0.03, **stub_options)
+    host, port = await stub.start()
+    config.base = f"http://{host}:{port}"
+    try:
+        return await sprint_c_load.run_load(config), stub
+    finally:
+        await stub.close()
+
+
+def test_closed_loop_replays_every_flow_over_pooled_connections() -> None:
+    config = sprint_c_load.LoadConfig(users=6, duration=0.6, ramp=0.1, mix={"full": 1, "search": 2}, seed=7)
+    report, stub = asyncio.run(_against_stub(config))
+
+    expected = {
+        "POST /api/v1/auth/login",
+        "POST /api/v1/tasks/dispatch",
+        "GET /api/v1/tasks/{id}",
+        "GET /api/v1/tasks/handlers",
+        "POST /api/v1/documents/upload",
+        "GET /api/v1/documents/upload/status/{id}",
+        "GET /api/v1/normas-legais/",
+        "POST /api/v1/search/",
+    }
+    assert set(report.endpoints) == expected
+    assert set(report.flows) == {"full", "search"}
+    assert all(row["errors"] == 0 and row["count"] > 0 for row in report.endpoints.values())
+    assert all(row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] <= row["max_ms"] for row in report.endpoints.values())
+    assert report.flows_started == sum(row["count"] for row in report.flows.values())
+    # Keep-alive: no máximo uma conexão por usuário, muito menos que o número de requisições.
+    assert report.connections_opened == stub.connections <= config.users
+    assert stub.requests == sum(row["count"] for row in report.endpoints.values())
+    assert json.loads(report.to_json())["endpoints"].keys() == expected
+    assert set(report.jobs) == {"task", "upload"}
+    assert report.jobs["task"]["count"] == report.flows["full"]["count"]
+    assert report.jobs["upload"]["timeouts"] == 0
+    # O relógio do upload começa na resposta "queued", não no envio.
+    text = sprint_c_load.format_report(report)
+    assert "job task (dispatch→done)" in text and "job upload (queued→done)" in text
+
+
+def test_open_model_counts_failures_per_endpoint_and_flow() -> None:
+    config = sprint_c_load.LoadConfig(users=4, rate=200, duration=0.3, mix={"normas": 1}, seed=3)
+    config.login = {"email": "", "password": ""}
+    report, _ = asyncio.run(_against_stub(config))
+
+    login = report.endpoints["POST /api/v1/auth/login"]
+    assert login["errors"] == login["count"] > 0
+    assert login["top_errors"] == {"HTTP 401": login["count"]}
+    assert report.flows["normas"]["errors"] == report.flows["normas"]["count"] == report.flows_started > 0
+    assert "GET /api/v1/normas-legais/" not in report.endpoints
+
+
+def test_pool_resends_on_keepalive_closed_by_server() -> None:
+    async def _scenario():
+        stub = sprint_c_stub.StubServer(idle_timeout=0.05)
+        host, port = await stub.start()
+        pool = sprint_c_load.ConnectionPool(f"http://{host}:{port}", size=1)
+        try:
+            first = await pool.request("GET", "/api/v1/normas-legais/")
+            await asyncio.sleep(0.2)
+            second = await pool.request("GET", "/api/v1/normas-legais/")
+        finally:
+            await pool.close()
+            await stub.close()
+        return first, second, pool.connections_opened
+
+    first, second, opened = asyncio.run(_scenario())
+    assert (first.status, second.status) == (401, 401)
+    assert opened == 2
+
+
+def test_arrivals_ramp_up_and_mix_parsing() -> None:
+    times = list(sprint_c_load.arrival_times(100.0, 2.0, 4.0, random.Random(1)))
+    assert times == sorted(times) and 0 < times[0] and times[-1] < 4.0
+    during_ramp = sum(1 for t in times if t < 2.0)
+    after_ramp = len(times) - during_ramp
+    # Rampa linear até 100/s: ~100 chegadas nos 2 s de rampa, ~200 depois.
+    assert 70 < during_ramp < 130 and 160 < after_ramp < 240
+
+    assert sprint_c_load.parse_mix("full=1, search=3,normas") == {"full": 1.0, "search": 3.0, "normas": 1.0}
+    with pytest.raises(ValueError):
+        sprint_c_load.parse_mix("full=1,bogus=2")
+    assert sprint_c_load.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert sprint_c_load.percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
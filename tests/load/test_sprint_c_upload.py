@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / "scripts" / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sprint_c_load = _load("sprint_c_load")
+sprint_c_stub = _load("sprint_c_stub")
+sprint_c_upload = _load("sprint_c_upload")
+sprint_c_ingest_bench = _load("sprint_c_ingest_bench")
+
+MB = sprint_c_upload.MB
+
+
+def test_generated_pdf_has_valid_xref_and_is_reused(tmp_path: Path) -> None:
+    path = sprint_c_upload.generate_pdf(tmp_path / "scan.pdf", 3 * MB)
+    data = path.read_bytes()
+    assert 3 * MB - 2048 < len(data) <= 3 * MB
+    assert data.startswith(b"%PDF-1.4") and data.endswith(b"%%EOF\n")
+    xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    assert data[xref:].startswith(b"xref")
+    offsets = [int(o) for o in re.findall(rb"(\d{10}) 00000 n", data)]
+    assert [data[o:].split(b"\n", 1)[0] for o in offsets] == [b"%d 0 obj" % n for n in range(1, 6)]
+
+    mtime = path.stat().st_mtime_ns
+    assert sprint_c_upload.generate_pdf(path, 3 * MB) == path
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_streamed_multipart_reaches_stub_whole_and_jobs_queue_for_workers(tmp_path: Path) -> None:
+    path = sprint_c_upload.generate_pdf(tmp_path / "scan.pdf", 3 * MB)
+    document = sprint_c_upload.MultipartFile(path, trailer=b"%% unique\n", chunk_size=64 * 1024)
+
+    async def _collect() -> bytes:
+        return b"".join([piece async for piece in document.chunks()])
+
+    body = asyncio.run(_collect())
+    assert body == b"".join(document.iter_chunks())
+    assert len(body) == document.length
+    assert document.file_size == path.stat().st_size + len(b"%% unique\n")
+
+    async def _scenario():
+        stub = sprint_c_stub.StubServer(ingest_delay=0.05, ingest_rate=30.0, ingest_workers=1)
+        host, port = await stub.start()
+        pool = sprint_c_load.ConnectionPool(f"http://{host}:{port}", size=2)
+        # Long-poll: a medida não depende do intervalo de polling.
+        wait = sprint_c_load.WaitOptions(mode="long-poll", long_poll_wait=2.0)
+        login = {"email": "a@b", "password": "x"}
+        session = sprint_c_load.Session(pool, sprint_c_load.LatencyStats(), login, wait=wait)
+        try:
+            results = await asyncio.gather(*(sprint_c_load.upload_document(session, document) for _ in range(2)))
+        finally:
+            await pool.close()
+            await stub.close()
+        return stub, results
+
+    stub, results = asyncio.run(_scenario())
+    assert sorted(job.size for job in stub.jobs.values()) == [document.file_size] * 2
+    assert {job.filename for job in stub.jobs.values()} == {"scan.pdf"}
+    # Um worker de ingestão: o segundo job espera o primeiro (~0,15 s cada).
+    first, second = sorted(r.job.latency for r in results)
+    assert first >= 0.15 and second >= first + 0.1
+    assert all(r.size == document.length and r.mb_per_s > 0 for r in results)
+
+
+def test_ingest_bench_reports_throughput_queue_time_and_server_memory(tmp_path: Path) -> None:
+    out = tmp_path / "bench.json"
+    args = [
+        "--stub", "--files", "3", "--size-mb", "2,4", "--concurrency", "2", "--chunk-kb", "256",
+        "--workdir", str(tmp_path / "files"), "--sample-interval", "0.05", "--stub-ingest-delay", "0.05",
+        "--json", str(out),
+    ]
+    assert sprint_c_ingest_bench.main(args) == 0
+
+    report = json.loads(out.read_text())
+    assert report["uploads"]["count"] == 3 and report["uploads"]["failed"] == 0
+    uploads = report["uploads"]
+    # MB/s agregado só sobre a transferência; a espera fila→done fica no ponta a ponta.
+    assert 0 < uploads["upload_window_s"] <= uploads["wall_s"]
+    assert uploads["aggregate_mb_s"] >= uploads["end_to_end_mb_s"] > 0
+    assert [row["file"] for row in report["per_job"]] == ["scan_2mb.pdf", "scan_4mb.pdf", "scan_2mb.pdf"]
+    assert all(row["status"] == "done" and row["queue_to_done_ms"] > 0 for row in report["per_job"])
+    assert report["queue_to_done"]["count"] == 3 and report["queue_to_done"]["timeouts"] == 0
+    memory = report["server_memory"]
+    assert memory["source"].startswith("pid ") and memory["samples"] >= 1
+    assert memory["baseline_mb"] > 0 and memory["peak_mb"] >= memory["baseline_mb"]
+
+
+def test_memory_sources() -> None:
+    assert sprint_c_ingest_bench.rss_of_tree(os.getpid()) > 0
+    text = (
+        "# TYPE process_resident_memory_bytes gauge\n"
+        'process_resident_memory_bytes{worker="1"} 1.048576e+08\n'
+        'process_resident_memory_bytes{worker="2"} 5.24288e+07\n'
+        "process_virtual_memory_bytes 9e+09\n"
+    )
+    assert sprint_c_ingest_bench.parse_prometheus_rss(text) == 150 * MB
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / "scripts" / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sprint_c_load = _load("sprint_c_load")
+sprint_c_stub = _load("sprint_c_stub")
+sprint_c_wait = _load("sprint_c_wait")
+
+TASK_DELAY = 0.15
+
+
+async def _dispatch_and_wait(mode: str, *, sse: bool = True, deadline: float = 5.0):
+    stub = sprint_c_stub.StubServer(task_delay=TASK_DELAY, sse=sse)
+    host, port = await stub.start()
+    pool = sprint_c_load.ConnectionPool(f"http://{host}:{port}", size=2)
+    wait = sprint_c_load.WaitOptions(mode=mode, long_poll_wait=2.0, deadline=deadline)
+    session = sprint_c_load.Session(
+        pool, sprint_c_load.LatencyStats(), {"email": "a@b", "password": "x"}, wait=wait, rng=random.Random(5)
+    )
+    try:
+        await session.ensure_token()
+        started = time.perf_counter()
+        dispatch = await session.call("POST", "/api/v1/tasks/dispatch", {"handler": "ping"}, auth=False)
+        job = await session.wait_job(
+            "task", "/api/v1/tasks/{id}", started=started, done=sprint_c_wait.TASK_DONE, id=dispatch["task_id"]
+        )
+        assert session.jobs.results["task"] == [job]
+        return job.status, job
+    finally:
+        await pool.close()
+        await stub.close()
+
+
+def test_backoff_grows_to_cap_with_bounded_jitter() -> None:
+    backoff = sprint_c_wait.Backoff(initial=0.05, factor=2.0, max_delay=0.5, jitter=0.5)
+    delays = backoff.delays(random.Random(1))
+    for n in range(10):
+        base = min(0.05 * 2**n, 0.5)
+        assert base * 0.5 <= next(delays) <= base
+
+
+@pytest.mark.parametrize("mode", ["poll", "long-poll", "sse"])
+def test_waiter_measures_dispatch_to_done_in_every_mode(mode: str) -> None:
+    status, result = asyncio.run(_dispatch_and_wait(mode))
+
+    assert status["status"] == "success" and result.ok
+    assert result.mode == mode
+    assert TASK_DELAY <= result.latency < TASK_DELAY + 0.5
+    if mode == "poll":
+        # Backoff a partir de 50 ms: várias consultas, erro limitado ao último intervalo.
+        assert result.requests > 2 and 0 < result.uncertainty < result.latency
+    else:
+        assert result.requests == 1 and result.uncertainty == 0.0
+        assert result.latency < TASK_DELAY + 0.05
+
+
+def test_sse_unavailable_falls_back_to_polling() -> None:
+    status, result = asyncio.run(_dispatch_and_wait("sse", sse=False))
+    assert status["status"] == "success"
+    assert result.mode == "poll"
+
+
+def test_deadline_raises_with_last_status_and_counts_timeout() -> None:
+    async def _scenario():
+        stub = sprint_c_stub.StubServer(ingest_delay=5.0)
+        host, port = await stub.start()
+        pool = sprint_c_load.ConnectionPool(f"http://{host}:{port}", size=1)
+        wait = sprint_c_load.WaitOptions(deadline=0.3)
+        login = {"email": "a@b", "password": "x"}
+        session = sprint_c_load.Session(pool, sprint_c_load.LatencyStats(), login, wait=wait)
+        try:
+            with pytest.raises(sprint_c_wait.JobTimeout) as excinfo:
+                await sprint_c_load.flow_upload(session)
+        finally:
+            await pool.close()
+            await stub.close()
+        return excinfo.value, session.jobs.summary()
+
+    timeout, summary = asyncio.run(_scenario())
+    assert timeout.last_status["status"] == "processing"
+    assert 0.3 <= timeout.waited < 0.6
+    assert summary["upload"]["timeouts"] == 1 and summary["upload"]["count"] == 0
+
+
+def test_job_latency_summary_histogram_buckets() -> None:
+    jobs = sprint_c_wait.JobLatency()
+    for seconds in (0.004, 0.009, 0.2, 0.2, 1.5, 200.0):
+        jobs.record("task", sprint_c_wait.JobResult({"status": "success"}, seconds, 0.01, 3, "poll"))
+    jobs.record("task", sprint_c_wait.JobResult({"status": "error"}, 0.03, 0.0, 1, "sse"))
+    jobs.record_timeout("task")
+
+    row = jobs.summary()["task"]
+    assert row["histogram_ms"] == {"le_5": 1, "le_10": 1, "le_50": 1, "le_250": 2, "le_2500": 1, "gt_120000": 1}
+    assert (row["count"], row["timeouts"], row["failed"]) == (7, 1, 1)
+    assert row["p50_ms"] == 200.0 and row["max_ms"] == 200000.0
+    assert row["requests_per_job"] == round(19 / 7, 2)
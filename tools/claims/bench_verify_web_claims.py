@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Benchmark for tools/claims/verify_web_claims.py on synthetic repositories.
+
+Generates a repo with N pages, M claims, S .sql files and node_modules noise, then times
+the verifier stages separately (cold, no result cache):
+
+- scan:    _scan_forbidden_ai_phrases()  -> copy files/s
+- verify:  verify_claims()               -> claims/s (includes the scan and the repo walk)
+- report:  write_report()                -> claims/s
+
+Peak memory per stage is measured in a separate, untimed pass under tracemalloc.
+With --baseline, results are compared against a stored run and regressions are flagged
+(exit code 1). Baselines are machine-specific: record and compare on the same runner.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+HERE = Path(__file__).resolve().parent
+VERIFIER_PATH = HERE / "verify_web_claims.py"
+DEFAULT_BASELINE = HERE.parents[1] / ".cache" / "web-claims" / "bench-baseline.json"
+
+# (claim_type, required_proof) mix, roughly the proportions of WEB-CLAIMS.yaml.
+CLAIM_MIX = [
+    ("ENFORCEMENT", "TEST"),
+    ("ENFORCEMENT", "ADR"),
+    ("EVIDENCE", "TEST"),
+    ("AI_ASSISTIVE", "ADR"),
+    ("AI_GUARDRAIL", "ADR"),
+    ("PRIVACY_OPERATION", "TEST"),
+    ("RLS", "DB_MIGRATION"),
+    ("SIGNATURE", "CODE_INVARIANT"),
+    ("MARKETING", "TEST"),
+]
+
+AI_PATTERN = {"assistive_only": True, "human_in_the_loop": True, "explainability_required": True}
+
+
+@dataclass
+class CorpusSpec:
+    pages: int = 40
+    claims: int = 28
+    sql: int = 10
+    noise: int = 2000
+    # One page in `forbidden_every` carries a forbidden AI phrase (0 = none).
+    forbidden_every: int = 10
+
+
+def _load_verifier():
+    spec = importlib.util.spec_from_file_location("verify_web_claims", VERIFIER_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> None:
+    """Write a synthetic repository shaped like this one under `root`."""
+    statements: Dict[int, List[str]] = {i: [] for i in range(spec.pages)}
+    for n in range(spec.claims):
+        statements[n % max(spec.pages, 1)].append(f"O módulo {n} registra cada ato com trilha verificável {n}.")
+
+    page_paths: List[str] = []
+    for i in range(spec.pages):
+        if i % 3 == 2:
+            rel = f"content/blog/post-{i:04d}.mdx"
+        elif i % 3 == 1:
+            rel = f"app/pagina-{i:04d}/page.tsx"
+        else:
+            rel = f"components/section/Section{i:04d}.tsx"
+        page_paths.append(rel)
+        body = [f"<section>\n  <h2>Seção {i}</h2>"]
+        for stmt in statements.get(i, []):
+            # Indented and line-wrapped like JSX copy, so whitespace normalization is exercised.
+            words = stmt.split(" ")
+            body.append("  <p>\n    " + " ".join(words[:4]) + "\n    " + " ".join(words[4:]) + "\n  </p>")
+        body.extend(f"  <p>Parágrafo de apoio {k} com texto institucional sobre governança.</p>" for k in range(20))
+        if spec.forbidden_every and i % spec.forbidden_every == spec.forbidden_every - 1:
+            body.append("  <p>Nossa IA decide automaticamente, sem revisão humana.</p>")
+        body.append("</section>\n")
+        _write(root / rel, "\n".join(body))
+
+    for k in range(5):
+        _write(root / f"docs/public/evidence/adr/ADR-{k:03d}.md", f"# ADR {k}\n")
+    _write(root / "lib/rules/engine.ts", "export const engine = true;\n")
+    _write(root / "lib/rules/engine.test.ts", "test('engine', () => {});\n")
+    for k in range(spec.sql):
+        sql = f"CREATE TABLE t{k} (id int, tenant_id uuid);\n"
+        if k == 0:
+            sql += "ALTER TABLE t0 ENABLE ROW LEVEL SECURITY;\nCREATE POLICY tenant_isolation ON t0 USING (true);\n"
+        _write(root / f"infra/migrations/{k:04d}_t{k}.sql", sql)
+    for k in range(spec.noise):
+        ext = (".js", ".sql", ".tsx", ".md")[k % 4]
+        _write(root / f"node_modules/pkg{k % 50}/lib/f{k}{ext}", "module.exports = 'sem viés';\n")
+
+    claims: List[Dict[str, Any]] = []
+    for n in range(spec.claims):
+        claim_type, proof = CLAIM_MIX[n % len(CLAIM_MIX)]
+        ai = claim_type.startswith("AI_")
+        evidence: List[Dict[str, str]] = []
+        if proof in {"ADR", "DOC"}:
+            evidence = [{"path": f"docs/public/evidence/adr/ADR-{n % 5:03d}.md", "description": "adr"}]
+        elif proof == "CODE_INVARIANT":
+            evidence = [{"path": "lib/rules/engine.ts", "description": "code"}]
+        elif proof == "DB_MIGRATION":
+            evidence = [{"path": "infra/migrations/0000_t0.sql", "description": "rls"}]
+        claims.append(
+            {
+                "id": f"WEB-BENCH-{n:04d}",
+                "page_path": page_paths[n % max(spec.pages, 1)],
+                "statement": f"O módulo {n} registra cada ato com trilha verificável {n}.",
+                "domain": ["ai", "normas"] if ai else ["normas"],
+                "risk_level": ("high", "medium", "low")[n % 3],
+                "ai_pattern": AI_PATTERN if ai else {},
+                "claim_type": claim_type,
+                "required_proof": proof,
+                "status": "UNKNOWN",
+                "evidence": evidence,
+                "reproduce": [],
+                "copy_fix": "Reescrever.",
+            }
+        )
+    _write(root / "tools/claims/WEB-CLAIMS.yaml", json.dumps({"claims": claims}, ensure_ascii=False, indent=2))
+
+
+@contextmanager
+def _pointed_at(vwc: Any, root: Path) -> Iterator[None]:
+    saved = (vwc.REPO_ROOT, vwc.CLAIMS_PATH, vwc.REPORT_PATH)
+    vwc.REPO_ROOT = root
+    vwc.CLAIMS_PATH = root / "tools" / "claims" / "WEB-CLAIMS.yaml"
+    vwc.REPORT_PATH = root / "docs" / "public" / "evidence" / "WEB-CLAIMS-REPORT.md"
+    try:
+        yield
+    finally:
+        vwc.REPO_ROOT, vwc.CLAIMS_PATH, vwc.REPORT_PATH = saved
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _peak_bytes(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(root: Path, spec: CorpusSpec, repeat: int = 5) -> Dict[str, Any]:
+    vwc = _load_verifier()
+    with _pointed_at(vwc, root):
+        copy_files = len(vwc._copy_files(vwc.RepoIndex(root)))
+        results = vwc.verify_claims()
+        # A fresh RepoIndex per call keeps every sample cold (no memoized walk or reads).
+        stages: Dict[str, Callable[[], Any]] = {
+            "scan": lambda: vwc._scan_forbidden_ai_phrases(vwc.RepoIndex(root)),
+            "verify": lambda: vwc.verify_claims(index=vwc.RepoIndex(root)),
+            "report": lambda: vwc.write_report(results),
+        }
+        units = {"scan": ("files_per_s", copy_files), "verify": ("claims_per_s", spec.claims), "report": ("claims_per_s", len(results))}
+        out: Dict[str, Any] = {}
+        for name, fn in stages.items():
+            fn()  # warm up imports and the OS page cache
+            seconds = _timed(fn, repeat)
+            unit, count = units[name]
+            out[name] = {"seconds": seconds, unit: count / seconds if seconds else 0.0, "peak_bytes": _peak_bytes(fn)}
+
+    return {
+        "corpus": asdict(spec),
+        "copy_files": copy_files,
+        "results": len(results),
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "stages": out,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions of `current` vs `baseline` (empty when within tolerance).
+
+    Raises ValueError when the two runs used different corpora and are not comparable.
+    """
+    if current.get("corpus") != baseline.get("corpus"):
+        raise ValueError(f"baseline corpus {baseline.get('corpus')} differs from current {current.get('corpus')}")
+    regressions: List[str] = []
+    for stage, now in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if before[metric] and now[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{stage}.{metric}: {now[metric]:.6g} vs baseline {before[metric]:.6g} "
+                    f"(+{(now[metric] / before[metric] - 1) * 100:.0f}%, tolerance {tolerance * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"corpus: {report['corpus']}  copy files: {report['copy_files']}  results: {report['results']}")
+    print(f"{'stage':<8} {'median s':>10} {'throughput':>22} {'peak MiB':>10}")
+    for stage, row in report["stages"].items():
+        unit = "files_per_s" if "files_per_s" in row else "claims_per_s"
+        rate = f"{row[unit]:,.0f} {unit.replace('_per_s', '/s')}"
+        print(f"{stage:<8} {row['seconds']:>10.4f} {rate:>22} {row['peak_bytes'] / 2**20:>10.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description="Benchmark verify_web_claims.py on a synthetic repository.")
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--claims", type=int, default=defaults.claims)
+    parser.add_argument("--sql", type=int, default=defaults.sql, help="number of .sql migration files")
+    parser.add_argument("--noise", type=int, default=defaults.noise, help="number of files under node_modules/")
+    parser.add_argument("--forbidden-every", type=int, default=defaults.forbidden_every, metavar="N")
+    parser.add_argument("--repeat", type=int, default=5, help="timed samples per stage (median is reported)")
+    parser.add_argument("--keep", type=Path, metavar="DIR", help="generate the corpus in DIR and keep it")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE, help="stored run to compare against (default: %(default)s)"
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown/growth ratio (default: 0.25)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be >= 1")
+
+    spec = CorpusSpec(args.pages, args.claims, args.sql, args.noise, args.forbidden_every)
+    root = args.keep or Path(tempfile.mkdtemp(prefix="web-claims-bench-"))
+    try:
+        if args.keep is None or not (root / "tools" / "claims" / "WEB-CLAIMS.yaml").exists():
+            generate_corpus(root, spec)
+        report = run_benchmark(root, spec, args.repeat)
+    finally:
+        if args.keep is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    _print_table(report)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline saved: {args.baseline}")
+        return 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    try:
+        regressions = compare(report, baseline, args.tolerance)
+    except ValueError as e:
+        print(f"FAIL: {e}; re-record with --save-baseline")
+        return 2
+    if regressions:
+        print("REGRESSION")
+        for line in regressions:
+            print(f"- {line}")
+        return 1
+    print("no regression vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,100 @@
 from __future__ import annotations
 
+import abc
+import argparse
+import hashlib
+import functools
 import json
 import os
 import re
+import subprocess
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Sized, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 CLAIMS_PATH = REPO_ROOT / "tools" / "claims" / "WEB-CLAIMS.yaml"
 REPORT_PATH = REPO_ROOT / "docs" / "public" / "evidence" / "WEB-CLAIMS-REPORT.md"
+CACHE_PATH = REPO_ROOT / ".cache" / "web-claims" / "verify-cache.json"
+BASELINE_PATH = REPO_ROOT / ".cache" / "web-claims" / "baseline.json"
+PROFILE_TRACE_PATH = REPO_ROOT / ".cache" / "web-claims" / "profile-trace.json"
+CLAIMS_CACHE_PATH = REPO_ROOT / ".cache" / "web-claims" / "claims.json"
+
+# Bump when the evaluation rules change in a way the source fingerprint would not capture.
+VERIFIER_VERSION = "2"
+
+# Directories the repository index never descends into (vendored/generated trees).
+INDEX_IGNORED_DIRS = {"node_modules", ".next", ".git"}
+
+# Repo-owned roots searched for *.test.* / *.spec.* files (TEST proof).
+TEST_SCAN_ROOTS = ["app", "components", "lib", "tools", "scripts"]
+
+# Repo-owned web copy sources scanned for FORBIDDEN_AI_PHRASES: (root, filename glob).
+COPY_SCAN_PATTERNS = [("app", "*.ts*"), ("components", "*.ts*"), ("content", "*.md*")]
+
+RLS_SQL_PATTERNS = [
+    re.compile(r"ENABLE\s+ROW\s+LEVEL\s+SECURITY", re.IGNORECASE),
+    re.compile(r"CREATE\s+POLICY", re.IGNORECASE),
+]
 
-ALLOWED_DOMAINS = {"normas", "prova", "seguranca", "privacidade", "ai"}
-ALLOWED_RISK_LEVELS = {"high", "medium", "low"}
+class Domain(str, Enum):
+    NORMAS = "normas"
+    PROVA = "prova"
+    SEGURANCA = "seguranca"
+    PRIVACIDADE = "privacidade"
+    AI = "ai"
+
+
+class RiskLevel(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+class ClaimType(str, Enum):
+    AI = "AI"
+    AI_ASSISTIVE = "AI_ASSISTIVE"
+    AI_GUARDRAIL = "AI_GUARDRAIL"
+    RLS = "RLS"
+    SIGNATURE = "SIGNATURE"
+    ENFORCEMENT = "ENFORCEMENT"
+    EVIDENCE = "EVIDENCE"
+    TEMPORAL_VERSIONING = "TEMPORAL_VERSIONING"
+    EXPORT = "EXPORT"
+    PRIVACY_OPERATION = "PRIVACY_OPERATION"
+
+
+class ProofKind(str, Enum):
+    RUNTIME_SMOKE = "RUNTIME_SMOKE"
+    CODE_INVARIANT = "CODE_INVARIANT"
+    DOC = "DOC"
+    ADR = "ADR"
+    DB_MIGRATION = "DB_MIGRATION"
+    TEST = "TEST"
+
+
+AI_CLAIM_TYPES = {ClaimType.AI, ClaimType.AI_ASSISTIVE, ClaimType.AI_GUARDRAIL}
+# Claim types that need backing code; by default we don't assume it exists.
+UNCHECKED_CLAIM_TYPES = {
+    ClaimType.ENFORCEMENT,
+    ClaimType.EVIDENCE,
+    ClaimType.TEMPORAL_VERSIONING,
+    ClaimType.EXPORT,
+    ClaimType.PRIVACY_OPERATION,
+}
+
+ALLOWED_DOMAINS = {d.value for d in Domain}
+ALLOWED_RISK_LEVELS = {r.value for r in RiskLevel}
 
 # Phrases that are almost always overclaim in GovTech AI-first contexts.
 # If these appear anywhere in public web copy, we FAIL the build.
@@ -31,13 +112,93 @@ FORBIDDEN_AI_PHRASES = [
 ]
 
 
+def _leading_chars(pattern: str) -> Optional[str]:
+    # First character(s) a phrase can start with, for a plain literal or a simple [...] class.
+    # Anything fancier (top-level |, optional first atom) returns None and disables the prefilter.
+    if "|" in pattern:
+        return None
+    if pattern[:1].isalnum():
+        first, rest = pattern[0], pattern[1:]
+    elif pattern.startswith("[") and "]" in pattern:
+        first, rest = pattern[1 : pattern.index("]")], pattern[pattern.index("]") + 1 :]
+        if not first or any(ch in first for ch in "^-\\["):
+            return None
+    else:
+        return None
+    return None if rest[:1] in ("?", "*", "{") else first
+
+
+def _compile_phrase_matcher(patterns: List["re.Pattern[str]"]) -> "re.Pattern[str]":
+    """Fold a list of phrase regexes into a single matcher scanned once per text.
+
+    Each phrase becomes a named alternative (p0, p1, ...) inside a zero-width lookahead, so a
+    single finditer() reports every occurrence of every phrase, including overlapping ones
+    (e.g. "sem erro zero" hits both "sem erro" and "erro zero"). A shared leading \\b is factored
+    out and, when every phrase starts with a known character, a leading character class lets the
+    regex engine skip non-candidate positions in C instead of trying every alternative everywhere.
+    """
+    bodies = [rx.pattern for rx in patterns]
+    word_start = all(b.startswith(r"\b") for b in bodies)
+    if word_start:
+        bodies = [b[2:] for b in bodies]
+
+    prefix = ""
+    leading = [_leading_chars(b) for b in bodies]
+    if all(leading):
+        prefix = "(?=[" + "".join(re.escape(ch) for ch in sorted(set("".join(leading)))) + "])"
+    if word_start:
+        prefix += r"\b"
+
+    alternatives = "|".join(f"(?P<p{i}>{b})" for i, b in enumerate(bodies))
+    return re.compile(f"{prefix}(?=(?:{alternatives}))", re.IGNORECASE)
+
+
+FORBIDDEN_AI_MATCHER = _compile_phrase_matcher(FORBIDDEN_AI_PHRASES)
+
+
 @dataclass
 class EvidenceItem:
     path: str
     description: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class PhraseMatch:
+    pattern_index: int
+    text: str
+    line: int
+    column: int
+
+
+@dataclass(frozen=True, slots=True)
+class Claim:
+    """One WEB-CLAIMS.yaml entry, parsed and schema-checked once up front (see load_claims()).
+
+    Fields hold the values as written, normalized (domain list, risk default, evidence paths).
+    The *_code fields are the enum members; a value outside the enums keeps its code as None and
+    is reported as a FAIL of that claim by _evaluate_claim(), not as a schema error.
+    """
+
+    id: str
+    page_path: str
+    statement: str
+    claim_type: str
+    required_proof: str
+    domain: Tuple[str, ...]
+    risk_level: str
+    ai_pattern: Dict[str, Any]
+    evidence_paths: Tuple[str, ...]
+    reproduce: Tuple[str, ...]
+    copy_fix: str
+    type_code: Optional[ClaimType]
+    proof_code: Optional[ProofKind]
+    risk_code: Optional[RiskLevel]
+    domain_codes: FrozenSet[Domain]
+    # sha256 of the definition as written; keys the result cache and the --since baseline.
+    digest: str
+
+
+@dataclass(slots=True)
 class ClaimResult:
     claim_id: str
     page_path: str
@@ -50,60 +211,423 @@ class ClaimResult:
     evidence_paths: List[str]
     reproduce: List[str]
     copy_fix: str
+    # Source position, when the check points at one (forbidden phrases); used by SARIF output.
+    line: Optional[int] = None
+    column: Optional[int] = None
+
+
+class Profiler:
+    """Stage timers and per-claim I/O counters for --profile.
+
+    Spans are grouped by category (index, io, scan, proof, type, ai, cache, report) and exported as
+    a summary table and as Chrome trace events (chrome://tracing, Perfetto). Counters (files
+    walked/stat'ed, bytes read) are charged to the claim being evaluated on the current thread, or
+    to "(run)" outside of any claim. With -j > 1 the regex scan runs in worker processes and is
+    recorded as a single span.
+    """
+
+    CATEGORIES = ["index", "io", "scan", "proof", "type", "ai", "cache", "report"]
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t0 = time.perf_counter_ns()
+        self.events: List[Dict[str, Any]] = []
+        self.totals: Dict[str, List[int]] = {}  # category -> [calls, ns]
+        self.claims: Dict[str, Dict[str, int]] = {}  # claim id -> {"ns", "files", "bytes"}
+
+    @contextmanager
+    def span(self, cat: str, name: str, args: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self._t0) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self.events.append(event)
+                total = self.totals.setdefault(cat, [0, 0])
+                total[0] += 1
+                total[1] += end - start
+
+    @contextmanager
+    def claim(self, claim_id: str) -> Iterator[None]:
+        previous = getattr(self._local, "claim", None)
+        self._local.claim = claim_id
+        start = time.perf_counter_ns()
+        try:
+            with self.span("claim", claim_id):
+                yield
+        finally:
+            self._local.claim = previous
+            with self._lock:
+                self._counters(claim_id)["ns"] += time.perf_counter_ns() - start
+
+    def _counters(self, key: str) -> Dict[str, int]:
+        return self.claims.setdefault(key, {"ns": 0, "files": 0, "bytes": 0})
+
+    def count(self, files: int = 0, nbytes: int = 0) -> None:
+        key = getattr(self._local, "claim", None) or "(run)"
+        with self._lock:
+            counters = self._counters(key)
+            counters["files"] += files
+            counters["bytes"] += nbytes
+
+    def summary_lines(self, top: int = 20) -> List[str]:
+        wall_ns = time.perf_counter_ns() - self._t0
+        lines = [f"profile: wall {wall_ns / 1e6:.1f} ms", f"{'stage':<8} {'calls':>7} {'total ms':>10} {'% wall':>7}"]
+        for cat in self.CATEGORIES:
+            calls, ns = self.totals.get(cat, [0, 0])
+            lines.append(f"{cat:<8} {calls:>7} {ns / 1e6:>10.2f} {100 * ns / wall_ns if wall_ns else 0:>6.1f}%")
+        ranked = sorted(self.claims.items(), key=lambda kv: kv[1]["ns"], reverse=True)
+        lines.append("")
+        lines.append(f"{'claim (slowest first)':<28} {'ms':>8} {'files':>7} {'bytes':>10}")
+        for claim_id, counters in ranked[:top]:
+            lines.append(f"{claim_id:<28} {counters['ns'] / 1e6:>8.2f} {counters['files']:>7} {counters['bytes']:>10}")
+        if len(ranked) > top:
+            lines.append(f"... {len(ranked) - top} more in the trace file")
+        return lines
+
+    def write_trace(self, path: Path) -> None:
+        counters = [
+            {"name": "claim_io", "ph": "C", "ts": 0, "pid": os.getpid(), "args": {"claim": key, **values}}
+            for key, values in sorted(self.claims.items())
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": self.events, "claimCounters": counters, "displayTimeUnit": "ms"}),
+            encoding="utf-8",
+        )
+
+
+_PROFILER: Optional[Profiler] = None
+_NO_SPAN = nullcontext()
+
+
+def _span(cat: str, name: str, **args: Any) -> Any:
+    # Returns a shared no-op context manager unless --profile is active.
+    profiler = _PROFILER
+    return _NO_SPAN if profiler is None else profiler.span(cat, name, args)
+
+
+def _claim_scope(claim_id: str) -> Any:
+    profiler = _PROFILER
+    return _NO_SPAN if profiler is None else profiler.claim(claim_id)
+
+
+def _count_io(files: int = 0, nbytes: int = 0) -> None:
+    profiler = _PROFILER
+    if profiler is not None:
+        profiler.count(files, nbytes)
+
 
+class RepoIndex:
+    """Lazily built, shared view of the repository tree for one verifier run.
 
-def _load_yaml_as_json(path: Path) -> Dict[str, Any]:
+    The tree is walked once (pruning INDEX_IGNORED_DIRS) on first use; every proof/type check and
+    the forbidden-phrase scan then query the in-memory lists instead of calling rglob() again.
+    Paths are repo-relative, "/"-separated and sorted part by part (same order as sorted(Path)).
+    Safe to share between threads.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._files: Optional[List[str]] = None
+        self._dirs: List[str] = []
+        self._by_suffix: Dict[str, List[str]] = {}
+        self._texts: Dict[str, str] = {}
+        self._memo: Dict[str, Any] = {}
+
+    def _build(self) -> List[str]:
+        with self._lock:
+            if self._files is not None:
+                return self._files
+            files: List[str] = []
+            dirs: List[str] = []
+            with _span("index", "walk"):
+                for dirpath, dirnames, filenames in os.walk(self.root):
+                    dirnames[:] = [d for d in dirnames if d not in INDEX_IGNORED_DIRS]
+                    rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+                    prefix = "" if rel_dir == "." else rel_dir + "/"
+                    dirs.extend(prefix + d for d in dirnames)
+                    files.extend(prefix + f for f in filenames)
+                files.sort(key=lambda rel: rel.split("/"))
+                dirs.sort(key=lambda rel: rel.split("/"))
+                for rel in files:
+                    self._by_suffix.setdefault(os.path.splitext(rel)[1].lower(), []).append(rel)
+            _count_io(files=len(files))
+            self._dirs = dirs
+            self._files = files
+            return files
+
+    def files(self) -> List[str]:
+        return self._build()
+
+    def files_with_suffix(self, suffix: str) -> List[str]:
+        self._build()
+        return self._by_suffix.get(suffix.lower(), [])
+
+    def dirs_named(self, name: str) -> List[str]:
+        self._build()
+        return [d for d in self._dirs if d.rsplit("/", 1)[-1] == name]
+
+    def files_under(self, top: str, name_glob: str = "*") -> List[str]:
+        prefix = top.rstrip("/") + "/"
+        return [f for f in self._build() if f.startswith(prefix) and fnmatch(f.rsplit("/", 1)[-1], name_glob)]
+
+    def read_text(self, rel_path: str) -> str:
+        """Decoded file contents (undecodable bytes dropped), read at most once per run."""
+        txt = self._texts.get(rel_path)
+        if txt is None:
+            with _span("io", rel_path):
+                data = (self.root / rel_path).read_bytes()
+            _count_io(files=1, nbytes=len(data))
+            txt = data.decode("utf-8", errors="ignore")
+            self._texts[rel_path] = txt
+        return txt
+
+    def memo(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Per-run memoization for repository-wide facts derived from the index."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+
+def _parse_json_registry(raw: str) -> Dict[str, Any]:
     """The WEB-CLAIMS.yaml file is intentionally JSON (valid YAML 1.2 subset).
 
     This keeps the verifier dependency-free and deterministic.
     """
-    raw = path.read_text(encoding="utf-8")
     try:
         return json.loads(raw)
     except json.JSONDecodeError as e:
         raise SystemExit(f"FAIL: WEB-CLAIMS.yaml must be JSON-compatible YAML. JSON parse error: {e}")
 
 
-def _read_file(rel_path: str) -> str:
-    abs_path = (REPO_ROOT / rel_path).resolve()
-    if not abs_path.exists():
-        raise FileNotFoundError(rel_path)
-    return abs_path.read_text(encoding="utf-8")
+def _enum_or_none(enum_cls: Any, value: str) -> Any:
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return None
+
+
+def parse_claims(doc: Any) -> List[Claim]:
+    """Validate the registry against its schema and build the Claim records.
+
+    Structural problems (wrong types, missing required fields, duplicate ids) are collected and
+    reported together as a SystemExit; unknown enum values are left to the per-claim checks.
+    """
+    errors: List[str] = []
+    if not isinstance(doc, dict):
+        raise SystemExit("FAIL: WEB-CLAIMS.yaml schema: top level must be an object with a 'claims' list")
+    items = doc.get("claims", [])
+    if not isinstance(items, list):
+        raise SystemExit("FAIL: WEB-CLAIMS.yaml schema: 'claims' must be a list")
+
+    claims: List[Claim] = []
+    seen_ids: Set[str] = set()
+    for i, c in enumerate(items):
+        where = f"claims[{i}]"
+        if not isinstance(c, dict):
+            errors.append(f"{where}: must be an object")
+            continue
+        problems: List[str] = []
+        for key in ("id", "page_path", "statement", "claim_type", "required_proof"):
+            if not isinstance(c.get(key), str) or not c[key].strip():
+                problems.append(f"{key} must be a non-empty string")
+        domain = c.get("domain")
+        if domain is not None and not isinstance(domain, str) and not (
+            isinstance(domain, list) and all(isinstance(d, str) for d in domain)
+        ):
+            problems.append("domain must be a string or a list of strings")
+        for key in ("risk_level", "copy_fix"):
+            if key in c and not isinstance(c[key], str):
+                problems.append(f"{key} must be a string")
+        if c.get("ai_pattern") is not None and not isinstance(c["ai_pattern"], dict):
+            problems.append("ai_pattern must be an object")
+        evidence = c.get("evidence") or []
+        if not isinstance(evidence, list) or not all(
+            isinstance(e, str) or (isinstance(e, dict) and isinstance(e.get("path"), str)) for e in evidence
+        ):
+            problems.append("evidence must be a list of paths or {path, description} objects")
+        reproduce = c.get("reproduce") or []
+        if not isinstance(reproduce, list) or not all(isinstance(r, str) for r in reproduce):
+            problems.append("reproduce must be a list of strings")
+        if isinstance(c.get("id"), str):
+            where = f"{where} ({c['id']})"
+            if c["id"] in seen_ids:
+                problems.append("duplicate id")
+            seen_ids.add(c["id"])
+        if problems:
+            errors.extend(f"{where}: {problem}" for problem in problems)
+            continue
+
+        domains = tuple(_coerce_domain(domain))
+        risk_level = str(c.get("risk_level", "medium")).strip() or "medium"
+        claims.append(
+            Claim(
+                id=c["id"],
+                page_path=c["page_path"],
+                statement=c["statement"],
+                claim_type=c["claim_type"],
+                required_proof=c["required_proof"],
+                domain=domains,
+                risk_level=risk_level,
+                ai_pattern=c.get("ai_pattern") or {},
+                evidence_paths=tuple(e if isinstance(e, str) else e["path"] for e in evidence),
+                reproduce=tuple(reproduce),
+                copy_fix=c.get("copy_fix", ""),
+                type_code=_enum_or_none(ClaimType, c["claim_type"]),
+                proof_code=_enum_or_none(ProofKind, c["required_proof"]),
+                risk_code=_enum_or_none(RiskLevel, risk_level),
+                domain_codes=frozenset(d for d in map(functools.partial(_enum_or_none, Domain), domains) if d),
+                digest=_claim_definition_hash(c),
+            )
+        )
+
+    if errors:
+        raise SystemExit("FAIL: WEB-CLAIMS.yaml schema errors:\n" + "\n".join(f"- {e}" for e in errors))
+    return claims
+
+
+def load_claims(path: Path, cache_path: Optional[Path] = None) -> List[Claim]:
+    """Parsed, validated claims of `path`.
 
+    With `cache_path`, the parsed records are stored there as JSON, keyed by the registry bytes and
+    the verifier fingerprint, and reused as long as neither changed (no registry parse or validation).
+    The cache directory is restored by CI, so it is never deserialized with pickle.
+    """
+    with _span("io", path.name):
+        raw = path.read_bytes()
+    key = _sha256_bytes(_verifier_fingerprint().encode("utf-8") + raw)
+    if cache_path is not None:
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            if data.get("key") == key:
+                return [_claim_from_json(row) for row in data["claims"]]
+        except Exception:
+            # Missing, truncated or from an older Claim layout: rebuild below.
+            pass
+
+    claims = parse_claims(_parse_json_registry(raw.decode("utf-8")))
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        payload = {"key": key, "claims": [_claim_to_json(c) for c in claims]}
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, cache_path)
+    return claims
+
+
+def _claim_to_json(c: Claim) -> List[Any]:
+    # Positional row in Claim field order: smaller and faster to rebuild than one object per claim.
+    return [
+        c.id, c.page_path, c.statement, c.claim_type, c.required_proof, c.domain, c.risk_level, c.ai_pattern,
+        c.evidence_paths, c.reproduce, c.copy_fix, c.type_code, c.proof_code, c.risk_code,
+        sorted(c.domain_codes), c.digest,
+    ]
 
-def _statement_present(file_content: str, statement: str) -> bool:
+
+def _claim_from_json(row: List[Any]) -> Claim:
+    (id_, page_path, statement, claim_type, required_proof, domain, risk_level, ai_pattern,
+     evidence_paths, reproduce, copy_fix, type_code, proof_code, risk_code, domain_codes, digest) = row
+    return Claim(
+        id_, page_path, statement, claim_type, required_proof, tuple(domain), risk_level, ai_pattern,
+        tuple(evidence_paths), tuple(reproduce), copy_fix,
+        None if type_code is None else ClaimType(type_code),
+        None if proof_code is None else ProofKind(proof_code),
+        None if risk_code is None else RiskLevel(risk_code),
+        frozenset(map(Domain, domain_codes)), digest,
+    )
+
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def _normalize_ws(s: str) -> str:
     # Deterministic rule with whitespace normalization.
     # We treat any run of whitespace as a single space to avoid false PASS caused by formatting/indentation.
-    def norm(s: str) -> str:
-        s = s.replace("\r\n", "\n")
-        return re.sub(r"\s+", " ", s).strip()
+    s = s.replace("\r\n", "\n")
+    return _WHITESPACE_RUN.sub(" ", s).strip()
 
-    return norm(statement) in norm(file_content)
+
+class PageStore:
+    """Claim pages for one verifier run.
+
+    Each page is read from disk and whitespace-normalized once, however many claims point at it.
+    Statements are registered per page up front, so the first lookup on a page answers every claim
+    on that page in a single batch over the normalized text. Safe to share between threads.
+    """
+
+    def __init__(self, root: Path, claims: Iterable[Claim] = ()) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._page_locks: Dict[str, threading.Lock] = {}
+        self._statements: Dict[str, Set[str]] = {}
+        self._pages: Dict[str, Optional[str]] = {}
+        self._present: Dict[str, Set[str]] = {}
+        for c in claims:
+            self._statements.setdefault(c.page_path, set()).add(_normalize_ws(c.statement))
+
+    def _load(self, rel_path: str) -> Optional[str]:
+        with self._lock:
+            page_lock = self._page_locks.setdefault(rel_path, threading.Lock())
+        with page_lock:
+            if rel_path not in self._pages:
+                abs_path = (self.root / rel_path).resolve()
+                with _span("io", rel_path):
+                    text = abs_path.read_text(encoding="utf-8") if abs_path.exists() else None
+                if _PROFILER is not None:
+                    _count_io(files=1, nbytes=len(text.encode("utf-8")) if text is not None else 0)
+                page = _normalize_ws(text) if text is not None else None
+                # Batch lookup for every statement registered on this page. Plain substring search
+                # (C two-way/SIMD) beat a compiled alternation/trie regex at every size we measured.
+                registered = self._statements.get(rel_path, set())
+                self._present[rel_path] = {st for st in registered if page is not None and st in page}
+                self._pages[rel_path] = page
+            return self._pages[rel_path]
+
+    def statement_present(self, rel_path: str, statement: str) -> bool:
+        """Raises FileNotFoundError if the page does not exist."""
+        page = self._load(rel_path)
+        if page is None:
+            raise FileNotFoundError(rel_path)
+        norm = _normalize_ws(statement)
+        if norm in self._present[rel_path]:
+            return True
+        # Statements that were not registered up front are looked up individually.
+        return norm not in self._statements.get(rel_path, ()) and norm in page
 
 
 def _file_exists(rel_path: str) -> bool:
+    _count_io(files=1)
     return (REPO_ROOT / rel_path).exists()
 
 
-def _has_tests_for_path(rel_path: str) -> bool:
-    # Deterministic and repo-scoped: do NOT count tests inside node_modules/.next.
+def _has_tests_for_path(rel_path: str, index: RepoIndex) -> bool:
+    # Deterministic and repo-scoped: do NOT count tests inside node_modules/.next (pruned by the index).
     # We'll treat any file matching *.test.* or *.spec.* under repo-owned dirs as a test.
-    scan_roots = [
-        REPO_ROOT / "app",
-        REPO_ROOT / "components",
-        REPO_ROOT / "lib",
-        REPO_ROOT / "tools",
-        REPO_ROOT / "scripts",
-    ]
+    def compute() -> bool:
+        return any(
+            index.files_under(root, "*.test.*") or index.files_under(root, "*.spec.*") for root in TEST_SCAN_ROOTS
+        )
+
+    return bool(index.memo("has_tests", compute))
 
-    test_files: List[Path] = []
-    for root in scan_roots:
-        if not root.exists():
-            continue
-        test_files.extend(root.rglob("*.test.*"))
-        test_files.extend(root.rglob("*.spec.*"))
 
-    return len(test_files) > 0
+def _has_migrations(index: RepoIndex) -> bool:
+    return bool(index.memo("has_migrations", lambda: index.dirs_named("migrations") or index.files_with_suffix(".sql")))
 
 
 def _coerce_domain(value: Any) -> List[str]:
@@ -119,30 +643,25 @@ def _coerce_domain(value: Any) -> List[str]:
     return [d.strip() for d in domains if d and str(d).strip()]
 
 
-def _validate_domain_and_risk(claim_id: str, domain: List[str], risk_level: str) -> Tuple[bool, str]:
-    unknown = [d for d in domain if d not in ALLOWED_DOMAINS]
+def _validate_domain_and_risk(claim: Claim) -> Tuple[bool, str]:
+    unknown = [d for d in claim.domain if d not in ALLOWED_DOMAINS]
     if unknown:
         return False, f"unknown domain values: {', '.join(unknown)}"
-    if risk_level not in ALLOWED_RISK_LEVELS:
-        return False, f"unknown risk_level: {risk_level}"
+    if claim.risk_code is None:
+        return False, f"unknown risk_level: {claim.risk_level}"
     return True, "domain/risk validated"
 
 
-def _check_required_proof(required: str, evidence: List[Any], reproduce: List[str]) -> Tuple[bool, str, List[str]]:
-    evidence_paths: List[str] = []
+def _check_required_proof(claim: Claim, index: RepoIndex) -> Tuple[bool, str, List[str]]:
+    required = claim.proof_code
+    evidence_paths = list(claim.evidence_paths)
 
-    for e in evidence:
-        if isinstance(e, dict) and "path" in e:
-            evidence_paths.append(str(e["path"]))
-        elif isinstance(e, str):
-            evidence_paths.append(e)
-
-    if required == "RUNTIME_SMOKE":
-        if reproduce:
+    if required is ProofKind.RUNTIME_SMOKE:
+        if claim.reproduce:
             return True, "RUNTIME_SMOKE defined (commands provided)", evidence_paths
         return False, "missing reproduce commands for RUNTIME_SMOKE", evidence_paths
 
-    if required == "CODE_INVARIANT":
+    if required is ProofKind.CODE_INVARIANT:
         if not evidence_paths:
             return False, "missing evidence paths for CODE_INVARIANT", evidence_paths
         missing = [p for p in evidence_paths if not _file_exists(p)]
@@ -150,64 +669,69 @@ def _check_required_proof(required: str, evidence: List[Any], reproduce: List[st
             return False, f"evidence paths not found: {', '.join(missing)}", evidence_paths
         return True, "CODE_INVARIANT evidence paths exist", evidence_paths
 
-    if required in {"DOC", "ADR"}:
+    if required in {ProofKind.DOC, ProofKind.ADR}:
         if not evidence_paths:
-            return False, f"missing evidence paths for {required}", evidence_paths
+            return False, f"missing evidence paths for {claim.required_proof}", evidence_paths
         missing = [p for p in evidence_paths if not _file_exists(p)]
         if missing:
             return False, f"evidence paths not found: {', '.join(missing)}", evidence_paths
         non_md = [p for p in evidence_paths if not str(p).lower().endswith(".md")]
         if non_md:
-            return False, f"{required} evidence must be markdown (.md): {', '.join(non_md)}", evidence_paths
-        return True, f"{required} evidence paths exist", evidence_paths
+            return False, f"{claim.required_proof} evidence must be markdown (.md): {', '.join(non_md)}", evidence_paths
+        return True, f"{claim.required_proof} evidence paths exist", evidence_paths
 
-    if required == "DB_MIGRATION":
+    if required is ProofKind.DB_MIGRATION:
         # Look for migrations folder and RLS enabling patterns.
-        migrations = list(REPO_ROOT.rglob("migrations")) + list(REPO_ROOT.rglob("*.sql"))
-        if not migrations:
+        if not _has_migrations(index):
             return False, "no migrations/sql files found for DB_MIGRATION", evidence_paths
         return True, "DB_MIGRATION: migrations/sql detected", evidence_paths
 
-    if required == "TEST":
-        if not _has_tests_for_path("/"):
+    if required is ProofKind.TEST:
+        if not _has_tests_for_path("/", index):
             return False, "no automated tests found in repository for TEST proof", evidence_paths
         return True, "tests detected", evidence_paths
 
-    return False, f"unknown required_proof: {required}", evidence_paths
+    return False, f"unknown required_proof: {claim.required_proof}", evidence_paths
+
+
+def _rls_evidence_path(index: RepoIndex) -> Optional[str]:
+    def compute() -> Optional[str]:
+        for rel in index.files_with_suffix(".sql"):
+            txt = index.read_text(rel)
+            if all(rx.search(txt) for rx in RLS_SQL_PATTERNS):
+                return rel
+        return None
 
+    return index.memo("rls_evidence_path", compute)
 
-def _type_specific_checks(claim_type: str, statement: str, evidence_paths: List[str]) -> Tuple[bool, str]:
+
+def _type_specific_checks(claim: Claim, evidence_paths: List[str], index: RepoIndex) -> Tuple[bool, str]:
     # Minimal objective checks based on repository structure.
     # The intent is to FAIL unless the repository contains concrete implementation artifacts.
+    claim_type = claim.type_code
 
-    if claim_type == "RLS":
+    if claim_type is ClaimType.RLS:
         # We require explicit Postgres RLS policy enablement somewhere.
-        patterns = [
-            re.compile(r"ENABLE\s+ROW\s+LEVEL\s+SECURITY", re.IGNORECASE),
-            re.compile(r"CREATE\s+POLICY", re.IGNORECASE),
-        ]
-        for p in REPO_ROOT.rglob("*.sql"):
-            txt = p.read_text(encoding="utf-8", errors="ignore")
-            if all(rx.search(txt) for rx in patterns):
-                return True, f"RLS evidence found in {p.relative_to(REPO_ROOT)}"
+        rls_path = _rls_evidence_path(index)
+        if rls_path:
+            return True, f"RLS evidence found in {rls_path}"
         return False, "RLS requires SQL migrations with ENABLE ROW LEVEL SECURITY + policies"
 
-    if claim_type == "SIGNATURE":
+    if claim_type is ClaimType.SIGNATURE:
         # Only pass if there's signature verification code (not just copy).
         # This repo has no signature verification implementation.
         return False, "SIGNATURE claim requires real signature validation implementation + tests"
 
-    if claim_type in {"AI", "AI_ASSISTIVE", "AI_GUARDRAIL"}:
+    if claim_type in AI_CLAIM_TYPES:
         # AI-related claims must be backed by explicit documentation at minimum.
         if not evidence_paths:
             return False, "AI claim requires documentation/ADR evidence paths"
         return True, "AI claim: documentation evidence provided"
 
-    if claim_type in {"ENFORCEMENT", "EVIDENCE", "TEMPORAL_VERSIONING", "EXPORT", "PRIVACY_OPERATION"}:
-        # These require backing code; by default we don't assume it exists.
+    if claim_type in UNCHECKED_CLAIM_TYPES:
         return True, "no additional type-specific checks applied"
 
-    return False, f"unknown claim_type: {claim_type}"
+    return False, f"unknown claim_type: {claim.claim_type}"
 
 
 def _ai_claim_guardrail_checks(statement: str, ai_pattern: Dict[str, Any]) -> Tuple[bool, str]:
@@ -220,250 +744,877 @@ def _ai_claim_guardrail_checks(statement: str, ai_pattern: Dict[str, Any]) -> Tu
     if not human_in_the_loop:
         return False, "ai_pattern.human_in_the_loop must be true for domain=ai"
 
-    for rx in FORBIDDEN_AI_PHRASES:
-        if rx.search(statement):
-            return False, f"forbidden AI overclaim phrase in statement: {rx.pattern}"
+    matches = _find_forbidden_phrases(statement)
+    if matches:
+        phrase = FORBIDDEN_AI_PHRASES[matches[0].pattern_index].pattern
+        return False, f"forbidden AI overclaim phrase in statement: {phrase}"
 
     return True, "AI guardrails validated"
 
 
-def _scan_forbidden_ai_phrases() -> List[ClaimResult]:
-    # Scan repo-owned web copy sources for forbidden phrases.
-    scan_patterns = [
-        (REPO_ROOT / "app", "**/*.ts*"),
-        (REPO_ROOT / "components", "**/*.ts*"),
-        (REPO_ROOT / "content", "**/*.md*"),
-    ]
-
-    results: List[ClaimResult] = []
-    idx = 1
+def _find_forbidden_phrases(text: str) -> List[PhraseMatch]:
+    # One pass over the text for all phrases; line/column are 1-based and only computed on hits.
+    matches: List[PhraseMatch] = []
+    for m in FORBIDDEN_AI_MATCHER.finditer(text):
+        name = m.lastgroup or ""
+        start = m.start(name)
+        matches.append(
+            PhraseMatch(
+                pattern_index=int(name[1:]),
+                text=m.group(name),
+                line=text.count("\n", 0, start) + 1,
+                column=start - text.rfind("\n", 0, start),
+            )
+        )
+    return matches
 
-    for root, glob in scan_patterns:
-        if not root.exists():
-            continue
-        for p in root.glob(glob):
-            if p.is_dir():
-                continue
-            txt = p.read_text(encoding="utf-8", errors="ignore")
-            for rx in FORBIDDEN_AI_PHRASES:
-                m = rx.search(txt)
-                if not m:
-                    continue
-                rel = str(p.relative_to(REPO_ROOT)).replace("\\", "/")
-                results.append(
-                    ClaimResult(
-                        claim_id=f"WEB-AI-FORBIDDEN-{idx:03d}",
-                        page_path=rel,
-                        statement=m.group(0),
-                        domain=["ai"],
-                        risk_level="high",
-                        ai_pattern={"assistive_only": True, "human_in_the_loop": True, "explainability_required": True},
-                        status="FAIL",
-                        reason="forbidden AI overclaim phrase found in public web copy",
-                        evidence_paths=[],
-                        reproduce=[],
-                        copy_fix=(
-                            "Remover a afirmação e reescrever como IA assistiva (não decisória), com revisão humana registrada. "
-                            "Evitar promessas como 'sem viés'/'sem erro' e qualquer linguagem de decisão automática."
-                        ),
-                    )
-                )
-                idx += 1
 
-    return results
+def _scan_file(abs_path: str) -> List[PhraseMatch]:
+    # Top-level (picklable) so it can run in a worker process.
+    return _find_forbidden_phrases(Path(abs_path).read_text(encoding="utf-8", errors="ignore"))
 
 
-def verify_claims() -> List[ClaimResult]:
-    data = _load_yaml_as_json(CLAIMS_PATH)
-    claims = data.get("claims", [])
+def _imap_in_order(fn: Callable[[T], R], items: Iterable[T], jobs: int, processes: bool = False) -> Iterator[R]:
+    """Lazy map() that fans out to a pool when jobs > 1; results are yielded in input order.
 
-    results: List[ClaimResult] = []
+    Closing the iterator early (e.g. --fail-fast) cancels work that has not started yet.
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    pool = pool_cls(max_workers=min(jobs, len(items)))
+    try:
+        yield from pool.map(fn, items)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _map_in_order(fn: Callable[[T], R], items: Iterable[T], jobs: int, processes: bool = False) -> List[R]:
+    """map() that fans out to a pool when jobs > 1; results always come back in input order."""
+    return list(_imap_in_order(fn, items, jobs, processes))
+
+
+def _forbidden_phrase_matches(
+    rels: List[str],
+    index: RepoIndex,
+    cache: Optional["ResultCache"],
+    jobs: int,
+    reuse: Optional[Dict[str, List[PhraseMatch]]] = None,
+) -> List[List[PhraseMatch]]:
+    # Baseline/cache lookups stay in this process; only misses are scanned, in worker processes
+    # when jobs > 1 (regex scanning holds the GIL, so threads would not add throughput here).
+    found: List[Optional[List[PhraseMatch]]] = [(reuse or {}).get(rel) for rel in rels]
+    digests: List[Optional[str]] = [None] * len(rels)
+    if cache is not None:
+        for i, rel in enumerate(rels):
+            if found[i] is not None:
+                continue
+            digests[i] = cache.file_digest(index, rel)
+            found[i] = cache.get_scan(digests[i]) if digests[i] else None
 
-    # Global AI-first safeguard: forbidden phrases must not exist anywhere.
-    results.extend(_scan_forbidden_ai_phrases())
+    misses = [i for i, m in enumerate(found) if m is None]
+    if jobs > 1:
+        with _span("scan", "worker pool", files=len(misses), jobs=jobs):
+            scanned = _map_in_order(_scan_file, [str(index.root / rels[i]) for i in misses], jobs, processes=True)
+    else:
+        scanned = []
+        for i in misses:
+            text = index.read_text(rels[i])
+            with _span("scan", rels[i]):
+                scanned.append(_find_forbidden_phrases(text))
+
+    for i, matches in zip(misses, scanned):
+        found[i] = matches
+        digest = digests[i]
+        if cache is not None and digest:
+            cache.put_scan(digest, matches)
+    return [m or [] for m in found]
+
+
+def _copy_files(index: RepoIndex) -> List[str]:
+    # Index order is sorted, which keeps WEB-AI-FORBIDDEN-* numbering stable across filesystems.
+    return [rel for root, name_glob in COPY_SCAN_PATTERNS for rel in index.files_under(root, name_glob)]
+
+
+def _scan_forbidden_ai_phrases(
+    index: RepoIndex,
+    cache: Optional["ResultCache"] = None,
+    jobs: int = 1,
+    reuse: Optional["RunSnapshot"] = None,
+    snapshot: Optional["RunSnapshot"] = None,
+) -> List[ClaimResult]:
+    # Scan repo-owned web copy sources for forbidden phrases.
+    rels = _copy_files(index)
+    per_file = _forbidden_phrase_matches(rels, index, cache, jobs, reuse.forbidden if reuse else None)
+    if snapshot is not None:
+        snapshot.forbidden.update(zip(rels, per_file))
 
-    for c in claims:
-        claim_id = str(c.get("id"))
-        page_path = str(c.get("page_path"))
-        statement = str(c.get("statement"))
-        claim_type = str(c.get("claim_type"))
-        required_proof = str(c.get("required_proof"))
-        evidence = c.get("evidence", []) or []
-        reproduce = c.get("reproduce", []) or []
-        copy_fix = str(c.get("copy_fix", ""))
-
-        domain = _coerce_domain(c.get("domain", []))
-        risk_level = str(c.get("risk_level", "medium")).strip() or "medium"
-        ai_pattern = c.get("ai_pattern", {}) or {}
-        if not isinstance(ai_pattern, dict):
-            ai_pattern = {"value": ai_pattern}
+    results: List[ClaimResult] = []
+    idx = 1
 
-        ok_meta, meta_reason = _validate_domain_and_risk(claim_id, domain, risk_level)
-        if not ok_meta:
+    for rel, matches in zip(rels, per_file):
+        for m in matches:
             results.append(
                 ClaimResult(
-                    claim_id=claim_id,
-                    page_path=page_path,
-                    statement=statement,
-                    domain=domain,
-                    risk_level=risk_level,
-                    ai_pattern=ai_pattern,
+                    claim_id=f"WEB-AI-FORBIDDEN-{idx:03d}",
+                    page_path=rel,
+                    statement=m.text,
+                    domain=["ai"],
+                    risk_level="high",
+                    ai_pattern={"assistive_only": True, "human_in_the_loop": True, "explainability_required": True},
                     status="FAIL",
-                    reason=meta_reason,
+                    reason=f"forbidden AI overclaim phrase found in public web copy (line {m.line}, col {m.column})",
                     evidence_paths=[],
-                    reproduce=reproduce,
-                    copy_fix=copy_fix or "(copy_fix required)",
+                    reproduce=[],
+                    copy_fix=(
+                        "Remover a afirmação e reescrever como IA assistiva (não decisória), com revisão humana registrada. "
+                        "Evitar promessas como 'sem viés'/'sem erro' e qualquer linguagem de decisão automática."
+                    ),
+                    line=m.line,
+                    column=m.column,
                 )
             )
-            continue
+            idx += 1
 
-        try:
-            file_content = _read_file(page_path)
-        except FileNotFoundError:
-            results.append(
-                ClaimResult(
-                    claim_id=claim_id,
-                    page_path=page_path,
-                    statement=statement,
-                    domain=domain,
-                    risk_level=risk_level,
-                    ai_pattern=ai_pattern,
-                    status="FAIL",
-                    reason="page_path not found",
-                    evidence_paths=[],
-                    reproduce=reproduce,
-                    copy_fix=copy_fix or "(copy_fix required)",
-                )
-            )
-            continue
+    return results
 
-        if not _statement_present(file_content, statement):
-            # Deterministic rule: if the exact overclaim statement is no longer present, the claim is resolved.
-            results.append(
-                ClaimResult(
-                    claim_id=claim_id,
-                    page_path=page_path,
-                    statement=statement,
-                    domain=domain,
-                    risk_level=risk_level,
-                    ai_pattern=ai_pattern,
-                    status="PASS",
-                    reason="statement not found (removed/changed in source)",
-                    evidence_paths=[],
-                    reproduce=reproduce,
-                    copy_fix=copy_fix,
-                )
-            )
-            continue
 
-        ok_proof, proof_reason, evidence_paths = _check_required_proof(required_proof, evidence, reproduce)
-        ok_type, type_reason = _type_specific_checks(claim_type, statement, evidence_paths)
+def _evaluate_claim(claim: Claim, index: RepoIndex, pages: PageStore) -> ClaimResult:
+    claim_id = claim.id
+    domain = list(claim.domain)
+    reproduce = list(claim.reproduce)
+    copy_fix = claim.copy_fix
+
+    def result(status: str, reason: str, evidence_paths: List[str], copy_fix: str) -> ClaimResult:
+        return ClaimResult(
+            claim_id=claim_id,
+            page_path=claim.page_path,
+            statement=claim.statement,
+            domain=domain,
+            risk_level=claim.risk_level,
+            ai_pattern=claim.ai_pattern,
+            status=status,
+            reason=reason,
+            evidence_paths=evidence_paths,
+            reproduce=reproduce,
+            copy_fix=copy_fix,
+        )
 
-        ok_ai = True
-        ai_reason: Optional[str] = None
-        if "ai" in domain:
-            ok_ai, ai_reason = _ai_claim_guardrail_checks(statement, ai_pattern)
+    ok_meta, meta_reason = _validate_domain_and_risk(claim)
+    if not ok_meta:
+        return result("FAIL", meta_reason, [], copy_fix or "(copy_fix required)")
 
-        if ok_proof and ok_type and ok_ai:
-            status = "PASS"
-            reason = "; ".join([r for r in [proof_reason, type_reason, ai_reason] if r])
-        else:
-            status = "FAIL"
-            reason = "; ".join(
-                [
-                    r
-                    for r in [
-                        proof_reason if not ok_proof else None,
-                        type_reason if not ok_type else None,
-                        ai_reason if ("ai" in domain and not ok_ai) else None,
-                    ]
-                    if r
+    try:
+        statement_present = pages.statement_present(claim.page_path, claim.statement)
+    except FileNotFoundError:
+        return result("FAIL", "page_path not found", [], copy_fix or "(copy_fix required)")
+
+    if not statement_present:
+        # Deterministic rule: if the exact overclaim statement is no longer present, the claim is resolved.
+        return result("PASS", "statement not found (removed/changed in source)", [], copy_fix)
+
+    with _span("proof", claim.required_proof):
+        ok_proof, proof_reason, evidence_paths = _check_required_proof(claim, index)
+    with _span("type", claim.claim_type):
+        ok_type, type_reason = _type_specific_checks(claim, evidence_paths, index)
+
+    ok_ai = True
+    ai_reason: Optional[str] = None
+    is_ai = Domain.AI in claim.domain_codes
+    if is_ai:
+        with _span("ai", claim_id):
+            ok_ai, ai_reason = _ai_claim_guardrail_checks(claim.statement, claim.ai_pattern)
+
+    if ok_proof and ok_type and ok_ai:
+        status = "PASS"
+        reason = "; ".join([r for r in [proof_reason, type_reason, ai_reason] if r])
+    else:
+        status = "FAIL"
+        reason = "; ".join(
+            [
+                r
+                for r in [
+                    proof_reason if not ok_proof else None,
+                    type_reason if not ok_type else None,
+                    ai_reason if (is_ai and not ok_ai) else None,
                 ]
-            )
+                if r
+            ]
+        )
 
-        if status == "FAIL" and not copy_fix:
-            copy_fix = "(copy_fix required)"
+    if status == "FAIL" and not copy_fix:
+        copy_fix = "(copy_fix required)"
 
-        results.append(
-            ClaimResult(
-                claim_id=claim_id,
-                page_path=page_path,
-                statement=statement,
-                domain=domain,
-                risk_level=risk_level,
-                ai_pattern=ai_pattern,
-                status=status,
-                reason=reason,
-                evidence_paths=evidence_paths,
-                reproduce=reproduce,
-                copy_fix=copy_fix,
-            )
+    return result(status, reason, evidence_paths, copy_fix)
+
+
+@functools.lru_cache(maxsize=None)
+def _verifier_fingerprint() -> str:
+    return _sha256_bytes(VERIFIER_VERSION.encode("utf-8") + Path(__file__).read_bytes())
+
+
+def _claim_definition_hash(c: Dict[str, Any]) -> str:
+    return _sha256_bytes(json.dumps(c, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+class ResultCache:
+    """On-disk, content-addressed cache of verifier results.
+
+    Entries are keyed by sha256 of the inputs that determine them (file bytes, claim definition,
+    repository facts consulted by the proof/type checks) and the whole cache is discarded when the
+    verifier fingerprint (VERIFIER_VERSION + this file's source) changes. A stat cache
+    (size, mtime_ns) avoids re-hashing files that have not been touched since the last run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.fingerprint = _verifier_fingerprint()
+        self._written_at_ns = 0
+        self._stat: Dict[str, List[Any]] = {}
+        self._scan: Dict[str, List[List[Any]]] = {}
+        self._claims: Dict[str, Dict[str, Any]] = {}
+        self._used_scan: Dict[str, List[List[Any]]] = {}
+        self._used_claims: Dict[str, Dict[str, Any]] = {}
+        self._used_stat: Dict[str, List[Any]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "ResultCache":
+        cache = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if not isinstance(data, dict) or data.get("fingerprint") != cache.fingerprint:
+            return cache
+        cache._written_at_ns = int(data.get("written_at_ns", 0))
+        cache._stat = data.get("stat", {}) or {}
+        cache._scan = data.get("scan", {}) or {}
+        cache._claims = data.get("claims", {}) or {}
+        return cache
+
+    def save(self, prune: bool = True) -> None:
+        # Only entries touched in this run are kept, so the file does not grow without bound.
+        # An interrupted run (--fail-fast) did not touch everything: keep the rest (prune=False).
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "fingerprint": self.fingerprint,
+            "written_at_ns": time.time_ns(),
+            "stat": self._used_stat if prune else {**self._stat, **self._used_stat},
+            "scan": self._used_scan if prune else {**self._scan, **self._used_scan},
+            "claims": self._used_claims if prune else {**self._claims, **self._used_claims},
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def file_digest(self, index: RepoIndex, rel_path: str) -> Optional[str]:
+        """sha256 of a file's bytes under index.root (the tree being scanned), or None if it does not exist."""
+        abs_path = index.root / rel_path
+        try:
+            st = abs_path.stat()
+        except OSError:
+            return None
+        entry = self._stat.get(rel_path)
+        # Racy-clean guard (as in git): an mtime at/after the last save may hide a same-size edit.
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns and st.st_mtime_ns < self._written_at_ns:
+            digest = str(entry[2])
+        else:
+            try:
+                with _span("cache", rel_path):
+                    data = abs_path.read_bytes()
+                    digest = _sha256_bytes(data)
+            except OSError:
+                return None
+            _count_io(files=1, nbytes=len(data))
+        self._stat[rel_path] = self._used_stat[rel_path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def get_scan(self, digest: str) -> Optional[List[PhraseMatch]]:
+        rows = self._scan.get(digest)
+        if rows is None:
+            return None
+        self._used_scan[digest] = rows
+        return [PhraseMatch(*row) for row in rows]
+
+    def put_scan(self, digest: str, matches: List[PhraseMatch]) -> None:
+        rows = [[m.pattern_index, m.text, m.line, m.column] for m in matches]
+        self._scan[digest] = self._used_scan[digest] = rows
+
+    def get_claim(self, key: str) -> Optional[ClaimResult]:
+        entry = self._claims.get(key)
+        if entry is None:
+            return None
+        self._used_claims[key] = entry
+        return ClaimResult(**entry)
+
+    def put_claim(self, key: str, result: ClaimResult) -> None:
+        self._claims[key] = self._used_claims[key] = asdict(result)
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _claim_cache_key(c: Claim, cache: ResultCache, index: RepoIndex) -> str:
+    inputs: Dict[str, Any] = {
+        "verifier": cache.fingerprint,
+        "claim": c.digest,
+        "page": cache.file_digest(index, c.page_path),
+        "evidence": [[p, _file_exists(p)] for p in c.evidence_paths],
+    }
+    if c.proof_code is ProofKind.DB_MIGRATION:
+        inputs["has_migrations"] = _has_migrations(index)
+    if c.proof_code is ProofKind.TEST:
+        inputs["has_tests"] = _has_tests_for_path("/", index)
+    if c.type_code is ClaimType.RLS:
+        inputs["sql"] = index.memo(
+            "sql_digest", lambda: [[rel, cache.file_digest(index, rel)] for rel in index.files_with_suffix(".sql")]
         )
+    blob = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+    return _sha256_bytes(blob.encode("utf-8"))
 
-    return results
 
+@dataclass
+class RunSnapshot:
+    """Per-file forbidden-phrase matches and per-claim results of one run.
+
+    Persisted as the --since baseline; claims are keyed by the hash of their definition, so an
+    edited claim never picks up a stale result.
+    """
+
+    forbidden: Dict[str, List[PhraseMatch]] = field(default_factory=dict)
+    claims: Dict[str, ClaimResult] = field(default_factory=dict)
 
-def write_report(results: List[ClaimResult]) -> None:
-    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    lines: List[str] = []
-    lines.append("# WEB-CLAIMS-REPORT")
-    lines.append("")
-    lines.append("Relatório público e determinístico de claims do site (anti-overclaim).")
-    lines.append("")
-    lines.append("## Fontes (TAREFA 0)")
-    lines.append("")
-    lines.append("- components/platform/PlatformHero.tsx (\"Detalhamento Técnico da Plataforma\")")
-    lines.append("- components/platform/ModulesDetail.tsx (\"Gestão de Processos Administrativos\" e módulos)")
-    lines.append("- content/blog/regras-sem-enforcement-sao-invalidas.md (artigo do blog)")
-    lines.append("- app/politica-privacidade/page.tsx (Política de Privacidade)")
-    lines.append("- app/sobre/page.tsx (Sobre)")
-    lines.append("")
-
-    lines.append("## Inventário (PASS/FAIL)")
-    lines.append("")
-    lines.append("| Claim ID | Página | Domínio | Risco | Statement | PASS/FAIL | Evidências (paths) | Como reproduzir | Copy fix (se FAIL) |")
-    lines.append("|---|---|---|---|---|---|---|---|---|")
 
+def _git(*args: str) -> str:
+    try:
+        proc = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        detail = getattr(e, "stderr", "") or str(e)
+        raise SystemExit(f"FAIL: git {' '.join(args)}: {detail.strip()}")
+    return proc.stdout
+
+
+def _git_has_commit(ref: str) -> bool:
+    """Whether `ref` names a commit in this clone (not the case in shallow clones or after a rebase)."""
+    proc = subprocess.run(
+        ["git", "cat-file", "-e", f"{ref}^{{commit}}"], cwd=REPO_ROOT, capture_output=True, check=False
+    )
+    return proc.returncode == 0
+
+
+def _git_changed_files(ref: str) -> Set[str]:
+    """Files that differ between `ref` and the working tree (staged, unstaged and untracked)."""
+    changed = set(_git("diff", "--name-only", "--no-renames", "-z", ref, "--").split("\0"))
+    changed.update(_git("ls-files", "--others", "--exclude-standard", "-z").split("\0"))
+    changed.discard("")
+    return changed
+
+
+def save_baseline(path: Path, snapshot: RunSnapshot) -> None:
+    # The commit + dirty file list let a later --since run also cover edits made after this baseline.
+    payload = {
+        "fingerprint": _verifier_fingerprint(),
+        "commit": _git("rev-parse", "HEAD").strip(),
+        "dirty": sorted(_git_changed_files("HEAD")),
+        "forbidden": {
+            rel: [[m.pattern_index, m.text, m.line, m.column] for m in matches]
+            for rel, matches in snapshot.forbidden.items()
+        },
+        "claims": {key: asdict(result) for key, result in snapshot.claims.items()},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+
+
+def _claim_touched(c: Claim, changed: Set[str]) -> bool:
+    # Mirrors the inputs of _evaluate_claim: page, evidence paths and the repo-wide facts
+    # consulted by the DB_MIGRATION / TEST proofs and the RLS type check.
+    if changed.intersection((c.page_path, *c.evidence_paths)):
+        return True
+    if c.proof_code is ProofKind.DB_MIGRATION or c.type_code is ClaimType.RLS:
+        if any(p.endswith(".sql") or "migrations/" in f"/{p}" for p in changed):
+            return True
+    if c.proof_code is ProofKind.TEST:
+        names = [p.rsplit("/", 1)[-1] for p in changed]
+        if any(fnmatch(n, "*.test.*") or fnmatch(n, "*.spec.*") for n in names):
+            return True
+    return False
+
+
+def load_since_scope(path: Path, ref: str, claims: List[Claim]) -> Tuple[Optional[RunSnapshot], Set[str]]:
+    """Baseline results still valid after the changes since `ref`, plus the changed-file set.
+
+    Returns (None, changed) when there is no usable baseline (missing, written by another verifier
+    version, or recorded at a commit this clone does not have); the caller then falls back to a
+    full run.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = None
+
+    changed = _git_changed_files(ref)
+    if not isinstance(data, dict) or data.get("fingerprint") != _verifier_fingerprint():
+        return None, changed
+
+    # Files touched since the baseline was written count as changed too, whatever `ref` is.
+    stale = set(changed)
+    stale.update(data.get("dirty", []))
+    if data.get("commit"):
+        if not _git_has_commit(str(data["commit"])):
+            return None, changed
+        stale.update(_git_changed_files(str(data["commit"])))
+
+    reuse = RunSnapshot()
+    for rel, rows in (data.get("forbidden") or {}).items():
+        if rel not in stale:
+            reuse.forbidden[rel] = [PhraseMatch(*row) for row in rows]
+    baseline_claims = data.get("claims") or {}
+    for c in claims:
+        if c.digest in baseline_claims and not _claim_touched(c, stale):
+            reuse.claims[c.digest] = ClaimResult(**baseline_claims[c.digest])
+    return reuse, changed
+
+
+def iter_claims(
+    cache: Optional[ResultCache] = None,
+    index: Optional[RepoIndex] = None,
+    jobs: int = 1,
+    reuse: Optional[RunSnapshot] = None,
+    snapshot: Optional[RunSnapshot] = None,
+    claims: Optional[List[Claim]] = None,
+) -> Iterator[ClaimResult]:
+    """Yield each result as soon as it is known, in report order; see verify_claims().
+
+    The returned iterator's ``pending`` attribute is the number of results still to come once the
+    forbidden-phrase scan is done (None before that), so run_sinks() can tell a --fail-fast stop
+    from the end of the run.
+    """
+    return _ResultStream(lambda stream: _produce_claims(stream, cache, index, jobs, reuse, snapshot, claims))
+
+
+class _ResultStream(Iterator[ClaimResult]):
+    def __init__(self, produce: Callable[["_ResultStream"], Iterator[ClaimResult]]) -> None:
+        self.pending: Optional[int] = None  # counted down by the producer
+        self._it = produce(self)
+
+    def __next__(self) -> ClaimResult:
+        return next(self._it)
+
+    def close(self) -> None:
+        self._it.close()  # type: ignore[attr-defined]
+
+
+def _produce_claims(
+    stream: _ResultStream,
+    cache: Optional[ResultCache],
+    index: Optional[RepoIndex],
+    jobs: int,
+    reuse: Optional[RunSnapshot],
+    snapshot: Optional[RunSnapshot],
+    claims: Optional[List[Claim]],
+) -> Iterator[ClaimResult]:
+    if claims is None:
+        claims = load_claims(CLAIMS_PATH)
+    index = index or RepoIndex(REPO_ROOT)
+    pages = PageStore(index.root, claims)
+
+    # Global AI-first safeguard: forbidden phrases must not exist anywhere.
+    forbidden = _scan_forbidden_ai_phrases(index, cache, jobs, reuse, snapshot)
+    stream.pending = len(forbidden) + len(claims)
+    for result in forbidden:
+        stream.pending -= 1
+        yield result
+
+    def evaluate(c: Claim) -> ClaimResult:
+        if reuse is not None:
+            reused = reuse.claims.get(c.digest)
+            if reused is not None:
+                return reused
+        with _claim_scope(c.id):
+            if cache is None:
+                return _evaluate_claim(c, index, pages)
+            key = _claim_cache_key(c, cache, index)
+            result = cache.get_claim(key)
+            if result is None:
+                result = _evaluate_claim(c, index, pages)
+                cache.put_claim(key, result)
+            return result
+
+    # Claim checks are mostly file reads/stats against the shared index: threads are enough.
+    # Build the index up front so workers do not queue on its lock.
+    index.files()
+    for c, result in zip(claims, _imap_in_order(evaluate, claims, jobs)):
+        if snapshot is not None:
+            snapshot.claims[c.digest] = result
+        stream.pending -= 1
+        yield result
+
+
+def verify_claims(
+    cache: Optional[ResultCache] = None,
+    index: Optional[RepoIndex] = None,
+    jobs: int = 1,
+    reuse: Optional[RunSnapshot] = None,
+    snapshot: Optional[RunSnapshot] = None,
+    claims: Optional[List[Claim]] = None,
+) -> List[ClaimResult]:
+    """Evaluate every claim; with jobs > 1 the work is spread over a pool, order is unchanged.
+
+    `reuse` supplies results known to be unaffected (the --since baseline); `snapshot`, when
+    given, is filled with this run's per-file matches and per-claim results. `claims` defaults
+    to load_claims(CLAIMS_PATH).
+    """
+    return list(iter_claims(cache, index, jobs, reuse, snapshot, claims))
+
+
+_REPORT_HEADER = [
+    "# WEB-CLAIMS-REPORT",
+    "",
+    "Relatório público e determinístico de claims do site (anti-overclaim).",
+    "",
+    "## Fontes (TAREFA 0)",
+    "",
+    "- components/platform/PlatformHero.tsx (\"Detalhamento Técnico da Plataforma\")",
+    "- components/platform/ModulesDetail.tsx (\"Gestão de Processos Administrativos\" e módulos)",
+    "- content/blog/regras-sem-enforcement-sao-invalidas.md (artigo do blog)",
+    "- app/politica-privacidade/page.tsx (Política de Privacidade)",
+    "- app/sobre/page.tsx (Sobre)",
+    "",
+    "## Inventário (PASS/FAIL)",
+    "",
+    "| Claim ID | Página | Domínio | Risco | Statement | PASS/FAIL | Evidências (paths) | Como reproduzir | Copy fix (se FAIL) |",
+    "|---|---|---|---|---|---|---|---|---|",
+]
+
+_REPORT_FOOTER = [
+    "",
+    "## Execução",
+    "",
+    "```bash",
+    "python tools/claims/verify_web_claims.py",
+    "```",
+    "",
+]
+
+
+def _report_row(r: ClaimResult) -> str:
     def esc(s: str) -> str:
         return s.replace("\n", " ").replace("|", "\\|").strip()
 
-    for r in results:
-        ev = ", ".join(r.evidence_paths) if r.evidence_paths else ""
-        rep = " / ".join(r.reproduce) if r.reproduce else ""
-        fix = r.copy_fix if r.status == "FAIL" else ""
-        dom = ",".join(r.domain) if r.domain else ""
-        lines.append(
-            f"| {esc(r.claim_id)} | {esc(r.page_path)} | {esc(dom)} | {esc(r.risk_level)} | {esc(r.statement)} | {esc(r.status)} | {esc(ev)} | {esc(rep)} | {esc(fix)} |"
+    ev = ", ".join(r.evidence_paths) if r.evidence_paths else ""
+    rep = " / ".join(r.reproduce) if r.reproduce else ""
+    fix = r.copy_fix if r.status == "FAIL" else ""
+    dom = ",".join(r.domain) if r.domain else ""
+    return f"| {esc(r.claim_id)} | {esc(r.page_path)} | {esc(dom)} | {esc(r.risk_level)} | {esc(r.statement)} | {esc(r.status)} | {esc(ev)} | {esc(rep)} | {esc(fix)} |"
+
+
+def _is_blocking(result: ClaimResult) -> bool:
+    return result.status == "FAIL" and result.risk_level == "high"
+
+
+class ResultSink(abc.ABC):
+    """Receives results one at a time while the run is in progress."""
+
+    @abc.abstractmethod
+    def add(self, result: ClaimResult) -> None:
+        """Called once per result, in report order."""
+
+    def close(self, complete: bool) -> None:
+        """`complete` is False when the run stopped early (--fail-fast)."""
+
+
+class MarkdownReport(ResultSink):
+    """WEB-CLAIMS-REPORT.md, streamed to a temp file and swapped in only for complete runs."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._tmp = path.with_suffix(path.suffix + ".tmp")
+        self._fh = self._tmp.open("w", encoding="utf-8")
+        self._write(_REPORT_HEADER)
+
+    def _write(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self._fh.write(line + "\n")
+
+    def add(self, result: ClaimResult) -> None:
+        self._write([_report_row(result)])
+
+    def close(self, complete: bool) -> None:
+        if complete:
+            self._write(_REPORT_FOOTER)
+        self._fh.close()
+        if complete:
+            os.replace(self._tmp, self.path)
+        else:
+            # A partial table must never replace the published evidence report.
+            self._tmp.unlink()
+
+
+class JsonLinesReport(ResultSink):
+    """One JSON object per ClaimResult, flushed as it is produced."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+
+    def add(self, result: ClaimResult) -> None:
+        self._stream.write(json.dumps(asdict(result), ensure_ascii=False, sort_keys=True) + "\n")
+        self._stream.flush()
+
+    def close(self, complete: bool) -> None:
+        self._stream.flush()
+
+
+class SarifReport(ResultSink):
+    """SARIF 2.1.0 log; the results array is written incrementally and the document closed at the end."""
+
+    RULES = [
+        {
+            "id": "WEB-CLAIM",
+            "shortDescription": {"text": "Public web claim without matching evidence"},
+        },
+        {
+            "id": "WEB-AI-FORBIDDEN",
+            "shortDescription": {"text": "Forbidden AI overclaim phrase in public web copy"},
+        },
+    ]
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+        self._count = 0
+        self._stream.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+            '"runs": [{"results": ['
         )
+        self._stream.flush()
+
+    def add(self, result: ClaimResult) -> None:
+        forbidden = result.claim_id.startswith("WEB-AI-FORBIDDEN-")
+        region: Dict[str, int] = {}
+        if result.line is not None:
+            region["startLine"] = result.line
+            if result.column is not None:
+                region["startColumn"] = result.column
+        location: Dict[str, Any] = {"artifactLocation": {"uri": result.page_path}}
+        if region:
+            location["region"] = region
+        entry: Dict[str, Any] = {
+            "ruleId": "WEB-AI-FORBIDDEN" if forbidden else "WEB-CLAIM",
+            "ruleIndex": 1 if forbidden else 0,
+            "kind": "fail" if result.status == "FAIL" else "pass",
+            "level": ("error" if result.risk_level == "high" else "warning") if result.status == "FAIL" else "none",
+            "message": {"text": f"{result.claim_id}: {result.reason}"},
+            "locations": [{"physicalLocation": location}],
+            "properties": {
+                "claimId": result.claim_id,
+                "statement": result.statement,
+                "domain": result.domain,
+                "riskLevel": result.risk_level,
+                "evidencePaths": result.evidence_paths,
+                "copyFix": result.copy_fix if result.status == "FAIL" else "",
+            },
+        }
+        self._stream.write((", " if self._count else "") + json.dumps(entry, ensure_ascii=False, sort_keys=True))
+        self._stream.flush()
+        self._count += 1
+
+    def close(self, complete: bool) -> None:
+        tool = {"driver": {"name": "verify_web_claims", "version": VERIFIER_VERSION, "rules": self.RULES}}
+        tail = {"tool": tool, "properties": {"complete": complete}}
+        self._stream.write("], " + json.dumps(tail, ensure_ascii=False, sort_keys=True)[1:] + "]}\n")
+        self._stream.flush()
+
+
+class ConsoleSummary(ResultSink):
+    """The human-readable FAIL/PASS summary; failures are printed as they are found."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+        self.failed = 0
+
+    def add(self, result: ClaimResult) -> None:
+        if result.status != "FAIL":
+            return
+        if not self.failed:
+            print("WEB claims enforcement: FAIL", file=self._stream)
+        self.failed += 1
+        print(f"- {result.claim_id}: {result.reason}", file=self._stream)
+        print(f"  page_path: {result.page_path}", file=self._stream)
+        print(f"  statement: {result.statement}", file=self._stream)
+        print(f"  copy_fix: {result.copy_fix}", file=self._stream)
+        self._stream.flush()
+
+    def close(self, complete: bool) -> None:
+        if not complete:
+            print("stopped at the first high-risk FAIL (--fail-fast); remaining claims not checked", file=self._stream)
+        elif not self.failed:
+            print("WEB claims enforcement: PASS", file=self._stream)
+
+
+def _results_pending(results: Iterable[ClaimResult], it: Iterator[ClaimResult], consumed: int) -> bool:
+    pending = getattr(it, "pending", None)
+    if pending is None and isinstance(results, Sized):
+        pending = len(results) - consumed
+    # Unknown: more may be coming.
+    return pending is None or pending > 0
+
+
+def run_sinks(
+    results: Iterable[ClaimResult], sinks: List[ResultSink], fail_fast: bool = False
+) -> Tuple[List[ClaimResult], bool]:
+    """Feed every sink as results arrive; with fail_fast, stop after the first high-risk FAIL.
+
+    Returns the results seen and whether the run stopped before exhausting ``results``. A blocking
+    FAIL on the last result is still a complete run when the input says nothing is pending: a
+    ``pending`` count (as on iter_claims()) or a sized input. Any other iterator is not advanced past
+    the FAIL, so the stop counts as early. Sinks are always closed, with complete=False when the run
+    stopped early.
+    """
+    seen: List[ClaimResult] = []
+    complete = False
+    it = iter(results)
+    try:
+        for result in it:
+            seen.append(result)
+            with _span("report", result.claim_id):
+                for sink in sinks:
+                    sink.add(result)
+            if fail_fast and _is_blocking(result) and _results_pending(results, it, len(seen)):
+                return seen, True
+        complete = True
+        return seen, False
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+        with _span("report", "close"):
+            for sink in sinks:
+                sink.close(complete)
+
+
+def write_report(results: Iterable[ClaimResult]) -> None:
+    run_sinks(results, [MarkdownReport(REPORT_PATH)])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify public web claims and write WEB-CLAIMS-REPORT.md.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"re-evaluate everything, ignoring the result cache ({CACHE_PATH.relative_to(REPO_ROOT)})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="evaluate files and claims with N parallel workers (0 = one per CPU); output is identical to -j1",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="GIT_REF",
+        help="only re-check claims/copy files changed since GIT_REF; everything else comes from the baseline",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="baseline written by full runs and merged by --since (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--jsonl",
+        metavar="PATH",
+        help="also stream each result as a JSON line to PATH ('-' = stdout) as soon as it is produced",
+    )
+    parser.add_argument(
+        "--sarif",
+        metavar="PATH",
+        help="also stream results as a SARIF 2.1.0 log to PATH ('-' = stdout)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop at the first high-risk FAIL (the Markdown report, cache and baseline are left as they were)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=PROFILE_TRACE_PATH,
+        metavar="TRACE_JSON",
+        help="print per-stage timings and per-claim I/O counters to stderr and write a Chrome trace "
+        f"(default: {PROFILE_TRACE_PATH.relative_to(REPO_ROOT)})",
+    )
+    args = parser.parse_args(argv)
+    if args.jsonl == "-" and args.sarif == "-":
+        parser.error("--jsonl and --sarif cannot both write to stdout")
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    jobs = args.jobs or os.cpu_count() or 1
+
+    global _PROFILER
+    if args.profile is not None:
+        _PROFILER = Profiler()
+
+    cache = None if args.no_cache else ResultCache.load(CACHE_PATH)
+    claims = load_claims(CLAIMS_PATH, None if args.no_cache else CLAIMS_CACHE_PATH)
+    reuse: Optional[RunSnapshot] = None
+    snapshot: Optional[RunSnapshot] = None
+    if args.since:
+        reuse, changed = load_since_scope(args.baseline, args.since, claims)
+        if reuse is None:
+            print(f"--since {args.since}: no usable baseline at {args.baseline}; running full check", file=sys.stderr)
+        else:
+            print(
+                f"--since {args.since}: {len(changed)} changed file(s); "
+                f"re-checking {len(claims) - len(reuse.claims)}/{len(claims)} claim(s)",
+                file=sys.stderr,
+            )
+    else:
+        snapshot = RunSnapshot()
+
+    # Machine-readable output on stdout moves the human summary to stderr.
+    machine_stdout = "-" in (args.jsonl, args.sarif)
+    console = ConsoleSummary(sys.stderr if machine_stdout else sys.stdout)
+    sinks: List[ResultSink] = [MarkdownReport(REPORT_PATH), console]
+    opened: List[IO[str]] = []
+    for path, sink_cls in ((args.jsonl, JsonLinesReport), (args.sarif, SarifReport)):
+        if path is None:
+            continue
+        if path == "-":
+            stream = sys.stdout
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            stream = open(path, "w", encoding="utf-8")
+            opened.append(stream)
+        sinks.append(sink_cls(stream))
 
-    lines.append("")
-    lines.append("## Execução")
-    lines.append("")
-    lines.append("```bash")
-    lines.append("python tools/claims/verify_web_claims.py")
-    lines.append("```")
-    lines.append("")
-
-    REPORT_PATH.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-
-def main() -> int:
-    results = verify_claims()
-    write_report(results)
-
-    failed = [r for r in results if r.status == "FAIL"]
-    if failed:
-        print("WEB claims enforcement: FAIL")
-        for r in failed:
-            print(f"- {r.claim_id}: {r.reason}")
-            print(f"  page_path: {r.page_path}")
-            print(f"  statement: {r.statement}")
-            print(f"  copy_fix: {r.copy_fix}")
-        return 1
-
-    print("WEB claims enforcement: PASS")
-    return 0
+    try:
+        _, stopped_early = run_sinks(
+            iter_claims(cache, jobs=jobs, reuse=reuse, snapshot=snapshot, claims=claims), sinks, fail_fast=args.fail_fast
+        )
+    finally:
+        for stream in opened:
+            stream.close()
+
+    if cache is not None:
+        cache.save(prune=not stopped_early)
+    if snapshot is not None and not stopped_early:
+        save_baseline(args.baseline, snapshot)
+
+    if _PROFILER is not None:
+        print("\n".join(_PROFILER.summary_lines()), file=sys.stderr)
+        _PROFILER.write_trace(args.profile)
+        print(f"profile trace: {args.profile}", file=sys.stderr)
+        _PROFILER = None
+
+    return 1 if console.failed else 0
 
 
 if __name__ == "__main__":
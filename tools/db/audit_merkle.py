@@ -0,0 +1,591 @@
+"""Merkle roots over fixed-size blocks of audit_events, with O(log n) inclusion proofs.
+
+`seal` recomputes the next full blocks of a stream (block_size consecutive events in id order,
+chained from the previous block) and stores each block's Merkle root in
+public.audit_merkle_blocks (20261018_120). Leaves are the events' event_hash, recomputed with the
+same canonical form as trg_audit_events_hashchain (verify_audit_chain.event_hash), so a leaf
+commits to the event's content and prev_hash:
+
+    leaf = SHA-256(0x00 || event_hash)    node = SHA-256(0x01 || left || right)
+
+with an unpaired node promoted unchanged to the next level (RFC 6962 domain separation).
+
+- `prove` exports one event (canonical fields + prev_hash), its sibling path and the block root
+  as JSON; `verify-proof` checks that file in O(log block_size) hashes against a trusted root:
+  `--root` (offline, e.g. a published root) or the block's root_hash read with `--dsn`. The root
+  inside the file is never trusted, since whoever wrote the file also chose it. The SQL
+  counterpart is public.audit_merkle_verify_proof.
+- `verify` re-checks only the blocks overlapping a time range (hashes, chaining into the previous
+  block and root), instead of replaying the stream from genesis; public.audit_merkle_verify_block
+  does the same in SQL. It fails when no sealed block overlaps the range, and reports the events
+  in the range that are not in any sealed block yet.
+
+Events not yet in a full block have no proof until the next `seal`. As with verify_audit_chain,
+occurred_at::text is rendered by the server, so the session TimeZone must match the one the
+events were written with.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+HERE = Path(__file__).resolve().parent
+
+
+def _load_sibling(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, HERE / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+verify_audit_chain = _load_sibling("verify_audit_chain")
+
+DSN_ENVS = verify_audit_chain.DSN_ENVS
+GENESIS_HASH = verify_audit_chain.GENESIS_HASH
+DEFAULT_BLOCK_SIZE = 1024
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+# Canonical text forms as in verify_audit_chain, plus the raw occurred_at for the block's time span.
+_EVENT_COLUMNS = """
+    id, prev_hash, event_hash,
+    COALESCE(occurred_at::text, ''), COALESCE(actor, ''), COALESCE(action, ''),
+    COALESCE(resource_ref, ''), COALESCE(correlation_id, ''), COALESCE(trace_id, ''),
+    COALESCE(payload_json::text, '{}'),
+    occurred_at
+"""
+_STREAM_FILTER = {
+    True: "tenant_id = CAST(:tenant_id AS uuid)",
+    False: "tenant_id IS NULL",
+}
+_NEXT_ROWS_SQL = {
+    has_tenant: f"""
+        SELECT {_EVENT_COLUMNS} FROM public.audit_events
+        WHERE {where} AND id > :after_id
+        ORDER BY id LIMIT :limit
+    """
+    for has_tenant, where in _STREAM_FILTER.items()
+}
+_BLOCK_ROWS_SQL = {
+    has_tenant: f"""
+        SELECT {_EVENT_COLUMNS} FROM public.audit_events
+        WHERE {where} AND id BETWEEN :first_id AND :last_id
+        ORDER BY id
+    """
+    for has_tenant, where in _STREAM_FILTER.items()
+}
+_PREV_HASH_SQL = {
+    has_tenant: f"""
+        SELECT event_hash FROM public.audit_events
+        WHERE {where} AND id < :before_id
+        ORDER BY id DESC LIMIT 1
+    """
+    for has_tenant, where in _STREAM_FILTER.items()
+}
+_BLOCK_COLUMNS = "stream_key, block_no, first_id, last_id, leaf_count, min_occurred_at, max_occurred_at, root_hash"
+_LAST_BLOCK_SQL = f"""
+    SELECT {_BLOCK_COLUMNS} FROM public.audit_merkle_blocks
+    WHERE stream_key = :stream ORDER BY block_no DESC LIMIT 1
+"""
+_BLOCK_FOR_ID_SQL = f"""
+    SELECT {_BLOCK_COLUMNS} FROM public.audit_merkle_blocks
+    WHERE stream_key = :stream AND last_id >= :id ORDER BY last_id LIMIT 1
+"""
+_BLOCK_ROOT_SQL = """
+    SELECT root_hash FROM public.audit_merkle_blocks WHERE stream_key = :stream AND block_no = :block_no
+"""
+_BLOCKS_IN_TIME_RANGE_SQL = f"""
+    SELECT {_BLOCK_COLUMNS} FROM public.audit_merkle_blocks
+    WHERE stream_key = :stream
+      AND (CAST(:since AS timestamptz) IS NULL OR max_occurred_at >= :since)
+      AND (CAST(:until AS timestamptz) IS NULL OR min_occurred_at < :until)
+    ORDER BY block_no
+"""
+# Events after the stream's last sealed block (blocks are contiguous from the first event).
+_UNSEALED_IN_TIME_RANGE_SQL = {
+    has_tenant: f"""
+        SELECT count(*), min(id), max(id) FROM public.audit_events
+        WHERE {where}
+          AND id > COALESCE((SELECT max(last_id) FROM public.audit_merkle_blocks WHERE stream_key = :stream), 0)
+          AND (CAST(:since AS timestamptz) IS NULL OR occurred_at >= :since)
+          AND (CAST(:until AS timestamptz) IS NULL OR occurred_at < :until)
+    """
+    for has_tenant, where in _STREAM_FILTER.items()
+}
+# Blocks are written only through the definer function, which re-derives the root from the events.
+_SEAL_BLOCK_SQL = """
+    SELECT public.audit_merkle_seal_block(CAST(:tenant_id AS uuid), :block_no, :first_id, :last_id, :root_hash)
+"""
+
+
+class MerkleError(Exception):
+    """A block cannot be sealed or proven (broken chain, event not sealed yet, missing anchor)."""
+
+
+# --- Merkle tree -------------------------------------------------------------------------------
+
+
+def merkle_leaf(event_hash_hex: str) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + bytes.fromhex(event_hash_hex)).digest()
+
+
+def merkle_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def merkle_levels(leaves: Sequence[bytes]) -> List[List[bytes]]:
+    """All levels, leaves first and the root level ([root]) last."""
+    if not leaves:
+        raise ValueError("a Merkle tree needs at least one leaf")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append(
+            [merkle_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+        )
+    return levels
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    return merkle_levels(leaves)[-1][0]
+
+
+def merkle_path(levels: Sequence[Sequence[bytes]], index: int) -> List[bytes]:
+    """Sibling hashes from the leaf up; levels where the node has no sibling contribute nothing."""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(level[sibling])
+        index //= 2
+    return path
+
+
+def root_from_path(leaf: bytes, index: int, count: int, path: Sequence[bytes]) -> Optional[bytes]:
+    """The root a (leaf, index, path) proof implies, or None if the path does not fit the tree shape."""
+    if not 0 <= index < count:
+        return None
+    node = leaf
+    used = 0
+    while count > 1:
+        if index ^ 1 < count:
+            if used == len(path):
+                return None
+            sibling = path[used]
+            used += 1
+            node = merkle_node(node, sibling) if index % 2 == 0 else merkle_node(sibling, node)
+        index //= 2
+        count = (count + 1) // 2
+    return node if used == len(path) else None
+
+
+# --- Blocks and proofs -------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class MerkleBlock:
+    stream: str
+    block_no: int
+    first_id: int
+    last_id: int
+    leaf_count: int
+    min_occurred_at: datetime
+    max_occurred_at: datetime
+    root_hash: str
+
+
+@dataclass(frozen=True)
+class InclusionProof:
+    stream: str
+    block_no: int
+    event_id: int
+    leaf_index: int
+    leaf_count: int
+    prev_hash: str
+    fields: Tuple[str, ...]  # canonical text forms, in trigger order (occurred_at::text ... payload_json::text)
+    event_hash: str
+    path: Tuple[str, ...]  # hex
+    root_hash: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2) + "\n"
+
+    @classmethod
+    def from_json(cls, data: str) -> "InclusionProof":
+        doc = json.loads(data)
+        return cls(**{**doc, "fields": tuple(doc["fields"]), "path": tuple(doc["path"])})
+
+
+def verify_inclusion(proof: InclusionProof, trusted_root: str) -> bool:
+    """Offline check: the event's content hashes to event_hash, and event_hash is in trusted_root.
+
+    trusted_root must come from outside the proof (a published root, or audit_merkle_blocks via
+    block_root): a forged proof is self-consistent with its own root_hash.
+    """
+    if verify_audit_chain.event_hash(proof.prev_hash, *proof.fields) != proof.event_hash:
+        return False
+    try:
+        root = root_from_path(
+            merkle_leaf(proof.event_hash), proof.leaf_index, proof.leaf_count, [bytes.fromhex(p) for p in proof.path]
+        )
+    except ValueError:  # not hex
+        return False
+    return root is not None and root.hex() == trusted_root.lower()
+
+
+@dataclass
+class BlockCheck:
+    block: MerkleBlock
+    ok: bool
+    broken_id: Optional[int] = None
+    reason: Optional[str] = None  # prev_hash | event_hash | leaf_count | root
+
+
+@dataclass(frozen=True)
+class UnsealedEvents:
+    count: int
+    first_id: Optional[int]
+    last_id: Optional[int]
+
+
+def _params(tenant_id: Optional[UUID], **extra: Any) -> dict:
+    return {"tenant_id": str(tenant_id) if tenant_id is not None else None, **extra}
+
+
+def _block(row: Any) -> MerkleBlock:
+    return MerkleBlock(*row)
+
+
+async def _anchor_hash(conn: Any, tenant_id: Optional[UUID], first_id: int) -> str:
+    # Hash of the stream's event right before the block (genesis for the first one).
+    prev = await conn.scalar(text(_PREV_HASH_SQL[tenant_id is not None]), _params(tenant_id, before_id=first_id))
+    return prev if prev is not None else GENESIS_HASH
+
+
+def _check_rows(rows: Sequence[Any], expected_prev: str) -> Optional[Tuple[int, str]]:
+    """First (id, reason) where the rows stop chaining from expected_prev, or None."""
+    for row in rows:
+        row_id, stored_prev, stored_hash, *fields = row[:-1]
+        if (stored_prev or "") != expected_prev:
+            return row_id, "prev_hash"
+        if (stored_hash or "") != verify_audit_chain.event_hash(expected_prev, *fields):
+            return row_id, "event_hash"
+        expected_prev = stored_hash
+    return None
+
+
+async def seal_blocks(
+    engine: AsyncEngine,
+    tenant_id: Optional[UUID],
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    max_blocks: Optional[int] = None,
+) -> List[MerkleBlock]:
+    """Seal every full block after the stream's last sealed one; returns the new blocks.
+
+    Each block is verified (chained from the previous block's last event) before its root is
+    stored, in one transaction per block. A partial tail stays unsealed until it fills up.
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1")
+    stream = verify_audit_chain.stream_key(tenant_id)
+    sealed: List[MerkleBlock] = []
+    while max_blocks is None or len(sealed) < max_blocks:
+        async with engine.begin() as conn:
+            await verify_audit_chain._begin_stream_transaction(conn, tenant_id)
+            last = (await conn.execute(text(_LAST_BLOCK_SQL), {"stream": stream})).one_or_none()
+            after_id = last.last_id if last is not None else 0
+            block_no = last.block_no + 1 if last is not None else 0
+            rows = (
+                await conn.execute(
+                    text(_NEXT_ROWS_SQL[tenant_id is not None]), _params(tenant_id, after_id=after_id, limit=block_size)
+                )
+            ).all()
+            if len(rows) < block_size:
+                return sealed
+            prev = await _anchor_hash(conn, tenant_id, rows[0][0])
+            broken = _check_rows(rows, prev)
+            if broken is not None:
+                raise MerkleError(f"{stream}: chain broken at id {broken[0]} ({broken[1]} mismatch); not sealing")
+            occurred = [row[-1] for row in rows]
+            block = MerkleBlock(
+                stream=stream,
+                block_no=block_no,
+                first_id=rows[0][0],
+                last_id=rows[-1][0],
+                leaf_count=len(rows),
+                min_occurred_at=min(occurred),
+                max_occurred_at=max(occurred),
+                root_hash=merkle_root([merkle_leaf(row[2]) for row in rows]).hex(),
+            )
+            await conn.execute(
+                text(_SEAL_BLOCK_SQL),
+                _params(
+                    tenant_id,
+                    block_no=block.block_no,
+                    first_id=block.first_id,
+                    last_id=block.last_id,
+                    root_hash=block.root_hash,
+                ),
+            )
+        sealed.append(block)
+    return sealed
+
+
+async def inclusion_proof(engine: AsyncEngine, tenant_id: Optional[UUID], event_id: int) -> InclusionProof:
+    """Proof that event_id is in its sealed block; raises MerkleError if it is not sealed yet."""
+    stream = verify_audit_chain.stream_key(tenant_id)
+    async with engine.begin() as conn:
+        await verify_audit_chain._begin_stream_transaction(conn, tenant_id)
+        row = (await conn.execute(text(_BLOCK_FOR_ID_SQL), {"stream": stream, "id": event_id})).one_or_none()
+        if row is None or row.first_id > event_id:
+            raise MerkleError(f"{stream}: event {event_id} is not in a sealed block")
+        block = _block(row)
+        rows = (
+            await conn.execute(
+                text(_BLOCK_ROWS_SQL[tenant_id is not None]),
+                _params(tenant_id, first_id=block.first_id, last_id=block.last_id),
+            )
+        ).all()
+    ids = [r[0] for r in rows]
+    if event_id not in ids or len(rows) != block.leaf_count:
+        raise MerkleError(f"{stream}: block {block.block_no} no longer matches audit_events")
+    index = ids.index(event_id)
+    levels = merkle_levels([merkle_leaf(r[2]) for r in rows])
+    _, prev_hash, stored_hash, *fields = rows[index][:-1]
+    return InclusionProof(
+        stream=stream,
+        block_no=block.block_no,
+        event_id=event_id,
+        leaf_index=index,
+        leaf_count=block.leaf_count,
+        prev_hash=prev_hash or "",
+        fields=tuple(fields),
+        event_hash=stored_hash or "",
+        path=tuple(p.hex() for p in merkle_path(levels, index)),
+        root_hash=block.root_hash,
+    )
+
+
+async def block_root(engine: AsyncEngine, stream: str, block_no: int) -> Optional[str]:
+    """The stored root of a sealed block (the trusted side of verify_inclusion), or None."""
+    try:
+        tenant_id = None if stream == verify_audit_chain.GLOBAL_STREAM else UUID(stream)
+    except ValueError:
+        raise MerkleError(f"{stream!r} is not a stream key") from None
+    async with engine.begin() as conn:
+        await verify_audit_chain._begin_stream_transaction(conn, tenant_id)
+        return await conn.scalar(text(_BLOCK_ROOT_SQL), {"stream": stream, "block_no": block_no})
+
+
+async def verify_blocks(
+    engine: AsyncEngine,
+    tenant_id: Optional[UUID],
+    *,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[BlockCheck]:
+    """Re-check the sealed blocks with events in [since, until): rows, chaining and root."""
+    stream = verify_audit_chain.stream_key(tenant_id)
+    checks: List[BlockCheck] = []
+    async with engine.begin() as conn:
+        await verify_audit_chain._begin_stream_transaction(conn, tenant_id)
+        blocks = [
+            _block(row)
+            for row in await conn.execute(
+                text(_BLOCKS_IN_TIME_RANGE_SQL), {"stream": stream, "since": since, "until": until}
+            )
+        ]
+    for block in blocks:
+        # One transaction per block: no snapshot held across a long range.
+        async with engine.begin() as conn:
+            await verify_audit_chain._begin_stream_transaction(conn, tenant_id)
+            rows = (
+                await conn.execute(
+                    text(_BLOCK_ROWS_SQL[tenant_id is not None]),
+                    _params(tenant_id, first_id=block.first_id, last_id=block.last_id),
+                )
+            ).all()
+            prev = await _anchor_hash(conn, tenant_id, block.first_id)
+        broken = _check_rows(rows, prev)
+        if broken is not None:
+            checks.append(BlockCheck(block, False, *broken))
+        elif len(rows) != block.leaf_count:
+            checks.append(BlockCheck(block, False, block.first_id, "leaf_count"))
+        elif merkle_root([merkle_leaf(r[2]) for r in rows]).hex() != block.root_hash:
+            checks.append(BlockCheck(block, False, block.first_id, "root"))
+        else:
+            checks.append(BlockCheck(block, True))
+    return checks
+
+
+async def unsealed_events(
+    engine: AsyncEngine,
+    tenant_id: Optional[UUID],
+    *,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> UnsealedEvents:
+    """Events in [since, until) that no sealed block covers yet, so verify_blocks did not check them."""
+    stream = verify_audit_chain.stream_key(tenant_id)
+    async with engine.begin() as conn:
+        await verify_audit_chain._begin_stream_transaction(conn, tenant_id)
+        row = (
+            await conn.execute(
+                text(_UNSEALED_IN_TIME_RANGE_SQL[tenant_id is not None]),
+                _params(tenant_id, stream=stream, since=since, until=until),
+            )
+        ).one()
+    return UnsealedEvents(*row)
+
+
+# --- CLI ---------------------------------------------------------------------------------------
+
+
+def _stream_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--tenant", type=UUID, metavar="UUID", help="tenant stream")
+    group.add_argument(
+        "--global", dest="global_stream", action="store_true", help="GLOBAL stream (needs a role that bypasses RLS)"
+    )
+
+
+async def _with_engine(dsn: str, fn: Any) -> Any:
+    engine = create_async_engine(dsn)
+    try:
+        return await fn(engine)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merkle roots and inclusion proofs for the audit_events hash chain.")
+    parser.add_argument(
+        "--dsn",
+        default=next((os.environ[name] for name in DSN_ENVS if os.environ.get(name)), None),
+        help=f"SQLAlchemy async DSN (default: ${' / $'.join(DSN_ENVS)})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seal = commands.add_parser("seal", help="store roots for every new full block of a stream")
+    _stream_args(seal)
+    seal.add_argument(
+        "--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="events per block (default: %(default)s)"
+    )
+
+    prove = commands.add_parser("prove", help="write an inclusion proof for one event as JSON")
+    _stream_args(prove)
+    prove.add_argument("--event-id", type=int, required=True)
+    prove.add_argument("--out", type=Path, help="write the proof here instead of stdout")
+
+    verify_proof = commands.add_parser(
+        "verify-proof", help="check a proof file against a trusted root (--root, or the stored one via --dsn)"
+    )
+    verify_proof.add_argument("proof", type=Path)
+    verify_proof.add_argument(
+        "--root", metavar="HEX", help="trusted block root; checks offline, without the database"
+    )
+
+    verify = commands.add_parser("verify", help="re-check the sealed blocks with events in a time range")
+    _stream_args(verify)
+    verify.add_argument("--since", type=datetime.fromisoformat, help="ISO timestamp (inclusive)")
+    verify.add_argument("--until", type=datetime.fromisoformat, help="ISO timestamp (exclusive)")
+
+    args = parser.parse_args(argv)
+    if args.command == "verify-proof" and args.root is None and not args.dsn:
+        parser.error(f"verify-proof needs a trusted root: --root, or --dsn / ${DSN_ENVS[0]} to read it")
+    if not args.dsn and args.command != "verify-proof":
+        parser.error(f"--dsn or ${DSN_ENVS[0]} is required")
+    if args.command == "verify-proof":
+        proof = InclusionProof.from_json(args.proof.read_text(encoding="utf-8"))
+        root = args.root
+        if root is None:
+            try:
+                root = asyncio.run(
+                    _with_engine(args.dsn, lambda engine: block_root(engine, proof.stream, proof.block_no))
+                )
+            except MerkleError as exc:
+                print(f"ERROR: {exc}", file=sys.stderr)
+                return 1
+            if root is None:
+                print(f"ERROR: {proof.stream}: block {proof.block_no} is not sealed", file=sys.stderr)
+                return 1
+        ok = verify_inclusion(proof, root)
+        state = "OK     " if ok else "INVALID"
+        print(f"{state} {proof.stream}: event {proof.event_id} in block {proof.block_no} (root {root})")
+        return 0 if ok else 1
+    tenant_id = None if args.global_stream else args.tenant
+
+    try:
+        if args.command == "seal":
+            if args.block_size < 1:
+                parser.error("--block-size must be >= 1")
+            blocks = asyncio.run(
+                _with_engine(args.dsn, lambda engine: seal_blocks(engine, tenant_id, block_size=args.block_size))
+            )
+            for block in blocks:
+                print(
+                    f"SEALED  {block.stream}: block {block.block_no} ids {block.first_id}..{block.last_id} "
+                    f"root {block.root_hash}"
+                )
+            return 0
+        if args.command == "prove":
+            proof = asyncio.run(
+                _with_engine(args.dsn, lambda engine: inclusion_proof(engine, tenant_id, args.event_id))
+            )
+            if args.out:
+                args.out.write_text(proof.to_json(), encoding="utf-8")
+            else:
+                sys.stdout.write(proof.to_json())
+            return 0
+    except MerkleError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    async def _verify(engine: AsyncEngine) -> Tuple[List[BlockCheck], UnsealedEvents]:
+        checks = await verify_blocks(engine, tenant_id, since=args.since, until=args.until)
+        return checks, await unsealed_events(engine, tenant_id, since=args.since, until=args.until)
+
+    checks, unsealed = asyncio.run(_with_engine(args.dsn, _verify))
+    stream = verify_audit_chain.stream_key(tenant_id)
+    for check in checks:
+        b = check.block
+        if check.ok:
+            print(f"OK      {b.stream}: block {b.block_no} ids {b.first_id}..{b.last_id}")
+        else:
+            print(
+                f"BROKEN  {b.stream}: block {b.block_no}, first broken id {check.broken_id} ({check.reason} mismatch)"
+            )
+    if unsealed.count:
+        print(
+            f"UNSEALED {stream}: {unsealed.count} events ids {unsealed.first_id}..{unsealed.last_id} "
+            "in no sealed block (not verified; seal them first)"
+        )
+    if not checks:
+        print(f"ERROR: {stream}: no sealed block overlaps the range; nothing was verified", file=sys.stderr)
+        return 1
+    return 0 if all(c.ok for c in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
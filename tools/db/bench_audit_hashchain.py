@@ -0,0 +1,211 @@
+"""Insert-throughput benchmark for trg_audit_events_hashchain, before/after audit_chain_heads.
+
+Variants:
+- legacy: the trigger from 20260216_123 (prev_hash via ORDER BY id DESC LIMIT 1 on audit_events);
+- chain_heads: the trigger as shipped after 20261018_100 and 20261018_110 (prev_hash via the
+  audit_chain_heads primary key, plus the batch-ingest check every row goes through).
+
+Each variant runs against a scratch copy in schema audit_bench (same columns, index, FORCE RLS
+policy and trigger as public.audit_events, with the migrations' SQL re-pointed at the scratch
+schema), so public tables are never touched; the schema is dropped at the end. Per --prefill size:
+one seed event per measured stream, --prefill events of a separate "noise" tenant appended after
+them (with the trigger disabled), then per stream one "cold" insert (the first after the noise,
+which the legacy lookup may have to walk past) and --inserts "warm" inserts, each in its own
+transaction like an API request. The role needs CREATE on the database.
+
+Under RLS the policy adds an indexable tenant_id = ... qual to the legacy lookup; roles that bypass
+RLS (migrations, the GLOBAL stream) get the plain backward scan. The output records which.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MIGRATIONS = REPO_ROOT / "infra" / "migrations"
+LEGACY_MIGRATION = MIGRATIONS / "20260216_123_audit_events_hashchain.sql"
+CHAIN_HEADS_MIGRATIONS = (
+    MIGRATIONS / "20261018_100_audit_chain_heads.sql",
+    MIGRATIONS / "20261018_110_audit_events_bulk_ingest.sql",
+)
+DSN_ENVS = ("AUDIT_PG_DSN", "HARDENING_PG_DSN")
+
+SCHEMA = "audit_bench"
+VARIANTS = ("legacy", "chain_heads")
+
+_TRIGGER_FUNCTION_RE = re.compile(
+    r"CREATE OR REPLACE FUNCTION public\.trg_audit_events_hashchain\(\).*?END \$\$;", re.DOTALL
+)
+# Mirrors 20260216_120 (columns), 20260216_122 (policy) and 20260216_123 (index) for the scratch copy.
+_SCRATCH_DDL = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+CREATE TABLE {SCHEMA}.audit_events (
+  id bigserial PRIMARY KEY,
+  tenant_id uuid NULL,
+  occurred_at timestamptz NOT NULL DEFAULT now(),
+  actor text NOT NULL,
+  action text NULL,
+  resource_ref text NULL,
+  correlation_id text NULL,
+  trace_id text NULL,
+  payload_json jsonb NOT NULL DEFAULT '{{}}'::jsonb,
+  prev_hash text NULL,
+  event_hash text NULL
+);
+CREATE INDEX ON {SCHEMA}.audit_events (tenant_id, id);
+ALTER TABLE {SCHEMA}.audit_events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE {SCHEMA}.audit_events FORCE ROW LEVEL SECURITY;
+CREATE POLICY tenant_isolation ON {SCHEMA}.audit_events
+  USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+  WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid);
+"""
+_CREATE_TRIGGER = f"""
+CREATE TRIGGER trg_audit_events_hashchain BEFORE INSERT ON {SCHEMA}.audit_events
+FOR EACH ROW EXECUTE FUNCTION {SCHEMA}.trg_audit_events_hashchain();
+"""
+_SET_TENANT = "SELECT set_config('app.current_tenant_id', $1, false)"
+_INSERT = f"INSERT INTO {SCHEMA}.audit_events (tenant_id, actor, action) VALUES ($1, 'bench', $2)"
+_PREFILL = f"""
+INSERT INTO {SCHEMA}.audit_events (tenant_id, actor, action, payload_json)
+SELECT $1, 'bench-noise', 'PREFILL', jsonb_build_object('n', g) FROM generate_series(1, $2) AS g
+"""
+
+
+def variant_sql(variant: str) -> str:
+    """The variant's trigger SQL (from its migration files), re-pointed at the scratch schema."""
+    if variant == "legacy":
+        match = _TRIGGER_FUNCTION_RE.search(LEGACY_MIGRATION.read_text(encoding="utf-8"))
+        if match is None:
+            raise ValueError(f"trg_audit_events_hashchain not found in {LEGACY_MIGRATION}")
+        sql = match.group(0)
+    elif variant == "chain_heads":
+        sql = "\n".join(path.read_text(encoding="utf-8") for path in CHAIN_HEADS_MIGRATIONS)
+    else:
+        raise ValueError(f"unknown variant {variant!r}")
+    return sql.replace("public.", f"{SCHEMA}.")
+
+
+async def bench_variant(raw: Any, variant: str, *, prefill: int, streams: int, inserts: int) -> Dict[str, Any]:
+    """One run on a fresh scratch schema; returns cold-insert latency and warm inserts/s per stream."""
+    tenants = [str(uuid4()) for _ in range(streams)]
+    await raw.execute(_SCRATCH_DDL)
+    try:
+        # Session-level tenant: the chain_heads backfill reads through the RLS policy.
+        await raw.execute(_SET_TENANT, str(uuid4()))
+        await raw.execute(variant_sql(variant))
+        await raw.execute(_CREATE_TRIGGER)
+        for tenant in tenants:
+            await raw.execute(_SET_TENANT, tenant)
+            await raw.execute(_INSERT, tenant, "SEED")
+        if prefill:
+            # Bulk prefill bypasses the hash chain: through the legacy trigger it would be quadratic.
+            noise = str(uuid4())
+            await raw.execute(_SET_TENANT, noise)
+            await raw.execute(f"ALTER TABLE {SCHEMA}.audit_events DISABLE TRIGGER trg_audit_events_hashchain")
+            await raw.execute(_PREFILL, noise, prefill)
+            await raw.execute(f"ALTER TABLE {SCHEMA}.audit_events ENABLE TRIGGER trg_audit_events_hashchain")
+        await raw.execute(f"ANALYZE {SCHEMA}.audit_events")
+
+        cold_ms: List[float] = []
+        rates: List[float] = []
+        for tenant in tenants:
+            await raw.execute(_SET_TENANT, tenant)
+            started = time.perf_counter()
+            await raw.execute(_INSERT, tenant, "COLD")
+            cold_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            for i in range(inserts):
+                await raw.execute(_INSERT, tenant, f"WARM-{i}")
+            rates.append(inserts / (time.perf_counter() - started))
+    finally:
+        await raw.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    return {
+        "variant": variant,
+        "prefill": prefill,
+        "streams": streams,
+        "inserts_per_stream": inserts,
+        "cold_insert_ms": cold_ms,
+        "inserts_per_s": rates,
+        "median_cold_insert_ms": statistics.median(cold_ms),
+        "median_inserts_per_s": statistics.median(rates),
+    }
+
+
+async def run_benchmark(dsn: str, *, prefills: List[int], streams: int, inserts: int) -> Dict[str, Any]:
+    engine = create_async_engine(dsn, pool_size=1, max_overflow=0)
+    try:
+        async with engine.connect() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            bypass_rls = await raw.fetchval(
+                "SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user"
+            )
+            results = [
+                await bench_variant(raw, variant, prefill=prefill, streams=streams, inserts=inserts)
+                for prefill in prefills
+                for variant in VARIANTS
+            ]
+    finally:
+        await engine.dispose()
+    return {"bypass_rls": bypass_rls, "results": results}
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"role bypasses RLS: {report['bypass_rls']}")
+    print(f"{'prefill':>10}  {'variant':<12} {'cold insert ms':>14} {'warm ins/s':>11}")
+    for r in report["results"]:
+        print(
+            f"{r['prefill']:>10}  {r['variant']:<12} {r['median_cold_insert_ms']:>14.2f} "
+            f"{r['median_inserts_per_s']:>11.0f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark audit_events inserts: legacy trigger vs audit_chain_heads."
+    )
+    parser.add_argument(
+        "--dsn",
+        default=next((os.environ[name] for name in DSN_ENVS if os.environ.get(name)), None),
+        help=f"SQLAlchemy asyncpg DSN (default: ${' / $'.join(DSN_ENVS)})",
+    )
+    parser.add_argument(
+        "--prefill",
+        default="0,10000,100000",
+        help="comma-separated counts of other-tenant events written before the measured inserts "
+        "(default: %(default)s)",
+    )
+    parser.add_argument("--streams", type=int, default=8, help="measured tenant streams (default: %(default)s)")
+    parser.add_argument("--inserts", type=int, default=200, help="warm inserts per stream (default: %(default)s)")
+    parser.add_argument("--json", metavar="PATH", help="also write the raw results as JSON")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error(f"--dsn or ${DSN_ENVS[0]} is required")
+    try:
+        prefills = [int(p) for p in args.prefill.split(",") if p.strip()]
+    except ValueError:
+        parser.error("--prefill must be a comma-separated list of integers")
+    if any(p < 0 for p in prefills) or args.streams < 1 or args.inserts < 1:
+        parser.error("--prefill must be >= 0, --streams and --inserts >= 1")
+
+    report = asyncio.run(run_benchmark(args.dsn, prefills=prefills, streams=args.streams, inserts=args.inserts))
+    _print_table(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
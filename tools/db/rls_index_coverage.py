@@ -0,0 +1,349 @@
+"""Index coverage of the tenant_isolation RLS policies.
+
+20260216_122 puts a tenant_isolation policy on every table with a tenant_id column, but nothing
+checks that the policy's predicate can use an index. For every table with row level security in
+--schema this tool EXPLAINs representative tenant-scoped queries with the tenant GUC set (as the
+application does, transaction-local):
+
+- `SELECT * FROM t` (the policy predicate alone) and, when t has a primary key,
+  `SELECT * FROM t ORDER BY <pk> DESC LIMIT 50` (the usual "latest N" listing);
+- each query once as planned and once with enable_seqscan = off. If even then no scan of t has
+  tenant_id in its Index Cond / Recheck Cond, no index can serve the policy: `missing_index`, or
+  `cast_defeats_index` when the predicate casts tenant_id (e.g. tenant_id::text on a bpchar
+  column) and an index leads with the plain column;
+- a plain Seq Scan on a table with at least --min-rows estimated rows, although an index could
+  serve the policy, is reported as `seq_scan` (stale statistics or a dominant tenant).
+
+--write-migration writes the composite indexes that fix missing_index/cast_defeats_index:
+(tenant_id, <pk>) or, for casts, the policy's own cast expression, so the planner can match it.
+The role must be subject to RLS (not a superuser / BYPASSRLS role, or pass --role to switch to
+one inside the transaction): plans of roles that bypass RLS do not contain the policy.
+Exits 1 when an index is missing or defeated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+DSN_ENVS = ("AUDIT_PG_DSN", "HARDENING_PG_DSN")
+TENANT_GUC = "app.current_tenant_id"
+TENANT_COLUMN = "tenant_id"
+DEFAULT_MIN_ROWS = 10_000
+LISTING_LIMIT = 50
+
+# Issues that need an index (and make the tool exit 1); seq_scan is advisory.
+INDEX_FINDINGS = ("missing_index", "cast_defeats_index")
+
+_TABLES_SQL = """
+SELECT c.oid, c.relname, c.relforcerowsecurity, c.reltuples::bigint,
+       format_type(a.atttypid, a.atttypmod) AS tenant_type
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = :column AND NOT a.attisdropped
+WHERE n.nspname = :schema AND c.relkind IN ('r', 'p') AND c.relrowsecurity
+ORDER BY c.relname
+"""
+_POLICIES_SQL = """
+SELECT policyname, cmd, qual, with_check FROM pg_policies
+WHERE schemaname = :schema AND tablename = :table ORDER BY policyname
+"""
+# First key column (or expression) of every index, and the primary key columns in order.
+_INDEXES_SQL = """
+SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid, 1, true), i.indisprimary,
+       ARRAY(
+           SELECT a.attname FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, n)
+           JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+           ORDER BY k.n
+       )
+FROM pg_index i WHERE i.indrelid = :oid AND i.indisvalid
+"""
+_BYPASS_SQL = "SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user"
+
+_TENANT_WORD = re.compile(rf"\b{TENANT_COLUMN}\b")
+# EXPLAIN renders a cast of the column as (tenant_id)::text, or as a function call for bpchar.
+_TENANT_CAST = re.compile(rf"\({TENANT_COLUMN}\)::\w+(?: \w+)*|\w+\(\(?{TENANT_COLUMN}\)?\)")
+
+
+@dataclass
+class QueryPlan:
+    query: str
+    seq_scan: bool  # as planned: a Seq Scan of the table
+    index_serves_policy: bool  # with enable_seqscan = off: tenant_id in an Index/Recheck Cond
+    filters: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Finding:
+    table: str
+    kind: str  # missing_index | cast_defeats_index | seq_scan
+    detail: str
+    index_sql: Optional[str] = None
+
+
+@dataclass
+class TableCoverage:
+    table: str
+    tenant_type: Optional[str]
+    forced: bool
+    estimated_rows: int
+    policies: List[Dict[str, Any]]
+    tenant_indexes: List[str]
+    plans: List[QueryPlan]
+    findings: List[Finding]
+
+
+def _scan_nodes(plan: Dict[str, Any], relation: str) -> Iterator[Dict[str, Any]]:
+    if plan.get("Relation Name") == relation:
+        yield plan
+    for child in plan.get("Plans", ()):
+        yield from _scan_nodes(child, relation)
+
+
+def _conditions(node: Dict[str, Any], keys: Sequence[str]) -> List[str]:
+    return [node[key] for key in keys if node.get(key)]
+
+
+async def _explain(conn: AsyncConnection, query: str) -> Dict[str, Any]:
+    doc = await conn.scalar(text(f"EXPLAIN (FORMAT JSON) {query}"))
+    if isinstance(doc, str):
+        doc = json.loads(doc)
+    return doc[0]["Plan"]
+
+
+async def _plan_query(conn: AsyncConnection, relation: str, query: str) -> QueryPlan:
+    natural = list(_scan_nodes(await _explain(conn, query), relation))
+    await conn.execute(text("SET LOCAL enable_seqscan = off"))
+    try:
+        forced = list(_scan_nodes(await _explain(conn, query), relation))
+    finally:
+        await conn.execute(text("SET LOCAL enable_seqscan = on"))
+    index_conds = [c for node in forced for c in _conditions(node, ("Index Cond", "Recheck Cond"))]
+    return QueryPlan(
+        query=query,
+        seq_scan=any(node["Node Type"] == "Seq Scan" for node in natural),
+        index_serves_policy=any(_TENANT_WORD.search(c) for c in index_conds),
+        filters=[c for node in forced for c in _conditions(node, ("Filter",))],
+    )
+
+
+_IDENTIFIERS = postgresql.dialect().identifier_preparer
+
+
+def quote_ident(name: str) -> str:
+    """Identifier as SQL text, quoted when needed (case, reserved words, `"` doubled), like quote_ident()."""
+    return _IDENTIFIERS.quote(name)
+
+
+def _index_name(table: str, columns: Sequence[str]) -> str:
+    name = "idx_" + "_".join([table, *(re.sub(r"\W+", "_", c).strip("_") for c in columns)])
+    return name[:63]
+
+
+def _index_sql(schema: str, table: str, key: str, pk_columns: Sequence[str]) -> str:
+    columns = [c for c in pk_columns if c != TENANT_COLUMN]
+    name = _index_name(table, [TENANT_COLUMN + ("_cast" if key != TENANT_COLUMN else ""), *columns])
+    # key is the column or the policy's own cast expression, which goes in as the plan printed it.
+    keys = ", ".join([quote_ident(key) if key == TENANT_COLUMN else key, *map(quote_ident, columns)])
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote_ident(name)} "
+        f"ON {quote_ident(schema)}.{quote_ident(table)} ({keys});"
+    )
+
+
+def classify(
+    schema: str,
+    table: str,
+    plans: Sequence[QueryPlan],
+    tenant_indexes: Sequence[str],
+    pk_columns: Sequence[str],
+    estimated_rows: int,
+    min_rows: int,
+) -> List[Finding]:
+    """Findings for one table from its query plans (see the module docstring)."""
+    qualified = f"{schema}.{table}"
+    if any(plan.index_serves_policy for plan in plans):
+        return [
+            Finding(qualified, "seq_scan", f"planned as Seq Scan with ~{estimated_rows} rows: {plan.query}")
+            for plan in plans
+            if plan.seq_scan and estimated_rows >= min_rows
+        ][:1]
+    casts = [m.group(0) for plan in plans for f in plan.filters for m in [_TENANT_CAST.search(f)] if m]
+    if casts:
+        # Index the policy's own expression: the planner matches it, not the plain column.
+        key = f"({casts[0]})"
+        if tenant_indexes:
+            detail = (
+                f"policy predicate casts the column ({casts[0]}); indexes on {TENANT_COLUMN} "
+                f"({', '.join(tenant_indexes)}) cannot serve it"
+            )
+            return [Finding(qualified, "cast_defeats_index", detail, _index_sql(schema, table, key, pk_columns))]
+    else:
+        key = TENANT_COLUMN
+    return [
+        Finding(
+            qualified,
+            "missing_index",
+            f"no index leading with {TENANT_COLUMN} can serve the tenant_isolation predicate",
+            _index_sql(schema, table, key, pk_columns),
+        )
+    ]
+
+
+async def analyze(
+    engine: AsyncEngine,
+    *,
+    schema: str = "public",
+    role: Optional[str] = None,
+    min_rows: int = DEFAULT_MIN_ROWS,
+) -> List[TableCoverage]:
+    """Coverage report for every RLS table in `schema` that has a tenant_id column."""
+    report: List[TableCoverage] = []
+    async with engine.connect() as conn:
+        tables = (await conn.execute(text(_TABLES_SQL), {"schema": schema, "column": TENANT_COLUMN})).all()
+    for oid, table, forced, reltuples, tenant_type in tables:
+        if tenant_type is None:
+            continue
+        async with engine.begin() as conn:
+            policies = [
+                dict(row._mapping)
+                for row in await conn.execute(text(_POLICIES_SQL), {"schema": schema, "table": table})
+            ]
+            indexes = (await conn.execute(text(_INDEXES_SQL), {"oid": oid})).all()
+            tenant_indexes = [name for name, first, _, _ in indexes if _TENANT_WORD.search(first)]
+            pk_columns = next((list(columns) for _, _, primary, columns in indexes if primary), [])
+
+            if role:
+                await conn.execute(text(f"SET LOCAL ROLE {quote_ident(role)}"))
+            if await conn.scalar(text(_BYPASS_SQL)):
+                raise RuntimeError(
+                    "current role bypasses RLS; its plans do not contain the policies (use --role)"
+                )
+            # Any well-formed tenant: the plan shape does not depend on which one.
+            await conn.execute(
+                text("SELECT set_config(:guc, :tenant_id, true)"), {"guc": TENANT_GUC, "tenant_id": str(uuid4())}
+            )
+            relation = f"{quote_ident(schema)}.{quote_ident(table)}"
+            queries = [f"SELECT * FROM {relation}"]
+            if pk_columns:
+                order = ", ".join(f"{quote_ident(c)} DESC" for c in pk_columns)
+                queries.append(f"SELECT * FROM {relation} ORDER BY {order} LIMIT {LISTING_LIMIT}")
+            plans = [await _plan_query(conn, table, query) for query in queries]
+
+        report.append(
+            TableCoverage(
+                table=f"{schema}.{table}",
+                tenant_type=tenant_type,
+                forced=forced,
+                estimated_rows=max(reltuples, 0),
+                policies=policies,
+                tenant_indexes=tenant_indexes,
+                plans=plans,
+                findings=classify(schema, table, plans, tenant_indexes, pk_columns, max(reltuples, 0), min_rows),
+            )
+        )
+    return report
+
+
+def migration_sql(report: Sequence[TableCoverage], name: str) -> Optional[str]:
+    """Migration with the indexes for every missing/defeated finding, or None if there is none."""
+    statements = [f.index_sql for t in report for f in t.findings if f.kind in INDEX_FINDINGS and f.index_sql]
+    if not statements:
+        return None
+    header = [
+        f"-- {name}",
+        "-- Objetivo: índices compostos liderados por tenant_id para as policies tenant_isolation",
+        "-- (gerado por tools/db/rls_index_coverage.py).",
+        "--",
+        "-- Notas:",
+        "-- - CONCURRENTLY não bloqueia escritas, mas não roda dentro de transação: aplicar com psql -f.",
+        "-- - Se um CREATE INDEX CONCURRENTLY falhar, o índice fica INVALID: DROP INDEX e reaplicar.",
+        "",
+    ]
+    for coverage in report:
+        for finding in coverage.findings:
+            if finding.kind in INDEX_FINDINGS and finding.index_sql:
+                header.append(f"-- {coverage.table}: {finding.kind}")
+                header.append(finding.index_sql)
+    return "\n".join(header) + "\n"
+
+
+def _format(coverage: TableCoverage) -> Iterator[str]:
+    if any(f.kind in INDEX_FINDINGS for f in coverage.findings):
+        state = "MISSING"
+    else:
+        state = "WARN   " if coverage.findings else "OK     "
+    indexes = ", ".join(coverage.tenant_indexes) or "none"
+    yield (
+        f"{state} {coverage.table} ({coverage.tenant_type}, ~{coverage.estimated_rows} rows; "
+        f"tenant indexes: {indexes})"
+    )
+    if not coverage.forced:
+        yield "        note: RLS is not FORCEd; the table owner bypasses the policy"
+    for finding in coverage.findings:
+        yield f"        {finding.kind}: {finding.detail}"
+        if finding.index_sql:
+            yield f"        fix: {finding.index_sql}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that tenant_isolation RLS policies can use an index.")
+    parser.add_argument(
+        "--dsn",
+        default=next((os.environ[name] for name in DSN_ENVS if os.environ.get(name)), None),
+        help=f"SQLAlchemy async DSN (default: ${' / $'.join(DSN_ENVS)})",
+    )
+    parser.add_argument("--schema", default="public", help="schema to analyze (default: %(default)s)")
+    parser.add_argument("--role", help="SET LOCAL ROLE to this role (subject to RLS) before EXPLAIN")
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=DEFAULT_MIN_ROWS,
+        help="report planned Seq Scans only from this many estimated rows (default: %(default)s)",
+    )
+    parser.add_argument("--write-migration", type=Path, metavar="PATH", help="write the missing indexes here")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error(f"--dsn or ${DSN_ENVS[0]} is required")
+
+    async def _run() -> List[TableCoverage]:
+        engine = create_async_engine(args.dsn)
+        try:
+            return await analyze(engine, schema=args.schema, role=args.role, min_rows=args.min_rows)
+        finally:
+            await engine.dispose()
+
+    try:
+        report = asyncio.run(_run())
+    except RuntimeError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps([asdict(c) for c in report], indent=2))
+    else:
+        for coverage in report:
+            for line in _format(coverage):
+                print(line)
+    if args.write_migration:
+        sql = migration_sql(report, args.write_migration.name)
+        if sql is not None:
+            args.write_migration.write_text(sql, encoding="utf-8")
+            print(f"wrote {args.write_migration}", file=sys.stderr)
+    return 1 if any(f.kind in INDEX_FINDINGS for c in report for f in c.findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
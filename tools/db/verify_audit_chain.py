@@ -0,0 +1,562 @@
+"""Streaming verifier for the audit_events hash chain.
+
+Recomputes event_hash in Python with the same canonical form as trg_audit_events_hashchain
+(concat_ws('|', prev_hash, occurred_at::text, actor, action, resource_ref, correlation_id,
+trace_id, payload_json::text), SHA-256 hex) instead of public.verify_audit_chain's single
+PL/pgSQL loop:
+
+- rows are read in id order in pages of --batch-size, each page in its own short transaction
+  through a server-side cursor, so no snapshot is held for the whole run;
+- after a clean run, a signed checkpoint (HMAC-SHA256 of stream + last id + last hash) is saved
+  and the next run verifies only rows after it;
+- a broken chain reports the first broken id and why, instead of a bare boolean;
+- with --workers N, streams (and large streams split into id ranges) are verified by a pool of N
+  processes, each holding at most one connection; range results are stitched by boundary hash.
+
+occurred_at::text and payload_json::text are rendered by the server, exactly as in the trigger; as
+with verify_audit_chain, the session TimeZone must match the one the events were written with.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECKPOINT_DIR = REPO_ROOT / ".cache" / "audit-chain"
+CHECKPOINT_KEY_ENV = "AUDIT_CHECKPOINT_KEY"
+DSN_ENVS = ("AUDIT_PG_DSN", "HARDENING_PG_DSN")
+
+GENESIS_HASH = "0" * 64
+GLOBAL_STREAM = "GLOBAL"
+TENANT_GUC = "app.current_tenant_id"
+
+# Same COALESCE defaults as the trigger; the NULL tenant stream is the GLOBAL chain.
+_ROW_COLUMNS = """
+    id, prev_hash, event_hash,
+    COALESCE(occurred_at::text, ''), COALESCE(actor, ''), COALESCE(action, ''),
+    COALESCE(resource_ref, ''), COALESCE(correlation_id, ''), COALESCE(trace_id, ''),
+    COALESCE(payload_json::text, '{}')
+"""
+_PAGE_SQL = {
+    True: f"""
+        SELECT {_ROW_COLUMNS} FROM public.audit_events
+        WHERE tenant_id = CAST(:tenant_id AS uuid) AND id > :after_id AND id <= :to_id
+        ORDER BY id LIMIT :limit
+    """,
+    False: f"""
+        SELECT {_ROW_COLUMNS} FROM public.audit_events
+        WHERE tenant_id IS NULL AND id > :after_id AND id <= :to_id
+        ORDER BY id LIMIT :limit
+    """,
+}
+_HASH_AT_SQL = {
+    True: "SELECT event_hash FROM public.audit_events WHERE tenant_id = CAST(:tenant_id AS uuid) AND id = :id",
+    False: "SELECT event_hash FROM public.audit_events WHERE tenant_id IS NULL AND id = :id",
+}
+
+# Every range_size-th id of a stream after :after_id, with its stored hash: the start of the next
+# range. The numbering only touches (tenant_id, id), so it can use idx_audit_events_tenant_id_id.
+_BOUNDARY_SQL = {
+    True: """
+        SELECT n.id, ae.event_hash
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY id) AS rn FROM public.audit_events
+            WHERE tenant_id = CAST(:tenant_id AS uuid) AND id > :after_id
+        ) n
+        JOIN public.audit_events ae ON ae.id = n.id
+        WHERE n.rn % :range_size = 0
+        ORDER BY n.id
+    """,
+    False: """
+        SELECT n.id, ae.event_hash
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY id) AS rn FROM public.audit_events
+            WHERE tenant_id IS NULL AND id > :after_id
+        ) n
+        JOIN public.audit_events ae ON ae.id = n.id
+        WHERE n.rn % :range_size = 0
+        ORDER BY n.id
+    """,
+}
+
+# Distinct non-NULL tenants by skip scan over the (tenant_id, id) index, plus the GLOBAL stream.
+_STREAMS_SQL = """
+WITH RECURSIVE streams(tenant_id) AS (
+    (SELECT tenant_id FROM public.audit_events WHERE tenant_id IS NOT NULL ORDER BY tenant_id LIMIT 1)
+    UNION ALL
+    SELECT (
+        SELECT ae.tenant_id FROM public.audit_events ae
+        WHERE ae.tenant_id > s.tenant_id ORDER BY ae.tenant_id LIMIT 1
+    )
+    FROM streams s WHERE s.tenant_id IS NOT NULL
+)
+SELECT tenant_id FROM streams WHERE tenant_id IS NOT NULL
+"""
+_HAS_GLOBAL_SQL = "SELECT EXISTS (SELECT 1 FROM public.audit_events WHERE tenant_id IS NULL)"
+_BYPASS_SQL = "SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user"
+
+# Upper bound for "no upper bound" (bigserial).
+MAX_ID = 2**63 - 1
+
+# (after_id, prev_hash, to_id): rows after_id < id <= to_id, chained from prev_hash.
+IdRange = Tuple[int, str, int]
+
+
+def stream_key(tenant_id: Optional[UUID]) -> str:
+    return str(tenant_id) if tenant_id is not None else GLOBAL_STREAM
+
+
+def canonical_event(
+    prev_hash: str,
+    occurred_at: str,
+    actor: str,
+    action: str,
+    resource_ref: str,
+    correlation_id: str,
+    trace_id: str,
+    payload: str,
+) -> bytes:
+    """Hash input of trg_audit_events_hashchain; arguments are the already-COALESCEd text forms."""
+    return "|".join((prev_hash, occurred_at, actor, action, resource_ref, correlation_id, trace_id, payload)).encode()
+
+
+def event_hash(prev_hash: str, *fields: str) -> str:
+    return hashlib.sha256(canonical_event(prev_hash, *fields)).hexdigest()
+
+
+@dataclass
+class ChainVerification:
+    stream: str
+    ok: bool
+    rows_verified: int
+    last_id: int
+    last_hash: str
+    first_broken_id: Optional[int] = None
+    reason: Optional[str] = None  # prev_hash | event_hash | checkpoint
+    resumed_from: Optional[int] = None
+
+
+class CheckpointError(Exception):
+    """Checkpoint file exists but its signature does not match (tampered or different key)."""
+
+
+class StreamDiscoveryError(Exception):
+    """--all-streams cannot see every stream (RLS-subject role) or found none to verify."""
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    stream: str
+    last_id: int
+    last_hash: str
+    rows: int
+
+    def payload(self) -> bytes:
+        return json.dumps(asdict(self), sort_keys=True, separators=(",", ":")).encode()
+
+
+class CheckpointStore:
+    """One signed JSON file per stream; a checkpoint only attests rows up to last_id."""
+
+    def __init__(self, directory: Path, key: bytes) -> None:
+        if not key:
+            raise ValueError("checkpoint signing key must not be empty")
+        self.directory = directory
+        self._key = key
+
+    def path(self, stream: str) -> Path:
+        return self.directory / f"{stream}.json"
+
+    def _sign(self, checkpoint: Checkpoint) -> str:
+        return hmac.new(self._key, checkpoint.payload(), hashlib.sha256).hexdigest()
+
+    def load(self, stream: str) -> Optional[Checkpoint]:
+        path = self.path(stream)
+        if not path.exists():
+            return None
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        checkpoint = Checkpoint(
+            stream=doc["stream"], last_id=int(doc["last_id"]), last_hash=doc["last_hash"], rows=int(doc["rows"])
+        )
+        if checkpoint.stream != stream or not hmac.compare_digest(self._sign(checkpoint), str(doc.get("signature"))):
+            raise CheckpointError(f"invalid signature for audit chain checkpoint {path}")
+        return checkpoint
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(checkpoint.stream)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({**asdict(checkpoint), "signature": self._sign(checkpoint)}, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+
+async def _begin_stream_transaction(conn: Any, tenant_id: Optional[UUID]) -> None:
+    # Under FORCE RLS a tenant stream is only visible with the tenant GUC set (transaction-local);
+    # the GLOBAL stream needs a role that bypasses RLS.
+    if tenant_id is not None:
+        await conn.execute(
+            text("SELECT set_config(:guc, :tenant_id, true)"), {"guc": TENANT_GUC, "tenant_id": str(tenant_id)}
+        )
+
+
+async def verify_range(
+    engine: AsyncEngine,
+    tenant_id: Optional[UUID],
+    *,
+    after_id: int = 0,
+    prev_hash: str = GENESIS_HASH,
+    to_id: int = MAX_ID,
+    batch_size: int = 50_000,
+) -> ChainVerification:
+    """Verify rows with after_id < id <= to_id of one stream, chaining from prev_hash."""
+    stream = stream_key(tenant_id)
+    has_tenant = tenant_id is not None
+    params = {"tenant_id": str(tenant_id) if has_tenant else None, "to_id": to_id, "limit": batch_size}
+    expected_prev = prev_hash
+    last_id = after_id
+    rows = 0
+    while True:
+        page_rows = 0
+        async with engine.begin() as conn:
+            await _begin_stream_transaction(conn, tenant_id)
+            result = await conn.stream(
+                text(_PAGE_SQL[has_tenant]).execution_options(yield_per=1000), {**params, "after_id": last_id}
+            )
+            async for row in result:
+                row_id, stored_prev, stored_hash, *fields = row
+                if (stored_prev or "") != expected_prev:
+                    return ChainVerification(stream, False, rows, last_id, expected_prev, row_id, "prev_hash")
+                if (stored_hash or "") != event_hash(expected_prev, *fields):
+                    return ChainVerification(stream, False, rows, last_id, expected_prev, row_id, "event_hash")
+                expected_prev = stored_hash
+                last_id = row_id
+                rows += 1
+                page_rows += 1
+        if page_rows < batch_size:
+            return ChainVerification(stream, True, rows, last_id, expected_prev)
+
+
+async def _resume_point(
+    engine: AsyncEngine, tenant_id: Optional[UUID], checkpoints: Optional[CheckpointStore]
+) -> Tuple[Optional[Checkpoint], Optional[ChainVerification]]:
+    """Checkpoint to resume from, or a broken result if its anchor row no longer matches."""
+    checkpoint = checkpoints.load(stream_key(tenant_id)) if checkpoints is not None else None
+    if checkpoint is None:
+        return None, None
+    # The anchor row must still carry the hash the checkpoint attested.
+    async with engine.begin() as conn:
+        await _begin_stream_transaction(conn, tenant_id)
+        anchor = await conn.scalar(
+            text(_HASH_AT_SQL[tenant_id is not None]),
+            {"tenant_id": str(tenant_id) if tenant_id is not None else None, "id": checkpoint.last_id},
+        )
+    if anchor != checkpoint.last_hash:
+        broken = ChainVerification(
+            checkpoint.stream,
+            False,
+            0,
+            checkpoint.last_id,
+            checkpoint.last_hash,
+            checkpoint.last_id,
+            "checkpoint",
+            resumed_from=checkpoint.last_id,
+        )
+        return checkpoint, broken
+    return checkpoint, None
+
+
+def _start(checkpoint: Optional[Checkpoint]) -> Tuple[int, str]:
+    return (checkpoint.last_id, checkpoint.last_hash) if checkpoint is not None else (0, GENESIS_HASH)
+
+
+def _finish(
+    result: ChainVerification, checkpoint: Optional[Checkpoint], checkpoints: Optional[CheckpointStore]
+) -> ChainVerification:
+    if checkpoint is not None:
+        result.resumed_from = checkpoint.last_id
+    if result.ok and checkpoints is not None and result.rows_verified:
+        total = result.rows_verified + (checkpoint.rows if checkpoint is not None else 0)
+        checkpoints.save(Checkpoint(result.stream, result.last_id, result.last_hash, total))
+    return result
+
+
+async def verify_stream(
+    engine: AsyncEngine,
+    tenant_id: Optional[UUID],
+    *,
+    checkpoints: Optional[CheckpointStore] = None,
+    batch_size: int = 50_000,
+) -> ChainVerification:
+    """Verify one stream, resuming after its checkpoint (if any) and advancing it on success."""
+    checkpoint, broken = await _resume_point(engine, tenant_id, checkpoints)
+    if broken is not None:
+        return broken
+    after_id, prev_hash = _start(checkpoint)
+    result = await verify_range(engine, tenant_id, after_id=after_id, prev_hash=prev_hash, batch_size=batch_size)
+    return _finish(result, checkpoint, checkpoints)
+
+
+async def discover_streams(engine: AsyncEngine) -> List[Optional[UUID]]:
+    """Every tenant stream plus GLOBAL (None) if present. Needs a role that bypasses RLS.
+
+    Under RLS the scan would silently see no rows, so a role that does not bypass it is an error.
+    """
+    async with engine.connect() as conn:
+        if not await conn.scalar(text(_BYPASS_SQL)):
+            raise StreamDiscoveryError("current role is subject to RLS and cannot list audit streams")
+        tenants: List[Optional[UUID]] = list((await conn.execute(text(_STREAMS_SQL))).scalars())
+        if await conn.scalar(text(_HAS_GLOBAL_SQL)):
+            tenants.append(None)
+    return tenants
+
+
+async def plan_ranges(
+    engine: AsyncEngine,
+    tenant_id: Optional[UUID],
+    *,
+    after_id: int = 0,
+    prev_hash: str = GENESIS_HASH,
+    range_size: int = 200_000,
+) -> List[IdRange]:
+    """Split a stream into ranges of about range_size rows, each starting at a stored boundary hash.
+
+    Ranges are independent: each one is verified against the hash its boundary row claims, and
+    stitch() then checks that every range really ended on that boundary row with that hash.
+    """
+    async with engine.begin() as conn:
+        await _begin_stream_transaction(conn, tenant_id)
+        boundaries = (
+            await conn.execute(
+                text(_BOUNDARY_SQL[tenant_id is not None]),
+                {
+                    "tenant_id": str(tenant_id) if tenant_id is not None else None,
+                    "after_id": after_id,
+                    "range_size": range_size,
+                },
+            )
+        ).all()
+    starts = [(after_id, prev_hash)] + [(row_id, row_hash or "") for row_id, row_hash in boundaries]
+    ends = [row_id for row_id, _ in starts[1:]] + [MAX_ID]
+    return [(start_id, start_hash, end_id) for (start_id, start_hash), end_id in zip(starts, ends)]
+
+
+def stitch(stream: str, parts: Sequence[Tuple[IdRange, ChainVerification]]) -> ChainVerification:
+    """Combine range results in id order into the result a single serial pass would give."""
+    rows = 0
+    previous: Optional[ChainVerification] = None
+    for (after_id, prev_hash, _), part in parts:
+        if previous is not None and (previous.last_id, previous.last_hash) != (after_id, prev_hash):
+            # The previous range did not end on the boundary row (or not with its stored hash).
+            return ChainVerification(
+                stream, False, rows, previous.last_id, previous.last_hash, after_id, "range_boundary"
+            )
+        if not part.ok:
+            rows += part.rows_verified
+            return ChainVerification(
+                stream, False, rows, part.last_id, part.last_hash, part.first_broken_id, part.reason
+            )
+        rows += part.rows_verified
+        previous = part
+    assert previous is not None, "plan_ranges always returns at least one range"
+    return ChainVerification(stream, True, rows, previous.last_id, previous.last_hash)
+
+
+@dataclass(frozen=True)
+class RangeJob:
+    dsn: str
+    tenant_id: Optional[UUID]
+    id_range: IdRange
+    batch_size: int
+
+
+def _verify_range_job(job: RangeJob) -> ChainVerification:
+    # Runs in a worker process: its own event loop and a single, unpooled connection.
+    async def _run_job() -> ChainVerification:
+        engine = create_async_engine(job.dsn, poolclass=NullPool)
+        try:
+            after_id, prev_hash, to_id = job.id_range
+            return await verify_range(
+                engine, job.tenant_id, after_id=after_id, prev_hash=prev_hash, to_id=to_id, batch_size=job.batch_size
+            )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_run_job())
+
+
+async def verify_streams_parallel(
+    dsn: str,
+    tenant_ids: Optional[Iterable[Optional[UUID]]] = None,
+    *,
+    workers: Optional[int] = None,
+    range_size: int = 200_000,
+    batch_size: int = 50_000,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> List[ChainVerification]:
+    """Verify many streams with a pool of `workers` processes (None = one per CPU).
+
+    tenant_ids=None verifies every stream (discover_streams). Each worker holds at most one
+    connection, so `workers` also bounds DB concurrency; planning uses one more. Results are in
+    stream order and identical to verify_stream's, checkpoints included.
+    """
+    engine = create_async_engine(dsn, pool_size=1, max_overflow=0)
+    try:
+        streams = list(tenant_ids) if tenant_ids is not None else await discover_streams(engine)
+        plans = {}
+        for tenant_id in streams:
+            checkpoint, broken = await _resume_point(engine, tenant_id, checkpoints)
+            if broken is None:
+                after_id, prev_hash = _start(checkpoint)
+                ranges = await plan_ranges(
+                    engine, tenant_id, after_id=after_id, prev_hash=prev_hash, range_size=range_size
+                )
+            else:
+                ranges = []
+            plans[tenant_id] = (checkpoint, broken, ranges)
+    finally:
+        await engine.dispose()
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            tenant_id: [
+                loop.run_in_executor(pool, _verify_range_job, RangeJob(dsn, tenant_id, id_range, batch_size))
+                for id_range in ranges
+            ]
+            for tenant_id, (_, _, ranges) in plans.items()
+        }
+        results = []
+        for tenant_id, (checkpoint, broken, ranges) in plans.items():
+            if broken is not None:
+                results.append(broken)
+                continue
+            parts = await asyncio.gather(*futures[tenant_id])
+            results.append(_finish(stitch(stream_key(tenant_id), list(zip(ranges, parts))), checkpoint, checkpoints))
+    return results
+
+
+def _format(result: ChainVerification) -> str:
+    resumed = f" (resumed after id {result.resumed_from})" if result.resumed_from is not None else ""
+    if result.ok:
+        return f"OK      {result.stream}: {result.rows_verified} rows verified, last id {result.last_id}{resumed}"
+    return f"BROKEN  {result.stream}: first broken id {result.first_broken_id} ({result.reason} mismatch){resumed}"
+
+
+async def _run(args: argparse.Namespace, checkpoints: Optional[CheckpointStore]) -> List[ChainVerification]:
+    streams: Optional[List[Optional[UUID]]] = None
+    if not args.all_streams:
+        streams = list(args.tenant) + ([None] if args.global_stream else [])
+    if args.all_streams or args.workers > 1:
+        results = await verify_streams_parallel(
+            args.dsn,
+            streams,
+            workers=args.workers,
+            range_size=args.range_size,
+            batch_size=args.batch_size,
+            checkpoints=checkpoints,
+        )
+        if not results:
+            raise StreamDiscoveryError("no audit streams found; nothing was verified")
+        return results
+    engine = create_async_engine(args.dsn)
+    try:
+        assert streams is not None
+        return [await verify_stream(engine, t, checkpoints=checkpoints, batch_size=args.batch_size) for t in streams]
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verify the audit_events hash chain, resuming from signed checkpoints."
+    )
+    parser.add_argument(
+        "--dsn",
+        default=next((os.environ[name] for name in DSN_ENVS if os.environ.get(name)), None),
+        help=f"SQLAlchemy async DSN (default: ${' / $'.join(DSN_ENVS)})",
+    )
+    parser.add_argument(
+        "--tenant", type=UUID, action="append", default=[], metavar="UUID", help="tenant stream to verify (repeatable)"
+    )
+    parser.add_argument(
+        "--global",
+        dest="global_stream",
+        action="store_true",
+        help="verify the GLOBAL stream (needs a role that bypasses RLS)",
+    )
+    parser.add_argument(
+        "--all-streams",
+        action="store_true",
+        help="verify every tenant stream and GLOBAL (needs a role that bypasses RLS)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=50_000, help="rows per page/transaction (default: %(default)s)"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="verify streams and id ranges in N processes, one DB connection each (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--range-size",
+        type=int,
+        default=200_000,
+        help="with --workers/--all-streams, split streams into ranges of this many rows (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        default=CHECKPOINT_DIR,
+        help=f"signed checkpoints, key in ${CHECKPOINT_KEY_ENV} (default: {CHECKPOINT_DIR.relative_to(REPO_ROOT)})",
+    )
+    parser.add_argument("--no-checkpoint", action="store_true", help="verify from the genesis hash and save nothing")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per stream instead of text")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error(f"--dsn or ${DSN_ENVS[0]} is required")
+    if not args.tenant and not args.global_stream and not args.all_streams:
+        parser.error("nothing to verify: pass --tenant UUID, --global or --all-streams")
+    if args.all_streams and (args.tenant or args.global_stream):
+        parser.error("--all-streams cannot be combined with --tenant/--global")
+    if args.batch_size < 1 or args.range_size < 1 or args.workers < 1:
+        parser.error("--batch-size, --range-size and --workers must be >= 1")
+    checkpoints = None
+    if not args.no_checkpoint:
+        key = os.environ.get(CHECKPOINT_KEY_ENV, "")
+        if not key:
+            parser.error(f"${CHECKPOINT_KEY_ENV} is required to sign checkpoints (or pass --no-checkpoint)")
+        checkpoints = CheckpointStore(args.checkpoint_dir, key.encode())
+
+    try:
+        results = asyncio.run(_run(args, checkpoints))
+    except (CheckpointError, StreamDiscoveryError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+    for result in results:
+        print(json.dumps(asdict(result)) if args.json else _format(result))
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())